@@ -0,0 +1,142 @@
+"""
+@file prices.py
+@brief Close prices from the ohlcv table for labelling predictions
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module holds the OHLCV reads shared by the accuracy tracker, the
+stacking ensemble and the retraining exports. An outcome is the move from
+the close at prediction time to the close one horizon later. Both closes
+are as-of joins on the bar timestamps with a tolerance, so a stale bar is
+never taken for a fresh one. The outcome watermark is computed per asset,
+so an asset whose bars lag is waited for instead of being scored on its
+last available bar.
+"""
+
+from typing import Any, Iterable, Optional
+from datetime import datetime, timedelta
+import logging
+import pandas as pd
+from sqlalchemy import func, select
+from api.db.timescaledb import OHLCV
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def read_closes(
+    session: Any,
+    asset_ids: Optional[Iterable[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> pd.DataFrame:
+    """
+    @brief Close prices ordered by asset and time
+    @param session: SQLAlchemy session
+    @param asset_ids: Assets to read (all if None)
+    @param start: Inclusive lower bound on the bar timestamp
+    @param end: Inclusive upper bound on the bar timestamp
+    @return: DataFrame with asset_id, timestamp and close columns
+    """
+    query = select(OHLCV.asset_id, OHLCV.timestamp, OHLCV.close)
+    if asset_ids is not None:
+        query = query.where(OHLCV.asset_id.in_(list(asset_ids)))
+    if start is not None:
+        query = query.where(OHLCV.timestamp >= start)
+    if end is not None:
+        query = query.where(OHLCV.timestamp <= end)
+    closes = pd.DataFrame(
+        session.execute(query.order_by(OHLCV.asset_id, OHLCV.timestamp)).all(),
+        columns=["asset_id", "timestamp", "close"]
+    )
+    closes["timestamp"] = pd.to_datetime(closes["timestamp"])
+    return closes
+
+
+def outcome_watermark(
+    session: Any,
+    horizon: timedelta,
+    tolerance: Optional[timedelta] = None
+) -> Optional[datetime]:
+    """
+    Latest prediction time whose outcome every live asset has priced.
+
+    An asset is live if its latest bar is within ``tolerance`` of the
+    newest bar of any asset. Assets lagging further are treated as no
+    longer priced; they do not hold the watermark back, and their
+    predictions are dropped by attach_outcome_closes for lack of a price.
+
+    @param session: SQLAlchemy session
+    @param horizon: Outcome horizon
+    @param tolerance: Allowed bar lag (defaults to the horizon)
+    @return: Watermark, or None without price data
+    """
+    tolerance = tolerance or horizon
+    latest = [
+        pd.Timestamp(row[0]) for row in session.execute(
+            select(func.max(OHLCV.timestamp)).group_by(OHLCV.asset_id)
+        ).all() if row[0] is not None
+    ]
+    if not latest:
+        return None
+    newest = max(latest)
+    return (min(t for t in latest if newest - t <= tolerance) - horizon).to_pydatetime()
+
+
+def attach_outcome_closes(
+    session: Any,
+    events: pd.DataFrame,
+    horizon: timedelta,
+    tolerance: Optional[timedelta] = None,
+    time_column: str = "created_at"
+) -> pd.DataFrame:
+    """
+    Close at each event and one horizon later, per asset.
+
+    Each close is the last bar at or before its time, and at most
+    ``tolerance`` older. The later close must come from a later bar.
+    Events without both closes are dropped rather than scored.
+
+    @param session: SQLAlchemy session
+    @param events: DataFrame with asset_id and ``time_column`` columns
+    @param horizon: Outcome horizon
+    @param tolerance: Maximum bar age (defaults to the horizon)
+    @param time_column: Event time column
+    @return: Events with close_then and close_after, ordered by event time
+    """
+    tolerance = tolerance or horizon
+    events = events.assign(**{time_column: pd.to_datetime(events[time_column])})
+    if events.empty:
+        return events.assign(close_then=pd.Series(dtype=float), close_after=pd.Series(dtype=float))
+
+    closes = read_closes(
+        session,
+        events["asset_id"].unique().tolist(),
+        (events[time_column].min() - tolerance).to_pydatetime(),
+        (events[time_column].max() + horizon).to_pydatetime()
+    ).sort_values("timestamp")
+
+    events = pd.merge_asof(
+        events.sort_values(time_column),
+        closes.rename(columns={"timestamp": "then_at", "close": "close_then"}),
+        left_on=time_column, right_on="then_at", by="asset_id",
+        direction="backward", tolerance=tolerance
+    )
+    events["outcome_at"] = events[time_column] + horizon
+    events = pd.merge_asof(
+        events.sort_values("outcome_at"),
+        closes.rename(columns={"timestamp": "after_at", "close": "close_after"}),
+        left_on="outcome_at", right_on="after_at", by="asset_id",
+        direction="backward", tolerance=tolerance
+    )
+    priced = events["close_then"].notna() & events["close_after"].notna() & (events["after_at"] > events["then_at"])
+    if not priced.all():
+        logger.debug(f"Dropped {int((~priced).sum())} events without outcome prices")
+    return (
+        events[priced]
+        .drop(columns=["then_at", "after_at", "outcome_at"])
+        .sort_values(time_column, kind="stable")
+        .reset_index(drop=True)
+    )
@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import create_engine, Column, String, Integer, Float, DateTime, Boolean, ForeignKey, JSON
+from sqlalchemy import create_engine, Column, String, Integer, Float, DateTime, Boolean, ForeignKey, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.dialects.postgresql import JSONB
@@ -13,6 +13,14 @@ engine = create_engine(DATABASE_URL, echo=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# FastAPI dependency yielding a session closed after the request
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 class Asset(Base):
     __tablename__ = "asset"
     id = Column(String, primary_key=True, index=True)
@@ -22,6 +30,7 @@ class Asset(Base):
     tokenomics_features = relationship("TokenomicsFeatures", back_populates="asset")
     technical_features = relationship("TechnicalFeatures", back_populates="asset")
     sentiment_features = relationship("SentimentFeatures", back_populates="asset")
+    onchain_features = relationship("OnchainFeatures", back_populates="asset")
     model_predictions = relationship("ModelPrediction", back_populates="asset")
 
 class OHLCV(Base):
@@ -38,6 +47,7 @@ class OHLCV(Base):
 
 class TokenomicsFeatures(Base):
     __tablename__ = "tokenomics_features"
+    __table_args__ = (Index("ix_tokenomics_features_asset_date", "asset_id", "date"),)
     id = Column(Integer, primary_key=True, autoincrement=True)
     asset_id = Column(String, ForeignKey("asset.id"))
     date = Column(DateTime, index=True)
@@ -52,6 +62,7 @@ class TokenomicsFeatures(Base):
 
 class TechnicalFeatures(Base):
     __tablename__ = "technical_features"
+    __table_args__ = (Index("ix_technical_features_asset_date", "asset_id", "date"),)
     id = Column(Integer, primary_key=True, autoincrement=True)
     asset_id = Column(String, ForeignKey("asset.id"))
     date = Column(DateTime, index=True)
@@ -66,6 +77,7 @@ class TechnicalFeatures(Base):
 
 class SentimentFeatures(Base):
     __tablename__ = "sentiment_features"
+    __table_args__ = (Index("ix_sentiment_features_asset_date", "asset_id", "date"),)
     id = Column(Integer, primary_key=True, autoincrement=True)
     asset_id = Column(String, ForeignKey("asset.id"))
     date = Column(DateTime, index=True)
@@ -74,8 +86,22 @@ class SentimentFeatures(Base):
     news_freq = Column(Integer)
     social_mentions = Column(Integer)
     yt_growth = Column(Float)
+    yt_mentions = Column(Integer)
     asset = relationship("Asset", back_populates="sentiment_features")
 
+class OnchainFeatures(Base):
+    __tablename__ = "onchain_features"
+    __table_args__ = (Index("ix_onchain_features_asset_date", "asset_id", "date"),)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    asset_id = Column(String, ForeignKey("asset.id"))
+    date = Column(DateTime, index=True)
+    transaction_volume = Column(Float)
+    active_addresses = Column(Integer)
+    network_hashrate = Column(Float)
+    gas_price = Column(Float)
+    network_utilization = Column(Float)
+    asset = relationship("Asset", back_populates="onchain_features")
+
 class ModelPrediction(Base):
     __tablename__ = "model_predictions"
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -84,7 +110,7 @@ class ModelPrediction(Base):
     prediction = Column(Float)
     score = Column(Float)
     created_at = Column(DateTime, index=True)
-    extra = Column(JSONB)
+    extra = Column(JSON().with_variant(JSONB, "postgresql"))
     asset = relationship("Asset", back_populates="model_predictions")
 
 # Utility to create all tables
@@ -1,23 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from api.models.ohlcv import OHLCV as OHLCVModel
-from api.db.timescaledb import SessionLocal, OHLCV as OHLCVORM
+from api.db.timescaledb import get_db, OHLCV as OHLCVORM
+from api.services.feature_cache import get_feature_cache
+from api.services.prediction_cache import get_prediction_cache
 
 router = APIRouter()
 
-# Dependency to get DB session
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/ohlcv")
 def ingest_ohlcv(data: OHLCVModel, db: Session = Depends(get_db)):
     db_ohlcv = OHLCVORM(**data.dict())
     db.add(db_ohlcv)
     db.commit()
     db.refresh(db_ohlcv)
+    get_feature_cache().invalidate(data.asset_id)
+    get_prediction_cache().invalidate(data.asset_id)
     return {"status": "inserted", "id": db_ohlcv.id} 
\ No newline at end of file
@@ -10,7 +10,7 @@ This module implements the prediction endpoint for the Crypto Investment
 Analysis System, handling model predictions and feature extraction.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
@@ -23,9 +23,11 @@ from api.models.schemas import (
 )
 from api.services.prediction_service import PredictionService
 from api.services.feature_service import FeatureService
-from api.services.monitoring_service import MonitoringService
-from database.session import get_db
-from api.db.timescaledb import SessionLocal, ModelPrediction
+from api.services.monitoring_service import get_monitoring_service
+from api.db.timescaledb import get_db
+from api.models.prediction_log import ModelPredictionLog
+from api.services.prediction_logger import get_prediction_log_writer
+from api.services.instrumentation import track_request
 from datetime import datetime
 
 # Configure logging
@@ -54,65 +56,62 @@ async def predict(
     @return: Prediction response with analysis results
     """
     try:
-        # Initialize services
-        feature_service = FeatureService()
-        prediction_service = PredictionService()
-        monitoring_service = MonitoringService()
-        
-        # Extract features based on request parameters
-        features = await feature_service.get_features(
-            ticker=request.ticker,
-            timeframe=request.timeframe,
-            include_technical=request.include_technical,
-            include_fundamental=request.include_fundamental,
-            include_sentiment=request.include_sentiment,
-            include_onchain=request.include_onchain,
-            historical_days=request.historical_days
-        )
-        
-        # Make prediction with custom weights if provided
-        prediction = await prediction_service.predict(
-            features=features,
-            analysis_type=request.analysis_type,
-            feature_weights=request.feature_weights,
-            risk_tolerance=request.risk_tolerance
-        )
-        
-        # Monitor prediction
-        monitoring_results = await monitoring_service.monitor_prediction(
-            prediction=prediction,
-            features=features,
-            market_context=request.market_context
-        )
-        
-        # Store results
-        await prediction_service.store_prediction(
-            ticker=request.ticker,
-            prediction=prediction,
-            features=features,
-            monitoring_results=monitoring_results
-        )
-        
-        # After each model prediction, log to DB
-        for model_name, pred in prediction["predictions"].items():
-            db_pred = ModelPrediction(
-                asset_id=request.ticker,
-                model_name=model_name,
-                prediction=pred,
-                score=prediction["score"],
-                created_at=datetime.now(),
-                extra=None
+        with track_request(request.timeframe):
+            # Initialize services
+            feature_service = FeatureService()
+            prediction_service = PredictionService()
+            monitoring_service = get_monitoring_service()
+            
+            # Extract features based on request parameters
+            features = await feature_service.get_features(
+                ticker=request.ticker,
+                timeframe=request.timeframe,
+                include_technical=request.include_technical,
+                include_fundamental=request.include_fundamental,
+                include_sentiment=request.include_sentiment,
+                include_onchain=request.include_onchain,
+                historical_days=request.historical_days
             )
-            db.add(db_pred)
-        db.commit()
-        
-        return {
-            "ticker": request.ticker,
-            "prediction": prediction,
-            "features": features,
-            "monitoring": monitoring_results,
-            "timestamp": monitoring_results["timestamp"]
-        }
+            
+            # Make prediction with custom weights if provided
+            prediction = await prediction_service.predict(
+                features=features,
+                analysis_type=request.analysis_type,
+                feature_weights=request.feature_weights,
+                risk_tolerance=request.risk_tolerance,
+                ticker=request.ticker
+            )
+            
+            # Monitor prediction (drift and alerting run in the background)
+            monitoring_results = await monitoring_service.monitor_prediction(
+                prediction=prediction,
+                features=features,
+                market_context=request.market_context
+            )
+            
+            # Queue per-model predictions for the background DB writer;
+            # placeholder scores are not logged, so accuracy tracking and
+            # retraining only ever see model outputs
+            created_at = datetime.now()
+            await get_prediction_log_writer().log([
+                ModelPredictionLog(
+                    asset_id=request.ticker,
+                    model_name=model_name,
+                    prediction=prediction["predictions"][model_name],
+                    score=prediction["score"],
+                    created_at=created_at,
+                    extra={"timeframe": request.timeframe.value, "model_version": version}
+                )
+                for model_name, version in prediction["model_versions"].items()
+            ])
+            
+            return {
+                "ticker": request.ticker,
+                "prediction": prediction,
+                "features": features,
+                "monitoring": monitoring_results,
+                "timestamp": monitoring_results["timestamp"]
+            }
 
     except ValueError as e:
         logger.error(f"Invalid request parameters: {str(e)}")
@@ -137,26 +136,35 @@ async def predict(
 )
 async def get_prediction(
     ticker: str,
+    timeframe: TimeFrame = TimeFrame.DAY,
+    analysis_type: AnalysisType = AnalysisType.COMPREHENSIVE,
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     Get latest prediction for a cryptocurrency.
     
     @param ticker: Cryptocurrency ticker
+    @param timeframe: Time frame for the prediction
+    @param analysis_type: Type of analysis to perform
     @param db: Database session
     @return: Latest prediction
     """
     try:
-        prediction_service = PredictionService()
-        prediction = await prediction_service.get_latest_prediction(ticker)
-        
-        if not prediction:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No prediction found for {ticker}"
+        with track_request(timeframe):
+            prediction_service = PredictionService()
+            prediction = await prediction_service.get_latest_prediction(
+                ticker.upper(),
+                timeframe=timeframe,
+                analysis_type=analysis_type
             )
-        
-        return prediction
+            
+            if not prediction:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No prediction found for {ticker}"
+                )
+            
+            return prediction
 
     except HTTPException:
         raise
@@ -235,4 +243,34 @@ async def get_confidence(ticker: str) -> Dict[str, float]:
         raise HTTPException(
             status_code=500,
             detail=f"Error retrieving confidence: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+@router.get(
+    "/scores/technical",
+    responses={
+        500: {"model": ErrorResponse}
+    }
+)
+async def get_technical_scores(tickers: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Score the asset universe with the technical model in one batched pass.
+    
+    @param tickers: Comma-separated tickers (every asset with features if omitted)
+    @return: Model version and up-move probability per ticker
+    """
+    try:
+        prediction_service = PredictionService()
+        scores = await prediction_service.score_technical(
+            [ticker.strip().upper() for ticker in tickers.split(",")] if tickers else None
+        )
+        return {
+            "model_version": prediction_service.registry.version("technical"),
+            "scores": scores,
+            "timestamp": datetime.now()
+        }
+
+    except Exception as e:
+        logger.error(f"Error in technical scores endpoint: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error scoring assets: {str(e)}"
+        )
@@ -10,11 +10,32 @@ This module implements the main FastAPI application for the Crypto Investment An
 It provides endpoints for cryptocurrency analysis and prediction.
 """
 
-from fastapi import FastAPI, HTTPException
+import time
+
+# Imports dominate cold start (torch, transformers); time them
+_IMPORTS_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from api.endpoints import predict
 from api.models.schemas import PredictionResponse, ErrorResponse
+from api.services.prediction_logger import get_prediction_log_writer
+from api.services.monitoring_service import get_monitoring_service
+from api.services.model_registry import get_model_registry
+from api.services.feature_store import get_feature_store
+from api.services.prediction_service import PredictionService
+from api.services.profiler import ProfilingMiddleware
+from api.services.startup import get_startup_tracker
+from monitoring.drift import get_drift_detector
+from monitoring.accuracy import get_accuracy_tracker
+from monitoring.retrain import get_retrain_scheduler
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest, multiprocess
+import asyncio
 import logging
+import os
+
+IMPORT_SECONDS = time.perf_counter() - _IMPORTS_STARTED
 
 # Configure logging
 logging.basicConfig(
@@ -38,9 +59,77 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in request profiling (PROFILE_ADMIN_TOKEN, PROFILE_SAMPLE_RATE)
+app.add_middleware(ProfilingMiddleware)
+
 # Include routers
 app.include_router(predict.router, prefix="/api/v1", tags=["predictions"])
 
+@app.on_event("startup")
+async def startup():
+    """
+    @brief Start background workers and warm up the models
+    """
+    tracker = get_startup_tracker()
+    tracker.record("imports", IMPORT_SECONDS)
+    with tracker.phase("background_workers"):
+        await get_prediction_log_writer().start()
+        await get_monitoring_service().start()
+        await get_model_registry().start(float(os.getenv("MODEL_REFRESH_INTERVAL", "30")))
+        await get_drift_detector().start(float(os.getenv("DRIFT_INTERVAL", "60")))
+        # Database-wide jobs run once per server, not once per forked worker
+        if os.getenv("SERVING_WORKER_INDEX", "0") == "0":
+            get_feature_store().start_scheduler(float(os.getenv("FEATURE_MATERIALIZE_INTERVAL", "3600")))
+            await get_accuracy_tracker().start(float(os.getenv("ACCURACY_INTERVAL", "300")))
+            retrain_interval = float(os.getenv("RETRAIN_INTERVAL", "3600"))
+            if retrain_interval > 0:
+                await get_retrain_scheduler().start(retrain_interval)
+
+    # Warm-up runs in the background so /health answers meanwhile;
+    # /ready stays 503 until every model is loaded and warmed up
+    global _warmup_task
+    _warmup_task = asyncio.get_running_loop().create_task(warm_up_models())
+
+_warmup_task = None
+
+async def warm_up_models():
+    """
+    @brief Load and warm up every model slot in parallel threads, then report
+           ready if every slot loaded or has no model to load
+    """
+    tracker = get_startup_tracker()
+    if os.getenv("MODEL_WARMUP", "1") != "0":
+        try:
+            with tracker.phase("models"):
+                # Constructing the service registers the model loaders
+                registry = PredictionService().registry
+                # SERVING_MODELS limits which slots (and frameworks) a worker loads up front
+                slots = os.getenv("SERVING_MODELS")
+                report = await asyncio.get_running_loop().run_in_executor(
+                    None, registry.preload, slots.split(",") if slots else None
+                )
+            tracker.record_models(report)
+        except Exception as e:
+            logger.error(f"Model warm-up failed: {str(e)}")
+            tracker.record_error("models", str(e))
+    # A worker whose models failed to load stays out of rotation (503)
+    tracker.mark_ready()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """
+    @brief Flush queued prediction logs before the worker exits
+    """
+    if _warmup_task is not None:
+        _warmup_task.cancel()
+    await get_monitoring_service().stop()
+    await get_feature_store().stop_scheduler()
+    await get_drift_detector().stop()
+    await get_accuracy_tracker().stop()
+    await get_retrain_scheduler().stop()
+    await get_model_registry().stop()
+    await get_prediction_log_writer().stop()
+
 @app.get("/health")
 async def health_check():
     """
@@ -49,6 +138,29 @@ async def health_check():
     """
     return {"status": "healthy", "version": "1.0.0"}
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    @brief Readiness endpoint; 503 until the models are loaded and warmed up,
+           and for good if any of them failed to load
+    @return JSONResponse: Readiness, the startup time breakdown and any errors
+    """
+    report = get_startup_tracker().report()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    @brief Prometheus scrape endpoint
+    @return Response: Metrics in the Prometheus text format
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # Multi-process serving (api.serve): sum the metrics of all workers
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """
@@ -15,6 +15,10 @@ from enum import Enum
 from typing import Dict, List, Optional, Union, Any
 from pydantic import BaseModel, Field, validator
 from datetime import datetime, timedelta
+from models.ensemble.ensemble_model import DEFAULT_WEIGHTS
+
+# Model slots that PredictionRequest.feature_weights may weight
+ENSEMBLE_SLOTS = tuple(DEFAULT_WEIGHTS)
 
 
 class RiskLevel(str, Enum):
@@ -169,7 +173,7 @@ class PredictionRequest(BaseModel):
     # Feature weights (optional)
     feature_weights: Optional[Dict[str, float]] = Field(
         default=None,
-        description="Custom weights for different features"
+        description="Custom ensemble weights per model (technical, sentiment, fundamental, onchain)"
     )
     
     # Risk parameters
@@ -200,8 +204,11 @@ class PredictionRequest(BaseModel):
     
     @validator('feature_weights')
     def validate_feature_weights(cls, v):
-        """Validate feature weights sum to 1 if provided."""
+        """Validate feature weights name ensemble models and sum to 1 if provided."""
         if v is not None:
+            unknown = set(v) - set(ENSEMBLE_SLOTS)
+            if unknown:
+                raise ValueError(f'Unknown feature weights: {sorted(unknown)}')
             total = sum(v.values())
             if not 0.99 <= total <= 1.01:  # Allow for small floating point errors
                 raise ValueError('Feature weights must sum to 1')
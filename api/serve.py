@@ -0,0 +1,269 @@
+"""
+@file serve.py
+@brief Multi-process API server sharing preloaded model weights
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module runs the API in several worker processes without a copy of
+every model per worker. The parent process imports the application and
+loads all models once, freezes the garbage collector so the loaded
+objects are never written to again by a collection, then forks the
+workers. Workers share the parent's model memory copy-on-write, and
+technical checkpoints are additionally memory-mapped from the page cache.
+
+A version loaded by a worker itself would be private to that worker.
+For the FinBERT and XGBoost slots, which are not memory-mapped, that
+would mean one copy per worker. Workers therefore never hot-swap
+models. The parent polls the artifact store, loads a new version once,
+and restarts the workers one at a time, so every worker forks from the
+new models again. Without a store, retraining (which runs in worker 0
+only) replaces a serving checkpoint in place; the parent notices its new
+version label, reloads it and restarts the workers the same way.
+
+Each worker caps torch, OpenMP and XGBoost threads at its share of the
+cores to avoid oversubscription, warms up its models and serves a socket
+bound by the parent. Prometheus metrics are aggregated across workers
+through PROMETHEUS_MULTIPROC_DIR.
+
+Usage::
+
+    python -m api.serve --workers 4 --threads 2
+"""
+
+from typing import Dict, List, Optional
+import argparse
+import gc
+import glob
+import logging
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def limit_threads(threads: int) -> None:
+    """
+    @brief Cap the intra-op threads of the numeric libraries in this process
+    @param threads: Threads per process
+    """
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "XGBOOST_NTHREAD"):
+        os.environ[variable] = str(threads)
+    if "torch" in sys.modules:
+        import torch
+
+        torch.set_num_threads(threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Only allowed before the first inter-op parallel work
+            pass
+
+
+def _prepare_metrics_dir(workers: int) -> None:
+    """Point prometheus_client at a clean multiprocess directory before it is imported."""
+    if workers <= 1:
+        return
+    path = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+        return
+    # Metric files of a previous run would be summed into the new one; the
+    # directory is the operator's, so nothing else in it is touched
+    os.makedirs(path, exist_ok=True)
+    for metric_file in glob.glob(os.path.join(path, "*.db")):
+        os.remove(metric_file)
+
+
+def _bind(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(index: int, app, sock: socket.socket, threads: int) -> None:
+    """Body of a forked worker; never returns."""
+    code = 0
+    try:
+        import uvicorn
+        from api.db.timescaledb import engine
+
+        os.environ["SERVING_WORKER_INDEX"] = str(index)
+        limit_threads(threads)
+        # Pooled connections must not be shared with the parent
+        engine.dispose(close=False)
+        server = uvicorn.Server(uvicorn.Config(app, lifespan="on", log_level="info"))
+        server.run(sockets=[sock])
+    except Exception as e:
+        logger.error(f"Worker {index} failed: {str(e)}")
+        code = 1
+    finally:
+        os._exit(code)
+
+
+def _reload_promoted(
+    registry,
+    promoted: Dict[str, str],
+    paths: Optional[Dict[str, str]] = None
+) -> List[str]:
+    """
+    Reload the serving checkpoints retraining replaced since the last call.
+
+    @param registry: Parent's model registry (without an artifact store)
+    @param promoted: Slot -> version label already loaded, updated in place
+    @param paths: Slot -> serving checkpoint path (defaults to the serving paths)
+    @return: Slots that were reloaded
+    """
+    from monitoring.retrain import checkpoint_versions
+
+    reloaded = []
+    for slot, version in checkpoint_versions(paths).items():
+        if promoted.get(slot) == version:
+            continue
+        # Recorded even on failure so a bad checkpoint is not retried every poll
+        promoted[slot] = version
+        try:
+            registry.reload(slot, version, warm_up=False)
+            reloaded.append(slot)
+        except Exception as e:
+            logger.error(f"Failed to reload {slot} version {version}: {str(e)}")
+    return reloaded
+
+
+def serve(
+    workers: int,
+    threads: Optional[int] = None,
+    host: str = "0.0.0.0",
+    port: int = 8000
+) -> None:
+    """
+    Preload the models, fork the workers and supervise them.
+
+    @param workers: Worker processes
+    @param threads: Intra-op threads per worker (defaults to cores / workers)
+    @param host: Bind address
+    @param port: Bind port
+    """
+    threads = threads or max(1, (os.cpu_count() or 1) // workers)
+    _prepare_metrics_dir(workers)
+    # Boosters pick their thread count up when loaded
+    os.environ["XGBOOST_NTHREAD"] = str(threads)
+    # New model versions are loaded here, not by each worker
+    refresh_interval = float(os.getenv("MODEL_REFRESH_INTERVAL", "30"))
+    os.environ["MODEL_REFRESH_INTERVAL"] = "0"
+
+    from api.main import app
+    from api.services.prediction_service import PredictionService
+    from monitoring.retrain import checkpoint_versions
+
+    registry = PredictionService().registry
+    # Labels of the checkpoints about to be loaded, read first so a
+    # replacement during the preload is reloaded rather than missed
+    promoted = checkpoint_versions() if registry.store is None else {}
+    # Load without warm-up: warm-up would start thread pools, which do
+    # not survive a fork; each worker warms up its models on startup
+    slots = os.getenv("SERVING_MODELS")
+    report = registry.preload(slots.split(",") if slots else None, warm_up=False)
+    logger.info(f"Preloaded models for {workers} workers: {report}")
+    gc.collect()
+    # Loaded objects move to a permanent generation the collector never
+    # scans, so collections in the workers do not touch (and copy) them
+    gc.freeze()
+
+    sock = _bind(host, port)
+    children: Dict[int, int] = {}
+    stopping = False
+
+    def spawn(index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            _run_worker(index, app, sock, threads)
+        children[pid] = index
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for index in range(workers):
+        spawn(index)
+    logger.info(f"Serving on {host}:{port} with {workers} workers x {threads} threads")
+
+    # Workers still running models older than the parent's, and the one
+    # currently being restarted; restarts are one at a time so the others
+    # keep serving
+    outdated: List[int] = []
+    restarting: Optional[int] = None
+    next_refresh = time.monotonic() + refresh_interval
+    while children:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+
+        if pid == 0:
+            if stopping:
+                time.sleep(0.2)
+                continue
+            if refresh_interval > 0 and time.monotonic() >= next_refresh:
+                next_refresh = time.monotonic() + refresh_interval
+                if registry.store is not None:
+                    swapped = registry.refresh(warm_up=False)
+                else:
+                    swapped = _reload_promoted(registry, promoted)
+                if swapped:
+                    gc.collect()
+                    gc.freeze()
+                    outdated = list(children)
+                    logger.info(f"Loaded new versions of {swapped}; restarting workers")
+            if restarting is None and outdated:
+                restarting = outdated.pop(0)
+                if restarting in children:
+                    os.kill(restarting, signal.SIGTERM)
+                else:
+                    restarting = None
+            time.sleep(0.2)
+            continue
+
+        index = children.pop(pid, None)
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            from prometheus_client import multiprocess
+
+            multiprocess.mark_process_dead(pid)
+        if pid == restarting:
+            restarting = None
+            if not stopping:
+                spawn(index)
+        elif index is not None and not stopping:
+            logger.warning(f"Worker {index} (pid {pid}) exited with status {status}; restarting")
+            spawn(index)
+    sock.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the API from preloaded, shared models")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("SERVING_WORKERS", "2")))
+    parser.add_argument("--threads", type=int, default=int(os.getenv("SERVING_THREADS", "0")) or None)
+    parser.add_argument("--host", default=os.getenv("SERVING_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("SERVING_PORT", "8000")))
+    args = parser.parse_args()
+    serve(args.workers, args.threads, args.host, args.port)
@@ -18,6 +18,8 @@ from sqlalchemy.orm import Session
 from data_ingestion.ingest_market import fetch_market_data
 from data_ingestion.ingest_social import fetch_social_data
 from data_ingestion.ingest_onchain import fetch_onchain_data
+from api.services.feature_cache import get_feature_cache
+from api.services.prediction_cache import get_prediction_cache
 from database.models import (
     MarketData,
     SocialData,
@@ -65,6 +67,8 @@ class DataService:
             )
             self.db.add(market_data)
             self.db.commit()
+            get_feature_cache().invalidate(ticker)
+            get_prediction_cache().invalidate(ticker)
             
             return data
 
@@ -96,6 +100,8 @@ class DataService:
             )
             self.db.add(social_data)
             self.db.commit()
+            get_feature_cache().invalidate(ticker)
+            get_prediction_cache().invalidate(ticker)
             
             return data
 
@@ -127,6 +133,8 @@ class DataService:
             )
             self.db.add(onchain_data)
             self.db.commit()
+            get_feature_cache().invalidate(ticker)
+            get_prediction_cache().invalidate(ticker)
             
             return data
 
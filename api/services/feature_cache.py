@@ -0,0 +1,296 @@
+"""
+@file feature_cache.py
+@brief Hot in-memory cache of online feature vectors
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements the online feature cache for the Crypto Investment
+Analysis System. The latest feature vector per (ticker, timeframe) is kept
+in process memory until the timeframe's current bar closes, and is dropped
+as soon as new OHLCV or social data for the ticker is ingested. An
+optional shared directory (normally on tmpfs, e.g. /dev/shm) lets all
+uvicorn workers on a node share entries and invalidations.
+"""
+
+from typing import Any, Dict, Iterable, Optional, Tuple
+from collections import OrderedDict
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bar length in seconds for each TimeFrame value
+BAR_SECONDS = {
+    "1h": 3600,
+    "1d": 86400,
+    "1w": 7 * 86400,
+    "1m": 30 * 86400,
+    "3m": 90 * 86400,
+    "1y": 365 * 86400,
+}
+
+
+def bar_seconds(timeframe: Any) -> int:
+    """
+    @brief Bar length of a timeframe
+    @param timeframe: TimeFrame enum member or its string value
+    @return: Bar length in seconds
+    """
+    value = getattr(timeframe, "value", timeframe)
+    try:
+        return BAR_SECONDS[value]
+    except KeyError:
+        raise ValueError(f"Unknown timeframe: {value}")
+
+
+def next_bar_close(timeframe: Any, now: Optional[float] = None) -> float:
+    """
+    @brief Epoch time at which the current (epoch-aligned) bar closes
+    @param timeframe: TimeFrame enum member or its string value
+    @param now: Current epoch time (defaults to time.time())
+    @return: Epoch seconds of the next bar boundary
+    """
+    bar = bar_seconds(timeframe)
+    now = time.time() if now is None else now
+    return (now // bar + 1) * bar
+
+
+class OnlineFeatureCache:
+    """Bounded LRU cache of the latest feature vector per (ticker, timeframe)."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_ttl: float = 86400.0,
+        shared_dir: Optional[str] = None
+    ):
+        """
+        Initialize the feature cache.
+
+        @param max_entries: Maximum number of in-process entries
+        @param max_ttl: Upper bound on entry lifetime in seconds
+        @param shared_dir: Optional directory shared by all workers
+        """
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self.shared_dir = shared_dir
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Tuple[int, int], Dict[str, Any]]]" = OrderedDict()
+        # Per-ticker invalidation counters of this process
+        self._invalidations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if shared_dir:
+            os.makedirs(shared_dir, exist_ok=True)
+        logger.info("Online feature cache initialized")
+
+    @staticmethod
+    def _key(ticker: str, timeframe: Any) -> Tuple[str, str]:
+        return ticker.upper(), getattr(timeframe, "value", timeframe)
+
+    def _generation_path(self, ticker: str) -> str:
+        return os.path.join(self.shared_dir, f"{ticker}.gen")
+
+    def _entry_path(self, key: Tuple[str, str]) -> str:
+        return os.path.join(self.shared_dir, f"{key[0]}__{key[1]}.pkl")
+
+    def _shared_generation(self, ticker: str) -> int:
+        """
+        @brief Shared invalidation generation of a ticker
+        @param ticker: Cryptocurrency ticker
+        @return: Generation stamp (0 without a shared directory)
+        """
+        if not self.shared_dir:
+            return 0
+        try:
+            return os.stat(self._generation_path(ticker)).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def generation(self, ticker: str) -> Tuple[int, int]:
+        """
+        @brief Invalidation generation of a ticker
+
+        Take the generation before computing features and pass it to
+        set(): a computation that straddles invalidate() is then dropped
+        instead of caching stale features under the new generation.
+
+        @param ticker: Cryptocurrency ticker
+        @return: (in-process invalidations, shared generation stamp)
+        """
+        ticker = ticker.upper()
+        with self._lock:
+            local = self._invalidations.get(ticker, 0)
+        return local, self._shared_generation(ticker)
+
+    def get(
+        self,
+        ticker: str,
+        timeframe: Any,
+        groups: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        @brief Cached feature vector if fresh and covering all groups
+        @param ticker: Cryptocurrency ticker
+        @param timeframe: TimeFrame enum member or its string value
+        @param groups: Feature groups the caller needs (all cached if None)
+        @return: Copy of the cached feature groups, or None on a miss
+        """
+        key = self._key(ticker, timeframe)
+        now = time.time()
+        generation = self.generation(key[0])
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] <= now or entry[1] != generation):
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None and self.shared_dir:
+            entry = self._read_shared(key, now, generation)
+            if entry is not None:
+                with self._lock:
+                    self._entries[key] = entry
+                    self._evict()
+
+        features = entry[2] if entry is not None else None
+        if features is not None and groups is not None:
+            if any(group not in features for group in groups):
+                features = None
+
+        with self._lock:
+            if features is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        wanted = features.keys() if groups is None else groups
+        return {group: dict(features[group]) for group in wanted}
+
+    def set(
+        self,
+        ticker: str,
+        timeframe: Any,
+        features: Dict[str, Any],
+        generation: Optional[Tuple[int, int]] = None
+    ) -> bool:
+        """
+        @brief Store feature groups, merging with any cached groups
+        @param ticker: Cryptocurrency ticker
+        @param timeframe: TimeFrame enum member or its string value
+        @param features: Feature group name -> feature values
+        @param generation: generation() taken before the features were computed
+        @return: False if the ticker was invalidated since and nothing was stored
+        """
+        key = self._key(ticker, timeframe)
+        now = time.time()
+        expires = min(next_bar_close(key[1], now), now + self.max_ttl)
+        current = self.generation(key[0])
+        if generation is not None and tuple(generation) != current:
+            logger.debug(f"Dropped stale features for {key[0]} {key[1]}")
+            return False
+        generation = current
+        groups = {
+            group: dict(values) for group, values in features.items()
+            if isinstance(values, dict)
+        }
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now and entry[1] == generation:
+                groups = {**entry[2], **groups}
+            self._entries[key] = (expires, generation, groups)
+            self._entries.move_to_end(key)
+            self._evict()
+
+        if self.shared_dir:
+            self._write_shared(key, (expires, generation[1], groups))
+        return True
+
+    def invalidate(self, ticker: str) -> None:
+        """
+        @brief Drop all cached timeframes of a ticker (in every worker)
+        @param ticker: Cryptocurrency ticker
+        """
+        ticker = ticker.upper()
+        with self._lock:
+            self._invalidations[ticker] = self._invalidations.get(ticker, 0) + 1
+            for key in [k for k in self._entries if k[0] == ticker]:
+                del self._entries[key]
+
+        if self.shared_dir:
+            try:
+                path = self._generation_path(ticker)
+                with open(path, "a"):
+                    pass
+                os.utime(path, ns=(time.time_ns(), time.time_ns()))
+                for timeframe in BAR_SECONDS:
+                    try:
+                        os.unlink(self._entry_path((ticker, timeframe)))
+                    except FileNotFoundError:
+                        pass
+            except OSError as e:
+                logger.error(f"Shared feature cache invalidation failed: {str(e)}")
+
+        logger.info(f"Feature cache invalidated for {ticker}")
+
+    def clear(self) -> None:
+        """Drop all in-process entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_shared(self, key, now, generation):
+        try:
+            with open(self._entry_path(key), "rb") as f:
+                entry = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        except OSError as e:
+            logger.error(f"Shared feature cache read failed: {str(e)}")
+            return None
+        # Shared files carry only the shared part of the generation
+        if entry[0] <= now or entry[1] != generation[1]:
+            return None
+        return entry[0], generation, entry[2]
+
+    def _write_shared(self, key, entry) -> None:
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.shared_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._entry_path(key))
+        except OSError as e:
+            logger.error(f"Shared feature cache write failed: {str(e)}")
+
+
+_feature_cache: Optional[OnlineFeatureCache] = None
+_feature_cache_lock = threading.Lock()
+
+
+def get_feature_cache() -> OnlineFeatureCache:
+    """
+    @brief Process-wide feature cache configured from the environment
+    @return: Shared OnlineFeatureCache instance
+    """
+    global _feature_cache
+    if _feature_cache is None:
+        with _feature_cache_lock:
+            if _feature_cache is None:
+                _feature_cache = OnlineFeatureCache(
+                    max_entries=int(os.getenv("FEATURE_CACHE_MAX_ENTRIES", "1024")),
+                    max_ttl=float(os.getenv("FEATURE_CACHE_MAX_TTL", "86400")),
+                    shared_dir=os.getenv("FEATURE_CACHE_SHARED_DIR") or None
+                )
+    return _feature_cache
@@ -8,17 +8,20 @@
 
 This module implements the feature service for the Crypto Investment
 Analysis System, handling feature extraction and processing.
+
+Raw-source clients and feature extractors are imported by the fallback
+that uses them, so importing the service (and the API) does not pull in
+source SDKs that only run when the feature store has no rows.
 """
 
 from typing import Dict, Any, Optional
+import asyncio
+import functools
 import logging
 from datetime import datetime, timedelta
-from data_ingestion.ingest_market import fetch_market_data
-from data_ingestion.ingest_social import fetch_social_data
-from data_ingestion.ingest_onchain import fetch_onchain_data
-from feature_engineering.technical_features import extract_technical_features
-from feature_engineering.sentiment_features import extract_sentiment_features
-from feature_engineering.onchain_features import extract_onchain_features
+from api.services.feature_store import FeatureStore, get_feature_store
+from api.services.feature_cache import OnlineFeatureCache, get_feature_cache
+from api.services.instrumentation import stage_timer, timed
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -27,38 +30,101 @@ logger = logging.getLogger(__name__)
 class FeatureService:
     """Service for handling feature extraction and processing."""
 
-    def __init__(self):
-        """Initialize feature service."""
+    def __init__(
+        self,
+        store: Optional[FeatureStore] = None,
+        cache: Optional[OnlineFeatureCache] = None
+    ):
+        """
+        Initialize feature service.
+
+        @param store: Materialized feature store read before raw sources
+                      (defaults to the process-wide store)
+        @param cache: Online feature cache read before the store (defaults
+                      to the process-wide cache)
+        """
+        self.store = store or get_feature_store()
+        self.cache = cache or get_feature_cache()
         logger.info("Feature service initialized")
 
-    async def get_features(self, ticker: str) -> Dict[str, Any]:
+    async def get_features(
+        self,
+        ticker: str,
+        timeframe: str = "1d",
+        include_technical: bool = True,
+        include_fundamental: bool = True,
+        include_sentiment: bool = True,
+        include_onchain: bool = True,
+        historical_days: int = 30,
+        as_of: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """
         @brief Get all features for a cryptocurrency
         @param ticker: Cryptocurrency ticker
+        @param timeframe: Data timeframe
+        @param include_technical: Include technical features
+        @param include_fundamental: Include tokenomics features
+        @param include_sentiment: Include sentiment features
+        @param include_onchain: Include on-chain features
+        @param historical_days: Days of raw history used when recomputing
+        @param as_of: Point in time to read features at (defaults to now)
         @return: Dictionary of features
         """
         try:
-            # Fetch raw data
-            market_data = await self._fetch_market_data(ticker)
-            social_data = await self._fetch_social_data(ticker)
-            onchain_data = await self._fetch_onchain_data(ticker)
-            
-            # Extract features
-            technical_features = self._extract_technical_features(market_data)
-            sentiment_features = self._extract_sentiment_features(social_data)
-            onchain_features = self._extract_onchain_features(onchain_data)
-            
-            return {
-                "technical": technical_features,
-                "sentiment": sentiment_features,
-                "onchain": onchain_features,
-                "timestamp": datetime.now()
-            }
+            groups = [
+                group for group, included in (
+                    ("technical", include_technical),
+                    ("tokenomics", include_fundamental),
+                    ("sentiment", include_sentiment),
+                    ("onchain", include_onchain),
+                ) if included
+            ]
+
+            # Hot tickers are served straight from memory; the generation
+            # fences the write below against a concurrent invalidation
+            generation = self.cache.generation(ticker)
+            if as_of is None:
+                with stage_timer("feature_fetch", "cache"):
+                    features = self.cache.get(ticker, timeframe, groups)
+                if features is not None:
+                    features["timestamp"] = datetime.now()
+                    return features
+
+            # Materialized rows are a single indexed lookup per group
+            loop = asyncio.get_running_loop()
+            with stage_timer("feature_fetch", "store"):
+                features = await loop.run_in_executor(
+                    None,
+                    functools.partial(
+                        self.store.get_online_features, ticker, as_of, groups
+                    )
+                )
+            missing = [group for group in groups if group not in features]
+
+            # Fall back to recomputing from raw sources for live reads only;
+            # historical reads must not mix in present-day data
+            if missing and as_of is None:
+                if "technical" in missing:
+                    market_data = await self._fetch_market_data(ticker, timeframe)
+                    features["technical"] = self._extract_technical_features(market_data)
+                if "sentiment" in missing:
+                    social_data = await self._fetch_social_data(ticker, timeframe)
+                    features["sentiment"] = self._extract_sentiment_features(social_data)
+                if "onchain" in missing:
+                    onchain_data = await self._fetch_onchain_data(ticker, timeframe)
+                    features["onchain"] = self._extract_onchain_features(onchain_data)
+
+            if as_of is None:
+                self.cache.set(ticker, timeframe, features, generation)
+
+            features["timestamp"] = as_of or datetime.now()
+            return features
 
         except Exception as e:
             logger.error(f"Feature extraction failed: {str(e)}")
             raise
 
+    @timed("feature_fetch", "market")
     async def _fetch_market_data(
         self,
         ticker: str,
@@ -71,12 +137,15 @@ class FeatureService:
         @return: Market data
         """
         try:
+            from data_ingestion.ingest_market import fetch_market_data
+
             return await fetch_market_data(ticker, timeframe)
 
         except Exception as e:
             logger.error(f"Market data fetch failed: {str(e)}")
             raise
 
+    @timed("feature_fetch", "social")
     async def _fetch_social_data(
         self,
         ticker: str,
@@ -89,12 +158,15 @@ class FeatureService:
         @return: Social media data
         """
         try:
+            from data_ingestion.ingest_social import fetch_social_data
+
             return await fetch_social_data(ticker, timeframe)
 
         except Exception as e:
             logger.error(f"Social data fetch failed: {str(e)}")
             raise
 
+    @timed("feature_fetch", "onchain")
     async def _fetch_onchain_data(
         self,
         ticker: str,
@@ -107,12 +179,15 @@ class FeatureService:
         @return: On-chain data
         """
         try:
+            from data_ingestion.ingest_onchain import fetch_onchain_data
+
             return await fetch_onchain_data(ticker, timeframe)
 
         except Exception as e:
             logger.error(f"On-chain data fetch failed: {str(e)}")
             raise
 
+    @timed("feature_extract", "technical")
     def _extract_technical_features(
         self,
         market_data: Dict[str, Any]
@@ -123,12 +198,15 @@ class FeatureService:
         @return: Technical features
         """
         try:
+            from feature_engineering.technical_features import extract_technical_features
+
             return extract_technical_features(market_data)
 
         except Exception as e:
             logger.error(f"Technical feature extraction failed: {str(e)}")
             raise
 
+    @timed("feature_extract", "sentiment")
     def _extract_sentiment_features(
         self,
         social_data: Dict[str, Any]
@@ -139,12 +217,15 @@ class FeatureService:
         @return: Sentiment features
         """
         try:
+            from feature_engineering.sentiment_features import extract_sentiment_features
+
             return extract_sentiment_features(social_data)
 
         except Exception as e:
             logger.error(f"Sentiment feature extraction failed: {str(e)}")
             raise
 
+    @timed("feature_extract", "onchain")
     def _extract_onchain_features(
         self,
         onchain_data: Dict[str, Any]
@@ -155,6 +236,8 @@ class FeatureService:
         @return: On-chain features
         """
         try:
+            from feature_engineering.onchain_features import extract_onchain_features
+
             return extract_onchain_features(onchain_data)
 
         except Exception as e:
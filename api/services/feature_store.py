@@ -0,0 +1,555 @@
+"""
+@file feature_store.py
+@brief Materialized feature store with point-in-time reads
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements the feature store for the Crypto Investment
+Analysis System. Feature groups are materialized on a schedule into the
+technical, sentiment, tokenomics and on-chain feature tables, and read
+back point-in-time correct: a row dated D only becomes visible once its
+bar has closed, so neither online predictions nor training sets can see
+data from the future.
+
+Technical rows are computed from stored OHLCV bars. Sentiment rows are
+FinBERT-scored texts aggregated per day (aggregate_sentiment), continuing
+the rolling columns from the stored days. Tokenomics and on-chain rows
+are daily snapshots of their sources, dated the day they are taken so
+they only become visible once that day has closed.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import asyncio
+import logging
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, insert, select, tuple_
+from api.db.timescaledb import (
+    SessionLocal,
+    Asset,
+    OHLCV,
+    TechnicalFeatures,
+    SentimentFeatures,
+    TokenomicsFeatures,
+    OnchainFeatures
+)
+from feature_engineering.compute_technical import compute_technical_frame
+from feature_engineering.aggregate_sentiment import (
+    SOURCE_SOCIAL,
+    aggregate_daily_sentiment,
+    read_sentiment_history
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Feature group name -> ORM table holding its materialized rows
+FEATURE_GROUPS = {
+    "technical": TechnicalFeatures,
+    "sentiment": SentimentFeatures,
+    "tokenomics": TokenomicsFeatures,
+    "onchain": OnchainFeatures,
+}
+
+# Daily rows are stamped with the start of their bar and only become
+# available once the bar has closed
+AVAILABILITY_LAG = timedelta(days=1)
+
+# History needed before the first materialized day (longest window is MA 200)
+TECHNICAL_LOOKBACK = timedelta(days=250)
+
+# Days of stored sentiment rows seeding the rolling columns
+SENTIMENT_WINDOW = 7
+
+# FinBERT texts scored per forward pass
+SENTIMENT_BATCH_SIZE = 64
+
+Producer = Callable[[Any, List[str], datetime], pd.DataFrame]
+# (tickers, since) -> texts with asset_id, timestamp, source and text columns
+TextSource = Callable[[List[str], datetime], pd.DataFrame]
+# texts -> (N x 3) FinBERT class probabilities, or None without a model
+TextScorer = Callable[[List[str]], Optional[np.ndarray]]
+# ticker -> current feature values of one group
+SnapshotSource = Callable[[str], Dict[str, Any]]
+
+
+def fetch_social_texts(tickers: List[str], since: datetime) -> pd.DataFrame:
+    """
+    @brief Social posts mentioning each asset since a day
+    @param tickers: Assets to fetch
+    @param since: Oldest post time
+    @return: DataFrame with asset_id, timestamp, source and text columns
+    """
+    from data_ingestion.ingest_social import fetch_social_data
+
+    records = [
+        {"asset_id": ticker, "timestamp": post["created_at"], "source": SOURCE_SOCIAL, "text": post["text"]}
+        for ticker in tickers
+        for post in fetch_social_data(ticker).get("tweets", [])
+    ]
+    texts = pd.DataFrame(records, columns=["asset_id", "timestamp", "source", "text"])
+    return texts[pd.to_datetime(texts["timestamp"]) >= since]
+
+
+def score_texts_with_finbert(texts: List[str]) -> Optional[np.ndarray]:
+    """
+    @brief FinBERT class probabilities from the serving model
+    @param texts: Texts to score
+    @return: (N x 3) probabilities, or None if no sentiment model is loaded
+    """
+    from api.services.model_registry import get_model_registry
+    from models.sentiment.infer_finbert import predict
+
+    model = get_model_registry().get("sentiment")
+    if model is None:
+        return None
+    batches = [
+        predict(model, texts[start:start + SENTIMENT_BATCH_SIZE])["predictions"]
+        for start in range(0, len(texts), SENTIMENT_BATCH_SIZE)
+    ]
+    return np.concatenate([np.asarray(b, dtype=np.float64) for b in batches])
+
+
+def tokenomics_snapshot(ticker: str) -> Dict[str, Any]:
+    """
+    @brief Current tokenomics values of an asset
+    @param ticker: Asset
+    @return: Feature values (empty if the source has none)
+    """
+    from feature_engineering.compute_tokenomics import compute_tokenomics_features
+
+    return compute_tokenomics_features({"asset_id": ticker})
+
+
+def onchain_snapshot(ticker: str) -> Dict[str, Any]:
+    """
+    @brief Current on-chain activity of an asset
+    @param ticker: Asset
+    @return: Feature values (empty if the source has none)
+    """
+    from data_ingestion.ingest_blockchain import fetch_blockchain_data
+
+    data = fetch_blockchain_data(ticker)
+    transactions = data.get("transactions", [])
+    if not transactions:
+        return {}
+    addresses = {t.get(side) for t in transactions for side in ("from", "to")} - {None}
+    return {
+        "transaction_volume": float(sum(t.get("value", 0.0) for t in transactions)),
+        "active_addresses": len(addresses),
+    }
+
+
+def _feature_columns(table) -> List[str]:
+    """
+    @brief Feature columns of a feature table
+    @param table: SQLAlchemy table
+    @return: Column names excluding keys
+    """
+    return [c.name for c in table.columns if c.name not in ("id", "asset_id", "date")]
+
+
+def write_feature_rows(
+    model: Any,
+    rows: pd.DataFrame,
+    session: Any,
+    batch_size: int = 10000
+) -> int:
+    """
+    Bulk-write feature rows, replacing existing rows with the same asset
+    and date so re-materialization is idempotent.
+
+    @param model: ORM class of the feature table
+    @param rows: DataFrame with asset_id, date and feature columns
+    @param session: SQLAlchemy session
+    @param batch_size: Rows per multi-row insert statement
+    @return: Number of rows written
+    """
+    if rows.empty:
+        return 0
+
+    table = model.__table__
+    columns = ["asset_id", "date"] + [
+        c for c in _feature_columns(table) if c in rows.columns
+    ]
+    dates = pd.to_datetime(rows["date"])
+    records = (
+        rows.assign(date=list(dates.dt.to_pydatetime()))[columns]
+        .astype(object)
+        .where(rows[columns].notna(), None)
+        .to_dict("records")
+    )
+
+    try:
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
+            # Only the (asset, day) keys being written are replaced; stored
+            # days the batch skips are kept
+            session.execute(
+                delete(table).where(
+                    tuple_(table.c.asset_id, table.c.date).in_(
+                        [(record["asset_id"], record["date"]) for record in batch]
+                    )
+                )
+            )
+            session.execute(insert(table), batch)
+        session.commit()
+        logger.info(f"Wrote {len(records)} rows to {table.name}")
+        return len(records)
+
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Feature write to {table.name} failed: {str(e)}")
+        raise
+
+
+class FeatureStore:
+    """Materialized feature store serving point-in-time correct reads."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any] = SessionLocal,
+        max_staleness: timedelta = timedelta(days=2),
+        text_source: TextSource = fetch_social_texts,
+        text_scorer: TextScorer = score_texts_with_finbert,
+        snapshot_sources: Optional[Dict[str, SnapshotSource]] = None
+    ):
+        """
+        Initialize feature store.
+
+        @param session_factory: Callable returning a new SQLAlchemy session
+        @param max_staleness: Oldest row age still served online
+        @param text_source: Texts feeding the sentiment group
+        @param text_scorer: FinBERT scorer for those texts
+        @param snapshot_sources: Group -> per-asset source of the snapshot
+                                 groups (tokenomics, onchain)
+        """
+        self.session_factory = session_factory
+        self.max_staleness = max_staleness
+        self.text_source = text_source
+        self.text_scorer = text_scorer
+        self.snapshot_sources = snapshot_sources or {
+            "tokenomics": tokenomics_snapshot,
+            "onchain": onchain_snapshot,
+        }
+        self.producers: Dict[str, Producer] = {}
+        self.register_producer("technical", self._produce_technical)
+        self.register_producer("sentiment", self._produce_sentiment)
+        for group in self.snapshot_sources:
+            self.register_producer(group, self._snapshot_producer(group))
+        self._scheduler: Optional[asyncio.Task] = None
+        logger.info("Feature store initialized")
+
+    def register_producer(self, group: str, producer: Producer) -> None:
+        """
+        @brief Register the function that computes rows for a feature group
+        @param group: Feature group name (see FEATURE_GROUPS)
+        @param producer: Callable (session, tickers, since) -> DataFrame
+        """
+        if group not in FEATURE_GROUPS:
+            raise ValueError(f"Unknown feature group: {group}")
+        self.producers[group] = producer
+
+    def materialize(
+        self,
+        tickers: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        groups: Optional[Iterable[str]] = None
+    ) -> Dict[str, int]:
+        """
+        @brief Compute and write feature rows for all registered groups
+        @param tickers: Assets to materialize (all assets if None)
+        @param since: First day to (re)materialize (defaults to yesterday)
+        @param groups: Feature groups to materialize (all registered if None)
+        @return: Rows written per group
+        """
+        since = since or (datetime.now() - AVAILABILITY_LAG).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        written = {}
+        with self.session_factory() as session:
+            if tickers is None:
+                tickers = list(session.scalars(select(Asset.id)))
+            for group in (groups or list(self.producers)):
+                try:
+                    rows = self.producers[group](session, tickers, since)
+                    rows = rows[pd.to_datetime(rows["date"]) >= since] if not rows.empty else rows
+                    written[group] = write_feature_rows(FEATURE_GROUPS[group], rows, session)
+                except Exception as e:
+                    logger.error(f"Materialization of {group} failed: {str(e)}")
+                    written[group] = 0
+        return written
+
+    def _produce_technical(
+        self,
+        session: Any,
+        tickers: List[str],
+        since: datetime
+    ) -> pd.DataFrame:
+        """
+        @brief Compute daily technical features from stored OHLCV bars
+        @param session: SQLAlchemy session
+        @param tickers: Assets to compute
+        @param since: First day to produce
+        @return: Technical feature rows
+        """
+        bars = pd.read_sql(
+            select(
+                OHLCV.asset_id, OHLCV.timestamp, OHLCV.close, OHLCV.volume
+            ).where(
+                OHLCV.asset_id.in_(tickers),
+                OHLCV.timestamp >= since - TECHNICAL_LOOKBACK
+            ),
+            session.connection()
+        )
+        return compute_technical_frame(bars)
+
+    def _produce_sentiment(
+        self,
+        session: Any,
+        tickers: List[str],
+        since: datetime
+    ) -> pd.DataFrame:
+        """
+        @brief Aggregate FinBERT-scored texts into daily sentiment rows
+        @param session: SQLAlchemy session
+        @param tickers: Assets to compute
+        @param since: First day to produce
+        @return: Sentiment feature rows (empty without texts or a model)
+        """
+        texts = self.text_source(tickers, since)
+        if texts.empty:
+            return pd.DataFrame()
+        probabilities = self.text_scorer(texts["text"].tolist())
+        if probabilities is None:
+            logger.warning("No sentiment model loaded; sentiment features not materialized")
+            return pd.DataFrame()
+        timestamps = pd.to_datetime(texts["timestamp"]).values
+        history = read_sentiment_history(
+            session, texts["asset_id"].unique().tolist(),
+            pd.Timestamp(timestamps.min()).normalize().to_pydatetime(), SENTIMENT_WINDOW
+        )
+        return aggregate_daily_sentiment(
+            probabilities,
+            timestamps,
+            texts["asset_id"].values,
+            texts["source"].values,
+            weights=texts["weight"].values if "weight" in texts else None,
+            volatility_window=SENTIMENT_WINDOW,
+            history=history
+        )
+
+    def _snapshot_producer(self, group: str) -> Producer:
+        """
+        @brief Producer dating each asset's current source values today
+        @param group: Snapshot feature group
+        @return: Producer for the group
+        """
+        columns = _feature_columns(FEATURE_GROUPS[group].__table__)
+        source = self.snapshot_sources[group]
+
+        def produce(session: Any, tickers: List[str], since: datetime) -> pd.DataFrame:
+            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            rows = []
+            for ticker in tickers:
+                values = {c: v for c, v in source(ticker).items() if c in columns}
+                # Assets without data keep their stored rows
+                if values:
+                    rows.append({"asset_id": ticker, "date": today, **values})
+            return pd.DataFrame(rows)
+
+        return produce
+
+    async def run_scheduler(self, interval_seconds: float = 3600.0) -> None:
+        """
+        @brief Materialize all groups every ``interval_seconds``
+        @param interval_seconds: Seconds between materialization runs
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                written = await loop.run_in_executor(None, self.materialize)
+                logger.info(f"Feature materialization complete: {written}")
+            except Exception as e:
+                logger.error(f"Scheduled materialization failed: {str(e)}")
+            await asyncio.sleep(interval_seconds)
+
+    def start_scheduler(self, interval_seconds: float = 3600.0) -> asyncio.Task:
+        """
+        @brief Start the materialization loop on the running event loop
+        @param interval_seconds: Seconds between materialization runs
+        @return: Scheduler task
+        """
+        if self._scheduler is None or self._scheduler.done():
+            self._scheduler = asyncio.get_running_loop().create_task(
+                self.run_scheduler(interval_seconds)
+            )
+        return self._scheduler
+
+    async def stop_scheduler(self) -> None:
+        """Stop the materialization loop."""
+        if self._scheduler is None:
+            return
+        self._scheduler.cancel()
+        try:
+            await self._scheduler
+        except asyncio.CancelledError:
+            pass
+        self._scheduler = None
+
+    def get_online_features(
+        self,
+        ticker: str,
+        as_of: Optional[datetime] = None,
+        groups: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Latest available row per feature group for a single asset.
+
+        Each group is one lookup on the (asset_id, date) index. Groups
+        without a row newer than ``max_staleness`` are omitted.
+
+        @param ticker: Cryptocurrency ticker
+        @param as_of: Point in time to read at (defaults to now)
+        @param groups: Feature groups to read (all if None)
+        @return: Feature group name -> feature values
+        """
+        as_of = as_of or datetime.now()
+        cutoff = as_of - AVAILABILITY_LAG
+        features = {}
+        with self.session_factory() as session:
+            for group in (groups or FEATURE_GROUPS):
+                model = FEATURE_GROUPS[group]
+                row = session.execute(
+                    select(model.__table__)
+                    .where(model.asset_id == ticker, model.date <= cutoff)
+                    .order_by(model.date.desc())
+                    .limit(1)
+                ).mappings().first()
+                if row is None or as_of - row["date"] > self.max_staleness + AVAILABILITY_LAG:
+                    continue
+                features[group] = {
+                    c: row[c] for c in _feature_columns(model.__table__)
+                }
+                features[group]["as_of"] = row["date"]
+        return features
+
+    def get_feature_windows(
+        self,
+        tickers: Optional[Iterable[str]],
+        window: int,
+        group: str = "technical",
+        columns: Optional[List[str]] = None,
+        as_of: Optional[datetime] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Latest ``window`` available rows of a group per asset, as arrays.
+
+        All assets are read in one query, so a whole universe can be
+        scored in one batched forward pass. Assets without ``window``
+        complete rows, or whose latest row is older than
+        ``max_staleness``, are omitted.
+
+        @param tickers: Cryptocurrency tickers (all assets with rows if None)
+        @param window: Rows per asset
+        @param group: Feature group (see FEATURE_GROUPS)
+        @param columns: Ordered feature columns (all of the group if None)
+        @param as_of: Point in time to read at (defaults to now)
+        @return: Ticker -> (window x features) float32 array, oldest row first
+        """
+        as_of = as_of or datetime.now()
+        cutoff = as_of - AVAILABILITY_LAG
+        model = FEATURE_GROUPS[group]
+        columns = list(columns or _feature_columns(model.__table__))
+        # Daily rows: the window plus the allowed staleness bounds the scan
+        start = cutoff - self.max_staleness - timedelta(days=window)
+        query = select(model.__table__).where(model.date <= cutoff, model.date > start)
+        if tickers is not None:
+            query = query.where(model.asset_id.in_(list(tickers)))
+
+        with self.session_factory() as session:
+            rows = pd.read_sql(query.order_by(model.asset_id, model.date), session.connection())
+
+        windows = {}
+        for ticker, asset_rows in rows.groupby("asset_id", sort=False):
+            latest = asset_rows.tail(window)
+            if len(latest) < window or as_of - pd.Timestamp(latest["date"].iloc[-1]) > self.max_staleness + AVAILABILITY_LAG:
+                continue
+            values = latest[columns].to_numpy(dtype=np.float32)
+            if np.isnan(values).any():
+                continue
+            windows[ticker] = values
+        return windows
+
+    def get_historical_features(
+        self,
+        entities: pd.DataFrame,
+        groups: Optional[Iterable[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Point-in-time join of feature groups onto labelled events.
+
+        For each (asset_id, timestamp) event, attaches the latest row of
+        every group that was available at that timestamp (as-of join), so
+        training sets contain no lookahead.
+
+        @param entities: DataFrame with asset_id and timestamp columns
+        @param groups: Feature groups to join (all if None)
+        @return: Entities with feature columns prefixed by group name
+        """
+        if entities.empty:
+            return entities.copy()
+
+        result = entities.assign(
+            timestamp=pd.to_datetime(entities["timestamp"])
+        ).reset_index(drop=True)
+        result["_row"] = result.index
+        result = result.sort_values("timestamp")
+        tickers = result["asset_id"].unique().tolist()
+        start = result["timestamp"].min() - self.max_staleness - AVAILABILITY_LAG
+        end = result["timestamp"].max()
+
+        with self.session_factory() as session:
+            for group in (groups or FEATURE_GROUPS):
+                model = FEATURE_GROUPS[group]
+                columns = _feature_columns(model.__table__)
+                rows = pd.read_sql(
+                    select(model.__table__).where(
+                        model.asset_id.in_(tickers),
+                        model.date >= start.to_pydatetime(),
+                        model.date <= end.to_pydatetime()
+                    ),
+                    session.connection()
+                )
+                rows["available_at"] = pd.to_datetime(rows["date"]) + AVAILABILITY_LAG
+                rows = rows[["asset_id", "available_at"] + columns].rename(
+                    columns={c: f"{group}_{c}" for c in columns}
+                ).sort_values("available_at")
+                result = pd.merge_asof(
+                    result,
+                    rows,
+                    left_on="timestamp",
+                    right_on="available_at",
+                    by="asset_id",
+                    direction="backward",
+                    tolerance=self.max_staleness + AVAILABILITY_LAG
+                ).drop(columns="available_at")
+
+        return result.sort_values("_row").drop(columns="_row").reset_index(drop=True)
+
+
+_feature_store: Optional[FeatureStore] = None
+
+
+def get_feature_store() -> FeatureStore:
+    """
+    @brief Process-wide feature store running the materialization schedule
+    @return: Shared FeatureStore instance
+    """
+    global _feature_store
+    if _feature_store is None:
+        _feature_store = FeatureStore()
+    return _feature_store
@@ -0,0 +1,107 @@
+"""
+@file instrumentation.py
+@brief Per-stage latency instrumentation for the prediction pipeline
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements the latency metrics of the Crypto Investment
+Analysis System. Each stage of a prediction (feature fetch per source,
+feature extraction, model inference, ensemble, prediction logging) is
+timed into one Prometheus histogram labelled by stage, model and
+timeframe. The timeframe is set once per request in a context variable so
+nested stages do not need it passed down.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional
+import asyncio
+import functools
+import time
+from prometheus_client import Histogram
+
+# Buckets from sub-millisecond cache hits to multi-second source fetches
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+PREDICTION_LATENCY = Histogram(
+    'prediction_latency_seconds',
+    'Time spent processing predictions',
+    buckets=LATENCY_BUCKETS
+)
+STAGE_LATENCY = Histogram(
+    'prediction_stage_latency_seconds',
+    'Time spent in each stage of the prediction pipeline',
+    ['stage', 'model', 'timeframe'],
+    buckets=LATENCY_BUCKETS
+)
+
+_timeframe: ContextVar[str] = ContextVar("timeframe", default="")
+
+
+def _label(value: Any) -> str:
+    return str(getattr(value, "value", value) or "")
+
+
+@contextmanager
+def track_request(timeframe: Any = None) -> Iterator[None]:
+    """
+    Time a whole prediction request and label its stages with a timeframe.
+
+    @param timeframe: Request timeframe (TimeFrame or string)
+    """
+    token = _timeframe.set(_label(timeframe))
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PREDICTION_LATENCY.observe(time.perf_counter() - start)
+        _timeframe.reset(token)
+
+
+@contextmanager
+def stage_timer(stage: str, model: str = "", timeframe: Optional[Any] = None) -> Iterator[None]:
+    """
+    Time one pipeline stage.
+
+    @param stage: Stage name (e.g. "feature_fetch", "inference", "ensemble")
+    @param model: Model or data source the stage belongs to
+    @param timeframe: Timeframe label (defaults to the current request's)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(
+            stage=stage,
+            model=model,
+            timeframe=_label(timeframe) if timeframe is not None else _timeframe.get()
+        ).observe(time.perf_counter() - start)
+
+
+def timed(stage: str, model: str = "") -> Callable:
+    """
+    Decorator form of stage_timer for sync and async functions.
+
+    @param stage: Stage name
+    @param model: Model or data source the stage belongs to
+    @return: Decorator
+    """
+    def decorator(fn: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with stage_timer(stage, model):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage, model):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,362 @@
+"""
+@file model_registry.py
+@brief Serving registry of loaded models
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements the model registry of the Crypto Investment
+Analysis System. Each serving slot (technical, sentiment, fundamental,
+ensemble) holds one loaded model, loaded once on first use instead of
+per request. A retrained model replaces the slot's reference in a single
+assignment; requests that already took the old model finish with it.
+
+With an artifact store, slots are served from the store's LATEST
+version. A background task polls the pointers; a new version is
+verified, loaded and warmed up off the event loop while the old one
+keeps serving, and only then swapped in. Under multi-process serving
+(api.serve) the workers do not poll; the supervisor loads new versions
+once and restarts the workers, so they keep sharing its memory. Without
+a store it reloads a checkpoint that retraining replaced in place.
+
+At startup all slots can be preloaded in parallel threads and warmed up
+with a synthetic batch, so the first request already runs at steady-state
+latency.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
+import logging
+import os
+import threading
+import time
+from models.artifact_store import ArtifactStore
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Sentinel distinguishing "not loaded yet" from a loader returning None
+_MISSING = object()
+
+
+class ModelRegistry:
+    """Thread-safe slot -> model mapping with atomic replacement."""
+
+    def __init__(self, store: Optional[ArtifactStore] = None):
+        """
+        Initialize an empty registry.
+
+        @param store: Artifact store serving versioned models (optional)
+        """
+        self.store = store
+        self._models: Dict[str, Any] = {}
+        self._versions: Dict[str, str] = {}
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._artifact_loaders: Dict[str, Callable[[str], Any]] = {}
+        self._warmups: Dict[str, Callable[[Any, Dict[str, Any]], Any]] = {}
+        self._lock = threading.Lock()
+        # One lock per slot so slots load in parallel but each only once
+        self._slot_locks: Dict[str, threading.Lock] = {}
+        self._manifests: Dict[str, Dict[str, Any]] = {}
+        self._warmed: Set[str] = set()
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register_loader(self, name: str, loader: Callable[[], Any]) -> None:
+        """
+        @brief Set how a slot is loaded on first use (existing loaders are kept)
+        @param name: Slot name
+        @param loader: Callable returning the model, or None if unavailable
+        """
+        self._loaders.setdefault(name, loader)
+
+    def register_artifact_loader(
+        self,
+        name: str,
+        loader: Callable[[str], Any],
+        warmup: Optional[Callable[[Any, Dict[str, Any]], Any]] = None
+    ) -> None:
+        """
+        @brief Set how a slot is loaded from a store artifact (existing ones are kept)
+        @param name: Slot name
+        @param loader: Callable taking the artifact path and returning the model
+        @param warmup: Callable running a dummy prediction with the model and
+                       its manifest, so the first real request is not slow
+        """
+        self._artifact_loaders.setdefault(name, loader)
+        if warmup is not None:
+            self._warmups.setdefault(name, warmup)
+
+    def get(self, name: str) -> Any:
+        """
+        Current model of a slot, loading and warming it up on first use.
+
+        @param name: Slot name
+        @return: Model, or None if the slot has no model
+        """
+        return self._get(name, warm_up=True)
+
+    def _get(self, name: str, warm_up: bool) -> Any:
+        model = self._models.get(name, _MISSING)
+        if model is not _MISSING and (not warm_up or name in self._warmed):
+            return model
+        with self._slot_lock(name):
+            if name not in self._models:
+                version = self._store_version(name)
+                if version is not None:
+                    model, manifest = self._load_stored(name, version)
+                else:
+                    model, manifest = self._load_initial(name)
+                    version = "initial"
+                # Warm up before publishing so no request sees a cold model
+                if warm_up:
+                    self._warm_up(name, model, manifest)
+                with self._lock:
+                    self._models[name] = model
+                    self._versions.setdefault(name, version)
+                    self._manifests[name] = manifest
+            elif warm_up and name not in self._warmed:
+                # Loaded without warm-up (e.g. in a pre-fork parent); a failed
+                # warm-up only costs latency, the model itself is served
+                try:
+                    self._warm_up(name, self._models[name], self._manifests[name])
+                except Exception as e:
+                    logger.error(f"Failed to warm up {name}: {str(e)}")
+                    self._warmed.add(name)
+            return self._models[name]
+
+    def _slot_lock(self, name: str) -> threading.Lock:
+        with self._lock:
+            return self._slot_locks.setdefault(name, threading.Lock())
+
+    def _load_initial(self, name: str) -> Tuple[Any, Dict[str, Any]]:
+        loader = self._loaders.get(name)
+        started = time.perf_counter()
+        model = loader() if loader else None
+        self.timings[name] = {"load_seconds": time.perf_counter() - started}
+        return model, {"slot": name, "version": "initial", "feature_schema": []}
+
+    def _load_stored(self, name: str, version: str) -> Tuple[Any, Dict[str, Any]]:
+        started = time.perf_counter()
+        manifest = self.store.verify(name, version)
+        model = self._artifact_loaders[name](self.store.artifact_path(name, version))
+        self.timings[name] = {"load_seconds": time.perf_counter() - started}
+        return model, manifest
+
+    def _warm_up(self, name: str, model: Any, manifest: Dict[str, Any]) -> None:
+        warmup = self._warmups.get(name)
+        if warmup is not None and model is not None:
+            started = time.perf_counter()
+            warmup(model, manifest)
+            self.timings.setdefault(name, {})["warmup_seconds"] = time.perf_counter() - started
+        self._warmed.add(name)
+
+    def _store_version(self, name: str) -> Optional[str]:
+        if self.store is None or name not in self._artifact_loaders:
+            return None
+        return self.store.latest(name)
+
+    def load_version(self, name: str, version: str, warm_up: bool = True) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Verify, load and warm up a stored version without serving it.
+
+        Nothing about the slot changes until the model is passed to swap().
+
+        @param name: Slot name
+        @param version: Stored version
+        @param warm_up: Run the slot's warm-up
+        @return: (loaded model, its manifest)
+        """
+        model, manifest = self._load_stored(name, version)
+        if warm_up:
+            self._warm_up(name, model, manifest)
+        return model, manifest
+
+    def preload(self, names: Optional[Iterable[str]] = None, warm_up: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Load and warm up slots in parallel threads.
+
+        Model loading is mostly file I/O and native code that releases the
+        GIL, so loading the slots side by side takes about as long as the
+        slowest one. A slot that fails is reported and left to load lazily.
+        Slots that are already loaded are only warmed up if they were not.
+
+        @param names: Slots to load (defaults to every registered slot)
+        @param warm_up: Run the warm-ups; a pre-fork parent skips them so
+                        thread pools are created in the workers
+        @return: Slot -> load/warm-up seconds, or the error
+        """
+        names = list(names) if names is not None else sorted(set(self._loaders) | set(self._artifact_loaders))
+        report: Dict[str, Dict[str, Any]] = {}
+        if not names:
+            return report
+        with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="model-preload") as pool:
+            futures = {name: pool.submit(self._get, name, warm_up) for name in names}
+            for name, future in futures.items():
+                try:
+                    loaded = future.result() is not None
+                    report[name] = {**self.timings.get(name, {}), "loaded": loaded}
+                except Exception as e:
+                    logger.error(f"Failed to preload {name}: {str(e)}")
+                    report[name] = {"loaded": False, "error": str(e)}
+        return report
+
+    def activate(self, name: str, version: str, warm_up: bool = True) -> Any:
+        """
+        @brief Preload a stored version and swap it in
+        @param name: Slot name
+        @param version: Stored version
+        @param warm_up: Warm up before swapping; otherwise the first get()
+                        (e.g. in a forked worker) warms it up
+        @return: The previous model
+        """
+        model, manifest = self.load_version(name, version, warm_up)
+        return self.swap(name, model, version, manifest, warmed=warm_up)
+
+    def reload(self, name: str, version: str, warm_up: bool = True) -> Any:
+        """
+        @brief Rerun a slot's initial loader and swap the result in
+        @param name: Slot name
+        @param version: Version label of the checkpoint now on disk
+        @param warm_up: Warm up before swapping; otherwise the first get()
+                        (e.g. in a forked worker) warms it up
+        @return: The previous model
+        """
+        model, manifest = self._load_initial(name)
+        manifest["version"] = version
+        if warm_up:
+            self._warm_up(name, model, manifest)
+        return self.swap(name, model, version, manifest, warmed=warm_up)
+
+    def refresh(self, warm_up: bool = True) -> List[str]:
+        """
+        Swap in every slot whose LATEST version differs from the served one.
+
+        Slots that were never used are left to load lazily. A version that
+        fails to verify or load is logged and the old model keeps serving.
+
+        @param warm_up: Warm up new versions before swapping them in
+        @return: Slots that were swapped
+        """
+        swapped = []
+        for name in list(self._artifact_loaders):
+            version = self._store_version(name)
+            if version is None or name not in self._models or version == self._versions.get(name):
+                continue
+            try:
+                self.activate(name, version, warm_up)
+                swapped.append(name)
+            except Exception as e:
+                logger.error(f"Failed to activate {name} version {version}: {str(e)}")
+        return swapped
+
+    async def start(self, interval: float = 30.0) -> None:
+        """
+        @brief Poll the artifact store every ``interval`` seconds
+        @param interval: Seconds between polls (0 disables polling, as in
+                         api.serve workers, whose supervisor polls instead)
+        """
+        if self.store is None or interval <= 0 or (self._task is not None and not self._task.done()):
+            return
+
+        async def run() -> None:
+            loop = asyncio.get_running_loop()
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    # Loading and warm-up run in a thread; requests keep
+                    # being served by the current models meanwhile
+                    await loop.run_in_executor(None, self.refresh)
+                except Exception as e:
+                    logger.error(f"Model refresh failed: {str(e)}")
+
+        self._task = asyncio.get_running_loop().create_task(run())
+        logger.info("Model registry watching the artifact store")
+
+    async def stop(self) -> None:
+        """Stop polling the artifact store."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def swap(
+        self,
+        name: str,
+        model: Any,
+        version: Optional[str] = None,
+        manifest: Optional[Dict[str, Any]] = None,
+        warmed: bool = True
+    ) -> Any:
+        """
+        Replace a slot's model.
+
+        The model, its version and its manifest change together under the
+        slot lock, so a request never sees one model with another's schema.
+
+        @param name: Slot name
+        @param model: New model, fully loaded
+        @param version: Version label of the new model
+        @param manifest: Manifest of the new model (a bare one if None)
+        @param warmed: Whether the model is warmed up; if not, the next
+                       get() warms it up
+        @return: The previous model (None if there was none)
+        """
+        version = version or "unversioned"
+        if manifest is None:
+            manifest = {"slot": name, "version": version, "feature_schema": []}
+        with self._slot_lock(name), self._lock:
+            previous = self._models.get(name)
+            self._models[name] = model
+            self._versions[name] = version
+            self._manifests[name] = manifest
+            if warmed:
+                self._warmed.add(name)
+            else:
+                self._warmed.discard(name)
+        logger.info(f"Model {name} swapped to version {version}")
+        return previous
+
+    def version(self, name: str) -> Optional[str]:
+        """
+        @brief Version label of a slot's current model
+        @param name: Slot name
+        @return: Version, or None if the slot was never loaded
+        """
+        return self._versions.get(name)
+
+    def manifest(self, name: str) -> Dict[str, Any]:
+        """
+        @brief Manifest of a slot's current model (feature schema, window)
+        @param name: Slot name
+        @return: Manifest, empty if the slot was never loaded
+        """
+        return self._manifests.get(name, {})
+
+    def versions(self) -> Dict[str, str]:
+        """
+        @brief Version label of every loaded slot
+        @return: Slot -> version
+        """
+        return dict(self._versions)
+
+
+_model_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    @brief Process-wide model registry, backed by MODEL_STORE_DIR when set
+    @return: Shared ModelRegistry instance
+    """
+    global _model_registry
+    if _model_registry is None:
+        store_dir = os.getenv("MODEL_STORE_DIR")
+        _model_registry = ModelRegistry(ArtifactStore(store_dir) if store_dir else None)
+    return _model_registry
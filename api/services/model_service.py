@@ -7,19 +7,24 @@
 @copyright [Your Organization]
 
 This module implements the model service for the Crypto Investment
-Analysis System, handling model training and inference.
+Analysis System, handling model training and inference. Training
+modules (and torch) are imported by the training methods only, so the
+service is cheap to import from the API.
 """
 
 from typing import Dict, Any, List, Optional
+import asyncio
+import functools
 import logging
-from datetime import datetime
-import torch
-import numpy as np
-from models.technical.train_cnn_lstm import train_model as train_cnn_lstm
-from models.technical.infer_cnn_lstm import load_model as load_cnn_lstm
-from models.sentiment.train_finbert import train_model as train_finbert
-from models.sentiment.infer_finbert import load_model as load_finbert
-from models.ensemble.ensemble_model import EnsembleModel
+from datetime import datetime, timedelta
+from models.ensemble.ensemble_model import EnsembleModel, DEFAULT_WEIGHTS
+from models.ensemble.stacking import (
+    DEFAULT_STACKER_PATH,
+    StackingEnsemble,
+    load_stacker,
+    update_stacker
+)
+from api.db.timescaledb import SessionLocal
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -88,6 +93,8 @@ class ModelService:
         @return: Training results
         """
         try:
+            from models.technical.train_cnn_lstm import train_model as train_cnn_lstm
+
             model, metrics = await train_cnn_lstm(data, config)
             self.models["cnn_lstm"] = model
             return metrics
@@ -109,6 +116,8 @@ class ModelService:
         @return: Training results
         """
         try:
+            from models.sentiment.train_finbert import train_model as train_finbert
+
             model, metrics = await train_finbert(data, config)
             self.models["finbert"] = model
             return metrics
@@ -125,14 +134,34 @@ class ModelService:
         """
         Train ensemble model.
         
+        The stacking meta-learner is refit on logged predictions whose
+        outcomes were realized since its last update, starting from the
+        saved artifact when there is one.
+        
         @param data: All training data
-        @param config: Model configuration
+        @param config: Model configuration (path, l2, decay, horizon_hours)
         @return: Training results
         """
         try:
-            model = EnsembleModel(config)
-            metrics = await model.train(data)
-            self.models["ensemble"] = model
+            path = config.get("path", DEFAULT_STACKER_PATH)
+            stacker = load_stacker(path) or StackingEnsemble(
+                list(DEFAULT_WEIGHTS),
+                l2=config.get("l2", 1.0),
+                decay=config.get("decay", 1.0),
+                prior_weights=DEFAULT_WEIGHTS
+            )
+            loop = asyncio.get_running_loop()
+            metrics = await loop.run_in_executor(
+                None,
+                functools.partial(
+                    update_stacker,
+                    stacker,
+                    SessionLocal,
+                    timedelta(hours=config.get("horizon_hours", 24))
+                )
+            )
+            stacker.save(path)
+            self.models["ensemble"] = EnsembleModel(stacker=stacker)
             return metrics
 
         except Exception as e:
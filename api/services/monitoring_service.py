@@ -11,20 +11,21 @@ Analysis System, handling model performance monitoring and alerts.
 """
 
 from typing import Dict, Any, List, Optional
+import asyncio
 import logging
+import os
 from datetime import datetime, timedelta
 import numpy as np
-from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client import Counter, Gauge
+from api.services.instrumentation import PREDICTION_LATENCY
 from monitoring.performance_metrics import (
     calculate_metrics,
     check_thresholds,
     generate_alert
 )
-from monitoring.data_quality import (
-    check_data_quality,
-    validate_features,
-    check_data_drift
-)
+from monitoring.data_quality import check_data_quality
+from monitoring.drift import FEATURE_DRIFT, get_drift_detector
+from monitoring.accuracy import ALL_TICKERS, MODEL_ACCURACY
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -34,63 +35,128 @@ PREDICTION_COUNTER = Counter(
     'model_predictions_total',
     'Total number of predictions made'
 )
-PREDICTION_LATENCY = Histogram(
-    'prediction_latency_seconds',
-    'Time spent processing predictions'
-)
-MODEL_ACCURACY = Gauge(
-    'model_accuracy',
-    'Model accuracy score'
-)
-FEATURE_DRIFT = Gauge(
-    'feature_drift_score',
-    'Feature drift detection score'
+DATA_QUALITY_ISSUES = Counter(
+    'feature_quality_issues_total',
+    'Feature data-quality issues by check',
+    ['check']
 )
 
 
 class MonitoringService:
     """Service for handling model monitoring and alerts."""
 
-    def __init__(self):
-        """Initialize monitoring service."""
+    def __init__(self, max_queue: int = 10000):
+        """
+        Initialize monitoring service.
+
+        @param max_queue: Maximum number of predictions waiting for
+                          background monitoring
+        """
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
         logger.info("Monitoring service initialized")
 
+    async def start(self) -> None:
+        """Start the background monitoring task on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info("Monitoring worker started")
+
+    async def stop(self) -> None:
+        """Stop the background task after processing queued predictions."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        # The task may be cancelled before it first runs, so drain here
+        while not self._queue.empty():
+            self._process(*self._queue.get_nowait())
+
     async def monitor_prediction(
         self,
         prediction: Dict[str, Any],
-        features: Dict[str, Any]
+        features: Dict[str, Any],
+        market_context: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
-        @brief Monitor a single prediction
+        Monitor a single prediction without delaying the response.
+
+        Only the vectorized data-quality rules run inline; drift tracking
+        and alerting on the prediction are queued for the background task.
+        When the queue is full the prediction is not monitored.
+
         @param prediction: Model prediction
         @param features: Input features
+        @param market_context: Market context supplied with the request
         @return: Monitoring results
         """
         try:
             # Update metrics
             PREDICTION_COUNTER.inc()
-            
+
             # Check data quality
             quality_metrics = await self._check_data_quality(features)
-            
-            # Check for drift
-            drift_metrics = await self._check_drift(features)
-            
-            # Generate monitoring report
+
+            alerts = check_thresholds(quality_metrics)
+
+            if self._task is None or self._task.done():
+                await self.start()
+            try:
+                self._queue.put_nowait((features, quality_metrics, alerts, market_context))
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+            # Generate monitoring report; drift scores are from the latest
+            # timed evaluation
             return {
                 "timestamp": datetime.now(),
                 "quality_metrics": quality_metrics,
-                "drift_metrics": drift_metrics,
-                "alerts": self._generate_alerts(
-                    quality_metrics,
-                    drift_metrics
-                )
+                "drift_metrics": get_drift_detector().latest,
+                "alerts": alerts
             }
 
         except Exception as e:
             logger.error(f"Prediction monitoring failed: {str(e)}")
             raise
 
+    async def _run(self) -> None:
+        """Process queued predictions until cancelled."""
+        while True:
+            self._process(*await self._queue.get())
+
+    def _process(
+        self,
+        features: Dict[str, Any],
+        quality_metrics: Dict[str, Any],
+        alerts: List[Dict[str, Any]],
+        market_context: Optional[Dict[str, Any]]
+    ) -> None:
+        """
+        @brief Background monitoring of one prediction
+        @param features: Input features
+        @param quality_metrics: Inline data-quality results
+        @param alerts: Inline data-quality alerts
+        @param market_context: Market context supplied with the request
+        """
+        try:
+            for check in ("missing", "non_finite", "out_of_range", "stale_groups", "unexpected"):
+                if quality_metrics.get(check):
+                    DATA_QUALITY_ISSUES.labels(check=check).inc(len(quality_metrics[check]))
+            self._check_drift(features)
+            for alert in alerts:
+                logger.warning(f"Monitoring alert: {alert} (market context: {market_context})")
+
+        except Exception as e:
+            logger.error(f"Background monitoring failed: {str(e)}")
+
     async def _check_data_quality(
         self,
         features: Dict[str, Any]
@@ -107,17 +173,19 @@ class MonitoringService:
             logger.error(f"Data quality check failed: {str(e)}")
             raise
 
-    async def _check_drift(
+    def _check_drift(
         self,
         features: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
-        @brief Check for data drift
+        @brief Record features for drift detection
         @param features: Input features
-        @return: Drift metrics
+        @return: Drift scores from the latest timed evaluation
         """
         try:
-            return check_data_drift(features)
+            detector = get_drift_detector()
+            detector.observe(features)
+            return detector.latest
 
         except Exception as e:
             logger.error(f"Drift check failed: {str(e)}")
@@ -158,11 +226,32 @@ class MonitoringService:
         """
         try:
             # Update Prometheus metrics
-            MODEL_ACCURACY.set(metrics.get("accuracy", 0.0))
-            FEATURE_DRIFT.set(metrics.get("drift_score", 0.0))
+            MODEL_ACCURACY.labels(
+                model=metrics.get("model", "ensemble"),
+                ticker=ALL_TICKERS,
+                horizon=metrics.get("horizon", ""),
+                metric="accuracy"
+            ).set(metrics.get("accuracy", 0.0))
+            FEATURE_DRIFT.labels(feature="overall", metric="psi").set(metrics.get("drift_score", 0.0))
             
             logger.info(f"Model metrics updated: {metrics}")
 
         except Exception as e:
             logger.error(f"Failed to update model metrics: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+
+_monitoring_service: Optional[MonitoringService] = None
+
+
+def get_monitoring_service() -> MonitoringService:
+    """
+    @brief Process-wide monitoring service configured from the environment
+    @return: Shared MonitoringService instance
+    """
+    global _monitoring_service
+    if _monitoring_service is None:
+        _monitoring_service = MonitoringService(
+            max_queue=int(os.getenv("MONITORING_MAX_QUEUE", "10000"))
+        )
+    return _monitoring_service
@@ -0,0 +1,238 @@
+"""
+@file prediction_cache.py
+@brief Prediction result cache with request coalescing
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements the prediction cache for the Crypto Investment
+Analysis System. Results are keyed by ticker, timeframe, analysis options
+and model version and expire when the timeframe's current bar closes.
+Concurrent requests for the same key are coalesced so that only one of
+them runs the computation and the others await its result.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from api.services.feature_cache import next_bar_close
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one execution."""
+
+    def __init__(self):
+        """Initialize the in-flight call table."""
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        @brief Run ``fn`` once for all concurrent callers of ``key``
+
+        The computation runs as its own task and every caller, including
+        the one that started it, awaits it through a shield, so a caller
+        that is cancelled (e.g. its client disconnected) leaves the
+        computation and the other callers alone.
+
+        @param key: Coalescing key
+        @param fn: Coroutine function computing the result
+        @return: (result, shared) where shared is True for waiting callers
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if not shared:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task), shared
+
+    def _finished(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Retrieve the exception so a task nobody awaits any more does not warn
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        """
+        @brief Number of keys currently being computed
+        @return: In-flight call count
+        """
+        return len(self._calls)
+
+
+class PredictionCache:
+    """Bar-aligned prediction result cache with single-flight computation."""
+
+    def __init__(self, max_entries: int = 4096, max_ttl: float = 900.0):
+        """
+        Initialize the prediction cache.
+
+        @param max_entries: Maximum number of cached predictions
+        @param max_ttl: Upper bound on entry lifetime in seconds
+        """
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # Per-ticker invalidation counters fencing in-flight computations
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        logger.info("Prediction cache initialized")
+
+    @staticmethod
+    def make_key(
+        ticker: str,
+        timeframe: Any,
+        options: Dict[str, Any],
+        model_version: str
+    ) -> Tuple[str, str, str, str]:
+        """
+        @brief Build a cache key from the request parameters
+        @param ticker: Cryptocurrency ticker
+        @param timeframe: TimeFrame enum member or its string value
+        @param options: Analysis options affecting the result
+        @param model_version: Version of the models serving the request
+        @return: Hashable cache key
+        """
+        normalized = json.dumps(
+            {k: getattr(v, "value", v) for k, v in options.items()},
+            sort_keys=True,
+            default=str
+        )
+        return (
+            ticker.upper(),
+            getattr(timeframe, "value", timeframe),
+            normalized,
+            model_version
+        )
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """
+        @brief Cached prediction if not expired
+        @param key: Key from make_key
+        @return: Copy of the cached prediction, or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry[1])
+
+    def generation(self, ticker: str) -> int:
+        """
+        @brief Invalidation generation of a ticker
+        @param ticker: Cryptocurrency ticker
+        @return: Number of invalidations of the ticker so far
+        """
+        with self._lock:
+            return self._generations.get(ticker.upper(), 0)
+
+    def set(
+        self,
+        key: Tuple,
+        prediction: Dict[str, Any],
+        generation: Optional[int] = None
+    ) -> bool:
+        """
+        @brief Cache a prediction until its bar closes
+        @param key: Key from make_key
+        @param prediction: Prediction result
+        @param generation: generation() taken before the prediction was computed
+        @return: False if the ticker was invalidated since and nothing was stored
+        """
+        now = time.time()
+        expires = min(next_bar_close(key[1], now), now + self.max_ttl)
+        with self._lock:
+            if generation is not None and self._generations.get(key[0], 0) != generation:
+                logger.debug(f"Dropped stale prediction for {key[0]} {key[1]}")
+                return False
+            self._entries[key] = (expires, copy.deepcopy(prediction))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    async def get_or_compute(
+        self,
+        key: Tuple,
+        compute: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        @brief Serve from cache, or compute once for all concurrent callers
+        @param key: Key from make_key
+        @param compute: Coroutine function producing the prediction
+        @return: Prediction result
+        """
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        generation = self.generation(key[0])
+
+        async def compute_and_store() -> Dict[str, Any]:
+            prediction = await compute()
+            self.set(key, prediction, generation)
+            return prediction
+
+        # Requests after an invalidation do not join a computation that
+        # started before it
+        prediction, shared = await self._flight.do((key, generation), compute_and_store)
+        if shared:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+        return copy.deepcopy(prediction)
+
+    def invalidate(self, ticker: str) -> None:
+        """
+        @brief Drop all cached predictions of a ticker
+        @param ticker: Cryptocurrency ticker
+        """
+        ticker = ticker.upper()
+        with self._lock:
+            self._generations[ticker] = self._generations.get(ticker, 0) + 1
+            for key in [k for k in self._entries if k[0] == ticker]:
+                del self._entries[key]
+
+
+_prediction_cache: Optional[PredictionCache] = None
+_prediction_cache_lock = threading.Lock()
+
+
+def get_prediction_cache() -> PredictionCache:
+    """
+    @brief Process-wide prediction cache configured from the environment
+    @return: Shared PredictionCache instance
+    """
+    global _prediction_cache
+    if _prediction_cache is None:
+        with _prediction_cache_lock:
+            if _prediction_cache is None:
+                _prediction_cache = PredictionCache(
+                    max_entries=int(os.getenv("PREDICTION_CACHE_MAX_ENTRIES", "4096")),
+                    max_ttl=float(os.getenv("PREDICTION_CACHE_MAX_TTL", "900"))
+                )
+    return _prediction_cache
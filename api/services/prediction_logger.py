@@ -0,0 +1,193 @@
+"""
+@file prediction_logger.py
+@brief Write-behind logger for model predictions
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements the write-behind prediction logger for the Crypto
+Investment Analysis System. Requests enqueue prediction records into a
+bounded in-memory queue and return immediately; a background task drains
+the queue and writes records to ``model_predictions`` in batched
+multi-row inserts. Remaining records are flushed on shutdown.
+"""
+
+from typing import Any, Callable, List, Optional
+import asyncio
+import logging
+import os
+from sqlalchemy import insert
+from api.db.timescaledb import SessionLocal, ModelPrediction
+from api.models.prediction_log import ModelPredictionLog
+from api.services.instrumentation import stage_timer
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class PredictionLogWriter:
+    """Bounded write-behind queue flushing prediction logs in batches."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any] = SessionLocal,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        enqueue_timeout: float = 0.05,
+        max_retries: int = 3
+    ):
+        """
+        Initialize the prediction log writer.
+
+        @param session_factory: Callable returning a new SQLAlchemy session
+        @param max_queue: Maximum number of queued records
+        @param batch_size: Maximum records per insert
+        @param flush_interval: Maximum seconds a record waits before a flush
+        @param enqueue_timeout: Seconds a request waits on a full queue before
+                                its records are dropped
+        @param max_retries: Write attempts per batch before it is dropped
+        """
+        self.session_factory = session_factory
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.max_retries = max_retries
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+        logger.info("Prediction log writer initialized")
+
+    async def start(self) -> None:
+        """Start the background flush task on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info("Prediction log writer started")
+
+    async def log(self, records: List[ModelPredictionLog]) -> int:
+        """
+        Enqueue prediction records without waiting for the database.
+
+        When the queue is full the caller waits up to ``enqueue_timeout``
+        for space (backpressure); records that still do not fit are dropped
+        and counted rather than adding unbounded latency to the request.
+
+        @param records: Prediction records to persist
+        @return: Number of records enqueued
+        """
+        if self._task is None or self._task.done():
+            await self.start()
+
+        enqueued = 0
+        for record in records:
+            try:
+                self._queue.put_nowait(record)
+            except asyncio.QueueFull:
+                try:
+                    await asyncio.wait_for(
+                        self._queue.put(record),
+                        timeout=self.enqueue_timeout
+                    )
+                except asyncio.TimeoutError:
+                    self.dropped += len(records) - enqueued
+                    logger.warning(
+                        f"Prediction log queue full, dropped "
+                        f"{len(records) - enqueued} records"
+                    )
+                    break
+            enqueued += 1
+        return enqueued
+
+    async def stop(self) -> None:
+        """Stop the background task after flushing all queued records."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info(
+            f"Prediction log writer stopped ({self.written} written, "
+            f"{self.dropped} dropped)"
+        )
+
+    def pending(self) -> int:
+        """
+        @brief Number of records waiting to be written
+        @return: Queue size
+        """
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _run(self) -> None:
+        """Drain the queue in batches until cancelled, then flush the rest."""
+        loop = asyncio.get_running_loop()
+        batch: List[ModelPredictionLog] = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(
+                            await asyncio.wait_for(self._queue.get(), timeout)
+                        )
+                    except asyncio.TimeoutError:
+                        break
+                pending, batch = batch, []
+                await loop.run_in_executor(None, self._write_batch, pending)
+        except asyncio.CancelledError:
+            # A batch handed to the executor is written there; only records
+            # still held here or in the queue need flushing
+            remaining = batch
+            while not self._queue.empty():
+                remaining.append(self._queue.get_nowait())
+            for start in range(0, len(remaining), self.batch_size):
+                self._write_batch(remaining[start:start + self.batch_size])
+            raise
+
+    def _write_batch(self, batch: List[ModelPredictionLog]) -> None:
+        """
+        @brief Write one batch with a single multi-row insert
+        @param batch: Prediction records
+        """
+        rows = [record.dict() for record in batch]
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                with stage_timer("db_log"), self.session_factory() as session:
+                    session.execute(insert(ModelPrediction.__table__), rows)
+                    session.commit()
+                self.written += len(rows)
+                return
+            except Exception as e:
+                logger.error(
+                    f"Prediction log write failed (attempt {attempt}): {str(e)}"
+                )
+        self.dropped += len(rows)
+
+
+_prediction_log_writer: Optional[PredictionLogWriter] = None
+
+
+def get_prediction_log_writer() -> PredictionLogWriter:
+    """
+    @brief Process-wide prediction log writer configured from the environment
+    @return: Shared PredictionLogWriter instance
+    """
+    global _prediction_log_writer
+    if _prediction_log_writer is None:
+        _prediction_log_writer = PredictionLogWriter(
+            max_queue=int(os.getenv("PREDICTION_LOG_MAX_QUEUE", "10000")),
+            batch_size=int(os.getenv("PREDICTION_LOG_BATCH_SIZE", "500")),
+            flush_interval=float(os.getenv("PREDICTION_LOG_FLUSH_INTERVAL", "1.0"))
+        )
+    return _prediction_log_writer
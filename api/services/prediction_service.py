@@ -10,17 +10,66 @@ This module implements the prediction service for the Crypto Investment
 Analysis System, handling model predictions and risk assessment.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 from datetime import datetime
+import asyncio
+import functools
 import logging
-from api.models.schemas import RiskLevel
+import os
+import numpy as np
+from api.models.schemas import RiskLevel, TimeFrame, AnalysisType
+from api.services.feature_service import FeatureService
+from api.services.feature_store import get_feature_store
+from api.services.prediction_cache import get_prediction_cache
+from api.services.instrumentation import timed
+from api.services.model_registry import get_model_registry
 from models.technical.infer_cnn_lstm import load_model as load_technical_model
+from models.technical.infer_cnn_lstm import predict as predict_technical
+from models.technical.infer_cnn_lstm import predict_batch as predict_technical_batch
 from models.sentiment.infer_finbert import load_model as load_sentiment_model
+from models.sentiment.infer_finbert import predict as predict_sentiment
+from models.tokenomics.infer_xgboost import load_model as load_tokenomics_model
+from models.tokenomics.infer_xgboost import predict as predict_tokenomics
+from models.tokenomics.infer_xgboost import predict_batch as predict_tokenomics_batch
+from models.tokenomics.infer_xgboost import TOKENOMICS_FEATURES
 from models.ensemble.ensemble_model import EnsembleModel
+from models.ensemble.stacking import load_stacker
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Window length of technical models whose manifest does not record one
+DEFAULT_TECHNICAL_WINDOW = 50
+
+# Slots whose score, when present, was produced by the slot's loaded model;
+# the sentiment slot is still a fixed placeholder
+MODEL_SCORED_SLOTS = ("technical", "fundamental")
+
+
+def _warm_up_technical(model: Any, manifest: Dict[str, Any]) -> None:
+    """Run one batched forward pass so lazy initialization happens before serving."""
+    # Checkpoints without a manifest schema carry their input size in the config
+    n_features = len(manifest["feature_schema"]) or getattr(model, "config", {}).get("input_size")
+    if not n_features:
+        return
+    window = np.zeros((1, manifest.get("window", DEFAULT_TECHNICAL_WINDOW), n_features), dtype=np.float32)
+    predict_technical_batch(model, window)
+
+
+def _warm_up_sentiment(model: Any, manifest: Dict[str, Any]) -> None:
+    """Tokenize and classify one headline, which also loads the tokenizer."""
+    predict_sentiment(model, ["Bitcoin price holds steady"])
+
+
+def _warm_up_tokenomics(model: Any, manifest: Dict[str, Any]) -> None:
+    """Run one prediction on an all-missing feature row."""
+    predict_tokenomics_batch(model, np.full((1, len(TOKENOMICS_FEATURES)), np.nan, dtype=np.float32))
+
+
+def _warm_up_ensemble(model: EnsembleModel, manifest: Dict[str, Any]) -> None:
+    """Combine one empty prediction."""
+    model.combine_dicts([{}])
+
 
 class PredictionService:
     """Service for handling prediction requests."""
@@ -28,20 +77,50 @@ class PredictionService:
     def __init__(self):
         """Initialize prediction service with required models."""
         try:
-            self.technical_model = load_technical_model()
-            self.sentiment_model = load_sentiment_model()
-            self.ensemble_model = EnsembleModel()
+            # Models are loaded once per process and shared by all requests
+            self.registry = get_model_registry()
+            self.registry.register_loader("technical", load_technical_model)
+            self.registry.register_loader("sentiment", load_sentiment_model)
+            self.registry.register_loader("fundamental", load_tokenomics_model)
+            self.registry.register_loader("ensemble", lambda: EnsembleModel(stacker=load_stacker()))
+            # Versioned artifacts take precedence when MODEL_STORE_DIR is set
+            self.registry.register_artifact_loader("technical", load_technical_model, _warm_up_technical)
+            self.registry.register_artifact_loader("sentiment", load_sentiment_model, _warm_up_sentiment)
+            self.registry.register_artifact_loader("fundamental", load_tokenomics_model, _warm_up_tokenomics)
+            self.registry.register_artifact_loader(
+                "ensemble", lambda path: EnsembleModel(stacker=load_stacker(path)), _warm_up_ensemble
+            )
+            self.model_version = os.getenv("MODEL_VERSION", "1.0.0")
+            self.prediction_cache = get_prediction_cache()
+            self.feature_store = get_feature_store()
             logger.info("Prediction service initialized")
         except Exception as e:
             logger.error(f"Failed to initialize prediction service: {str(e)}")
             raise
 
+    @property
+    def technical_model(self) -> Any:
+        return self.registry.get("technical")
+
+    @property
+    def sentiment_model(self) -> Any:
+        return self.registry.get("sentiment")
+
+    @property
+    def tokenomics_model(self) -> Any:
+        return self.registry.get("fundamental")
+
+    @property
+    def ensemble_model(self) -> EnsembleModel:
+        return self.registry.get("ensemble")
+
     async def predict(
         self,
         features: Dict[str, Any],
         analysis_type: str = "comprehensive",
         feature_weights: Optional[Dict[str, float]] = None,
-        risk_tolerance: Optional[RiskLevel] = None
+        risk_tolerance: Optional[RiskLevel] = None,
+        ticker: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Make prediction based on features and parameters.
@@ -50,55 +129,89 @@ class PredictionService:
         @param analysis_type: Type of analysis to perform
         @param feature_weights: Optional weights for different features
         @param risk_tolerance: Optional risk tolerance level
+        @param ticker: Cryptocurrency ticker, whose stored feature history
+                       feeds the technical model
         @return: Prediction results
         """
         try:
             # Get predictions from individual models
             technical_pred = await self._get_technical_prediction(
-                features.get("technical", {})
+                features.get("technical", {}),
+                ticker
             )
             sentiment_pred = await self._get_sentiment_prediction(
                 features.get("sentiment", {})
             )
-            
-            # Get ensemble prediction
-            ensemble_pred = await self._get_ensemble_prediction(
-                technical_pred,
-                sentiment_pred
+            fundamental_pred = await self._get_fundamental_prediction(
+                features.get("tokenomics", {})
             )
+            predictions = {"sentiment": sentiment_pred}
+            if technical_pred is not None:
+                predictions["technical"] = technical_pred
+            if fundamental_pred is not None:
+                predictions["fundamental"] = fundamental_pred
             
-            # Assess risk
-            risk_level = self._assess_risk(ensemble_pred)
+            # Ensemble score, confidence and risk in one combine call
+            ensemble = await self._get_ensemble_prediction(predictions, feature_weights)
             
             return {
                 "timestamp": datetime.now(),
-                "score": ensemble_pred,
-                "risk": risk_level,
-                "predictions": {
-                    "technical": technical_pred,
-                    "sentiment": sentiment_pred
+                "score": ensemble["score"],
+                "risk": RiskLevel(ensemble["risk"]),
+                "predictions": predictions,
+                # Only these are model outputs, worth logging and scoring
+                "model_versions": {
+                    slot: self.registry.version(slot)
+                    for slot in MODEL_SCORED_SLOTS if slot in predictions
                 },
                 "features": features,
-                "confidence": self._calculate_confidence(
-                    technical_pred,
-                    sentiment_pred
-                )
+                "confidence": ensemble["confidence"]
             }
 
         except Exception as e:
             logger.error(f"Prediction failed: {str(e)}")
             raise
 
-    async def get_latest_prediction(self, ticker: str) -> Dict[str, Any]:
+    async def get_latest_prediction(
+        self,
+        ticker: str,
+        timeframe: TimeFrame = TimeFrame.DAY,
+        analysis_type: AnalysisType = AnalysisType.COMPREHENSIVE
+    ) -> Dict[str, Any]:
         """
         Get latest prediction for a ticker.
         
+        Results are cached until the timeframe's current bar closes, and
+        concurrent requests for the same prediction share one computation.
+        
         @param ticker: Cryptocurrency ticker
+        @param timeframe: Time frame for the prediction
+        @param analysis_type: Type of analysis to perform
         @return: Latest prediction
         """
         try:
-            # Placeholder for database lookup
-            return None
+            key = self.prediction_cache.make_key(
+                ticker,
+                timeframe,
+                {"analysis_type": analysis_type},
+                # Hot-swapped models must not be served stale cached results
+                f"{self.model_version}:{sorted(self.registry.versions().items())}"
+            )
+
+            async def compute() -> Dict[str, Any]:
+                features = await FeatureService().get_features(
+                    ticker=ticker,
+                    timeframe=timeframe
+                )
+                prediction = await self.predict(
+                    features=features,
+                    analysis_type=analysis_type,
+                    ticker=ticker
+                )
+                prediction["ticker"] = ticker
+                return prediction
+
+            return await self.prediction_cache.get_or_compute(key, compute)
         except Exception as e:
             logger.error(f"Failed to get latest prediction: {str(e)}")
             raise
@@ -121,23 +234,87 @@ class PredictionService:
             logger.error(f"Confidence calculation failed: {str(e)}")
             raise
 
+    async def score_technical(
+        self,
+        tickers: Optional[Iterable[str]] = None,
+        as_of: Optional[datetime] = None
+    ) -> Dict[str, float]:
+        """
+        Score many assets with the technical model in one batched pass.
+
+        Each asset's input is its latest stored technical feature rows, in
+        the column order of the model's manifest and with its window length.
+
+        @param tickers: Cryptocurrency tickers (every asset with features if None)
+        @param as_of: Point in time to read features at (defaults to now)
+        @return: Ticker -> up-move probability; assets without a model
+                 or a complete feature window are omitted
+        """
+        try:
+            model = self.technical_model
+            if model is None:
+                return {}
+            manifest = self.registry.manifest("technical")
+            loop = asyncio.get_running_loop()
+            windows = await loop.run_in_executor(
+                None,
+                functools.partial(
+                    self.feature_store.get_feature_windows,
+                    tickers,
+                    manifest.get("window", DEFAULT_TECHNICAL_WINDOW),
+                    "technical",
+                    manifest.get("feature_schema") or None,
+                    as_of
+                )
+            )
+            if not windows:
+                return {}
+            scores = await loop.run_in_executor(
+                None,
+                predict_technical_batch,
+                model,
+                np.stack(list(windows.values()))
+            )
+            return {ticker: float(score) for ticker, score in zip(windows, scores)}
+        except Exception as e:
+            logger.error(f"Technical batch scoring failed: {str(e)}")
+            raise
+
+    @timed("inference", "technical")
     async def _get_technical_prediction(
         self,
-        features: Dict[str, Any]
-    ) -> float:
+        features: Dict[str, Any],
+        ticker: Optional[str] = None
+    ) -> Optional[float]:
         """
         Get technical analysis prediction.
         
-        @param features: Technical features
-        @return: Technical prediction score
+        @param features: Technical features; an explicit "window" array is
+                         scored as is
+        @param ticker: Cryptocurrency ticker whose stored window is scored
+        @return: Technical prediction score, or None without a model or window
         """
         try:
-            # Implement technical prediction logic
-            return 0.75
+            window = features.get("window")
+            if window is None:
+                if ticker is None:
+                    return None
+                return (await self.score_technical([ticker])).get(ticker)
+            model = self.technical_model
+            if model is None:
+                return None
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None,
+                predict_technical,
+                model,
+                window
+            )
         except Exception as e:
             logger.error(f"Technical prediction failed: {str(e)}")
             raise
 
+    @timed("inference", "sentiment")
     async def _get_sentiment_prediction(
         self,
         features: Dict[str, Any]
@@ -155,56 +332,44 @@ class PredictionService:
             logger.error(f"Sentiment prediction failed: {str(e)}")
             raise
 
-    async def _get_ensemble_prediction(
+    @timed("inference", "fundamental")
+    async def _get_fundamental_prediction(
         self,
-        technical_pred: float,
-        sentiment_pred: float
-    ) -> float:
+        features: Dict[str, Any]
+    ) -> Optional[float]:
         """
-        Get ensemble prediction.
+        Get tokenomics (fundamental) prediction.
         
-        @param technical_pred: Technical prediction score
-        @param sentiment_pred: Sentiment prediction score
-        @return: Ensemble prediction score
+        @param features: Tokenomics features
+        @return: Tokenomics prediction score, or None without a model or features
         """
         try:
-            # Implement ensemble prediction logic
-            return 0.80
+            model = self.tokenomics_model
+            if model is None or not features:
+                return None
+            # Native XGBoost prediction is sub-millisecond; no executor hop
+            return predict_tokenomics(model, features)
         except Exception as e:
-            logger.error(f"Ensemble prediction failed: {str(e)}")
+            logger.error(f"Tokenomics prediction failed: {str(e)}")
             raise
 
-    def _assess_risk(self, score: float) -> RiskLevel:
-        """
-        Assess risk level based on prediction score.
-        
-        @param score: Prediction score
-        @return: Risk level
-        """
-        if score >= 0.8:
-            return RiskLevel.LOW
-        elif score >= 0.6:
-            return RiskLevel.MEDIUM
-        elif score >= 0.4:
-            return RiskLevel.HIGH
-        else:
-            return RiskLevel.EXTREME
-
-    def _calculate_confidence(
+    @timed("ensemble", "ensemble")
+    async def _get_ensemble_prediction(
         self,
-        technical_pred: float,
-        sentiment_pred: float
-    ) -> float:
+        predictions: Dict[str, float],
+        feature_weights: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
         """
-        Calculate overall prediction confidence.
+        Get ensemble prediction.
         
-        @param technical_pred: Technical prediction score
-        @param sentiment_pred: Sentiment prediction score
-        @return: Confidence score
+        @param predictions: Score per ensemble slot (technical, sentiment,
+                            fundamental, onchain); missing slots are skipped
+        @param feature_weights: Optional per-request weight per slot, used in
+                                place of the default weights for this call only
+        @return: Ensemble score, confidence and risk level
         """
         try:
-            # Implement confidence calculation logic
-            return 0.85
+            return self.ensemble_model.combine_dicts([predictions], feature_weights)[0]
         except Exception as e:
-            logger.error(f"Confidence calculation failed: {str(e)}")
-            raise 
\ No newline at end of file
+            logger.error(f"Ensemble prediction failed: {str(e)}")
+            raise
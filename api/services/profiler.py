@@ -0,0 +1,277 @@
+"""
+@file profiler.py
+@brief Opt-in sampling profiler for API requests
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements request profiling for the Crypto Investment
+Analysis System. A sampler thread snapshots the Python stacks of every
+thread in the process (so model inference running in executor threads is
+included) at a fixed interval while a request is in flight, and the
+aggregated stacks are written as a collapsed-stack file for flamegraph
+tools or a speedscope JSON profile.
+
+Profiling is triggered per request by an ``X-Profile`` header or a
+``profile`` query parameter together with the admin token, or on 1 in N
+requests in rolling mode. Only one profile runs at a time.
+"""
+
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import itertools
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from urllib.parse import parse_qs
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+PROFILE_FORMATS = ("speedscope", "collapsed")
+
+# Leaf frames of threads that are parked rather than working
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+    ("queue.py", "get"),
+}
+
+Frame = Tuple[str, str, int]
+
+
+class SamplingProfiler:
+    """Samples the stacks of all threads on a background thread."""
+
+    def __init__(self, interval: float = 0.005, include_idle: bool = False):
+        """
+        @param interval: Seconds between samples
+        @param include_idle: Keep samples of threads parked in waits
+        """
+        self.interval = interval
+        self.include_idle = include_idle
+        self.samples: Counter = Counter()
+        # Seconds attributed to each stack: the measured time since the
+        # previous sample, as the sampler wakes late while others hold the GIL
+        self.seconds: Counter = Counter()
+        self.sample_count = 0
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling."""
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._stack(frame)
+                if not stack or (not self.include_idle and self._is_idle(stack[-1])):
+                    continue
+                key = (names.get(thread_id, str(thread_id)),) + stack
+                self.samples[key] += 1
+                self.seconds[key] += elapsed
+            self.sample_count += 1
+
+    @staticmethod
+    def _stack(frame: Any) -> Tuple[Frame, ...]:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        return tuple(reversed(stack))
+
+    @staticmethod
+    def _is_idle(leaf: Frame) -> bool:
+        return (os.path.basename(leaf[1]), leaf[0]) in IDLE_FRAMES
+
+    @staticmethod
+    def _frame_name(frame: Frame) -> str:
+        name, filename, line = frame
+        return f"{name} ({os.path.basename(filename)}:{line})"
+
+    def collapsed(self) -> str:
+        """
+        @brief Stacks in the collapsed format (``thread;outer;...;leaf count``)
+        @return: One line per distinct stack
+        """
+        lines = []
+        for (thread, *stack), count in self.samples.most_common():
+            frames = [thread] + [self._frame_name(f).replace(";", ":") for f in stack]
+            lines.append(f"{';'.join(frames)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str = "request") -> Dict[str, Any]:
+        """
+        @brief Stacks as a speedscope file with one sampled profile per thread
+
+        Stacks are weighted by measured wall time, not samples times the
+        nominal interval.
+
+        @param name: Profile name
+        @return: speedscope JSON document
+        """
+        frame_index: Dict[Frame, int] = {}
+        frames: List[Dict[str, Any]] = []
+        per_thread: Dict[str, List[Tuple[List[int], float]]] = {}
+        for (thread, *stack), seconds in self.seconds.items():
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indices.append(frame_index[frame])
+            per_thread.setdefault(thread, []).append((indices, seconds))
+
+        profiles = []
+        for thread, stacks in per_thread.items():
+            total = sum(seconds for _, seconds in stacks)
+            profiles.append({
+                "type": "sampled",
+                "name": thread,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": total,
+                "samples": [indices for indices, _ in stacks],
+                "weights": [seconds for _, seconds in stacks],
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "crypto-analysis-api",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def write(self, path: str, fmt: str = "speedscope", name: str = "request") -> str:
+        """
+        @brief Write the profile to disk
+        @param path: Output path without extension
+        @param fmt: "speedscope" or "collapsed"
+        @param name: Profile name (speedscope only)
+        @return: Path written
+        """
+        if fmt not in PROFILE_FORMATS:
+            raise ValueError(f"Unknown profile format: {fmt}")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if fmt == "collapsed":
+            path = f"{path}.collapsed.txt"
+            with open(path, "w") as f:
+                f.write(self.collapsed())
+        else:
+            path = f"{path}.speedscope.json"
+            with open(path, "w") as f:
+                json.dump(self.speedscope(name), f)
+        return path
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling on-demand and 1-in-N requests."""
+
+    def __init__(
+        self,
+        app: Callable,
+        profile_dir: Optional[str] = None,
+        admin_token: Optional[str] = None,
+        sample_rate: Optional[int] = None,
+        fmt: Optional[str] = None,
+        interval: Optional[float] = None
+    ):
+        """
+        @param app: Wrapped ASGI application
+        @param profile_dir: Output directory (defaults to PROFILE_DIR)
+        @param admin_token: Token required for on-demand profiles (defaults to
+                            PROFILE_ADMIN_TOKEN; on-demand is disabled without one)
+        @param sample_rate: Profile 1 in N requests (defaults to
+                            PROFILE_SAMPLE_RATE; 0 disables rolling mode)
+        @param fmt: "speedscope" or "collapsed" (defaults to PROFILE_FORMAT)
+        @param interval: Sampling interval in seconds (defaults to PROFILE_INTERVAL)
+        """
+        self.app = app
+        self.profile_dir = profile_dir or os.getenv("PROFILE_DIR", "profiles")
+        self.admin_token = admin_token if admin_token is not None else os.getenv("PROFILE_ADMIN_TOKEN", "")
+        self.sample_rate = sample_rate if sample_rate is not None else int(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+        self.fmt = fmt or os.getenv("PROFILE_FORMAT", "speedscope")
+        self.interval = interval or float(os.getenv("PROFILE_INTERVAL", "0.005"))
+        self._requests = itertools.count(1)
+        self._busy = threading.Lock()
+
+    def _requested(self, scope: Dict[str, Any]) -> bool:
+        headers = {k.decode().lower(): v.decode() for k, v in scope.get("headers", [])}
+        query = parse_qs(scope.get("query_string", b"").decode())
+        wanted = headers.get("x-profile") in ("1", "true") or query.get("profile", [""])[0] in ("1", "true")
+        return wanted and bool(self.admin_token) and headers.get("x-admin-token") == self.admin_token
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        on_demand = self._requested(scope)
+        rolling = self.sample_rate > 0 and next(self._requests) % self.sample_rate == 0
+        if not (on_demand or rolling) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        route = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+        path = os.path.join(self.profile_dir, f"{stamp}_{scope['method']}_{route}")
+        file_name = f"{os.path.basename(path)}.{'speedscope.json' if self.fmt == 'speedscope' else 'collapsed.txt'}"
+
+        async def send_with_header(message: Dict[str, Any]) -> None:
+            if on_demand and message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-profile-file", file_name.encode())]
+            await send(message)
+
+        profiler = SamplingProfiler(self.interval)
+        try:
+            profiler.start()
+            try:
+                await self.app(scope, receive, send_with_header)
+            finally:
+                profiler.stop()
+            loop = asyncio.get_running_loop()
+            written = await loop.run_in_executor(
+                None, profiler.write, path, self.fmt, f"{scope['method']} {scope['path']}"
+            )
+            logger.info(
+                f"Profiled {scope['method']} {scope['path']} "
+                f"({profiler.duration * 1000:.1f} ms, {profiler.sample_count} samples) -> {written}"
+            )
+        finally:
+            self._busy.release()
@@ -0,0 +1,138 @@
+"""
+@file startup.py
+@brief Startup phase timing and readiness state
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module tracks the startup of an API worker. Each phase (imports,
+background workers, model load and warm-up per slot) is timed into a
+Prometheus gauge and a breakdown returned by the /ready endpoint. The
+worker reports ready only after every model has been loaded and warmed
+up, so an autoscaler does not route traffic to a pod that would serve
+its first requests at cold-start latency. A worker whose models failed
+to load never reports ready, and /ready lists the errors.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+import logging
+import time
+from prometheus_client import Gauge
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+STARTUP_SECONDS = Gauge(
+    'startup_phase_seconds',
+    'Time spent in each phase of worker startup',
+    ['phase']
+)
+STARTUP_READY = Gauge(
+    'startup_ready',
+    'Whether the worker has finished warming up (1) or not (0)'
+)
+
+
+class StartupTracker:
+    """Per-phase startup durations and the ready flag of one worker."""
+
+    def __init__(self):
+        """Initialize an empty breakdown; the worker starts not ready."""
+        self.phases: Dict[str, float] = {}
+        self.models: Dict[str, Dict[str, Any]] = {}
+        self.errors: Dict[str, str] = {}
+        self.ready = False
+        self.ready_at: Optional[datetime] = None
+        self._started = time.perf_counter()
+
+    def record(self, phase: str, seconds: float) -> None:
+        """
+        @brief Record the duration of a phase
+        @param phase: Phase name
+        @param seconds: Duration
+        """
+        self.phases[phase] = seconds
+        STARTUP_SECONDS.labels(phase=phase).set(seconds)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        @brief Time the enclosed block as a startup phase
+        @param name: Phase name
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record_error(self, name: str, message: str) -> None:
+        """
+        @brief Record a startup step that failed; the worker will not become ready
+        @param name: Failed phase or model slot
+        @param message: Error message
+        """
+        self.errors[name] = message
+
+    def record_models(self, report: Dict[str, Dict[str, Any]]) -> None:
+        """
+        @brief Record the per-slot result of preloading the models
+
+        A slot whose loader found no model (``loaded`` False without an
+        error) is an expected absence; a slot that raised is an error.
+
+        @param report: Slot -> load/warm-up seconds or error, from ModelRegistry.preload
+        """
+        self.models = report
+        for name, timings in report.items():
+            if "error" in timings:
+                self.record_error(f"model_{name}", timings["error"])
+            for key in ("load_seconds", "warmup_seconds"):
+                if key in timings:
+                    self.record(f"model_{name}_{key[:-len('_seconds')]}", timings[key])
+
+    def mark_ready(self) -> bool:
+        """
+        @brief Flag the worker as ready to take traffic, unless a startup step failed
+        @return: Whether the worker is now ready
+        """
+        self.record("total", time.perf_counter() - self._started)
+        if self.errors:
+            STARTUP_READY.set(0)
+            logger.error(f"Worker not ready after {self.phases['total']:.2f}s: {self.errors}")
+            return False
+        self.ready = True
+        self.ready_at = datetime.now()
+        STARTUP_READY.set(1)
+        logger.info(f"Worker ready after {self.phases['total']:.2f}s: {self.phases}")
+        return True
+
+    def report(self) -> Dict[str, Any]:
+        """
+        @brief Readiness and startup breakdown
+        @return: Ready flag, phase durations, per-model results and errors
+        """
+        return {
+            "ready": self.ready,
+            "errors": dict(self.errors),
+            "ready_at": self.ready_at.isoformat() if self.ready_at else None,
+            "phases": dict(self.phases),
+            "models": dict(self.models),
+        }
+
+
+_startup_tracker: Optional[StartupTracker] = None
+
+
+def get_startup_tracker() -> StartupTracker:
+    """
+    @brief Process-wide startup tracker
+    @return: Shared StartupTracker instance
+    """
+    global _startup_tracker
+    if _startup_tracker is None:
+        _startup_tracker = StartupTracker()
+    return _startup_tracker
@@ -54,5 +54,17 @@ CREATE TABLE sentiment_features (
     news_freq INT,
     social_mentions INT,
     yt_growth FLOAT,
+    yt_mentions INT,
     PRIMARY KEY (asset_id, date)
-); 
\ No newline at end of file
+); 
+-- On-chain features
+CREATE TABLE onchain_features (
+    asset_id VARCHAR REFERENCES asset(id),
+    date DATE,
+    transaction_volume FLOAT,
+    active_addresses INT,
+    network_hashrate FLOAT,
+    gas_price FLOAT,
+    network_utilization FLOAT,
+    PRIMARY KEY (asset_id, date)
+);
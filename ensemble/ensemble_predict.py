@@ -1,9 +1,11 @@
 from typing import Union
+from models.ensemble.ensemble_model import EnsembleModel
 
-# Placeholder: Ensemble model outputs
+# Ensemble of technical (CNN-LSTM), tokenomics (XGBoost) and sentiment scores
+_ensemble = EnsembleModel()
 
 def ensemble_predict(score_t: Union[float, int], score_x: Union[float, int], score_s: Union[float, int]) -> float:
-    return 0.4*score_t + 0.3*score_x + 0.3*score_s
+    return _ensemble.predict({"technical": score_t, "fundamental": score_x, "sentiment": score_s})
 
 if __name__ == "__main__":
-    print(ensemble_predict(0.8, 0.6, 0.7)) 
\ No newline at end of file
+    print(ensemble_predict(0.8, 0.6, 0.7))
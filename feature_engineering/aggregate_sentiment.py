@@ -0,0 +1,247 @@
+"""
+@file aggregate_sentiment.py
+@brief Daily aggregation of per-text FinBERT outputs into sentiment features
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module turns per-text FinBERT class probabilities into the daily
+per-asset rows stored in the ``sentiment_features`` table. All reductions
+are grouped NumPy operations over a dense (asset x day) grid, so a day of
+millions of scored posts is aggregated without any Python-level loop over
+texts. Rolling columns (volatility, YouTube growth) continue from the rows
+already stored for the preceding days, so an incremental one-day run
+produces the same values as aggregating the whole window at once.
+"""
+
+from typing import Any, Optional, Sequence
+from datetime import datetime, timedelta
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Column order of the ProsusAI/finbert classification head
+FINBERT_LABELS = ("positive", "negative", "neutral")
+POSITIVE, NEGATIVE, NEUTRAL = 0, 1, 2
+
+# Source codes for the ``sources`` array
+SOURCE_NEWS = 0
+SOURCE_SOCIAL = 1
+SOURCE_YOUTUBE = 2
+
+SENTIMENT_COLUMNS = [
+    "asset_id",
+    "date",
+    "finbert_polarity",
+    "sentiment_volatility",
+    "news_freq",
+    "social_mentions",
+    "yt_growth",
+    "yt_mentions",
+]
+
+
+def _rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling population standard deviation along the last axis, ignoring NaNs.
+
+    @param values: (assets x days) array with NaN for days without data
+    @param window: Window length in days
+    @return: Array of the same shape; 0.0 where fewer than two observations
+    """
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+
+    def windowed(a: np.ndarray) -> np.ndarray:
+        csum = np.cumsum(a, axis=1)
+        out = csum.copy()
+        out[:, window:] -= csum[:, :-window]
+        return out
+
+    n = windowed(present.astype(np.float64))
+    s = windowed(filled)
+    s2 = windowed(filled * filled)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = s / n
+        var = np.maximum(s2 / n - mean * mean, 0.0)
+    return np.where(n >= 2, np.sqrt(var), 0.0)
+
+
+def aggregate_daily_sentiment(
+    probabilities: np.ndarray,
+    timestamps: np.ndarray,
+    asset_ids: np.ndarray,
+    sources: np.ndarray,
+    weights: Optional[np.ndarray] = None,
+    volatility_window: int = 7,
+    history: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    Aggregate per-text FinBERT outputs into daily sentiment feature rows.
+
+    Per-text polarity is P(positive) - P(negative), weighted by the
+    classifier confidence (max class probability) times the optional
+    ``weights``. Volatility is the rolling standard deviation of the daily
+    polarity over ``volatility_window`` days, and ``yt_growth`` is the
+    day-over-day growth of YouTube mentions.
+
+    @param probabilities: (N x 3) FinBERT class probabilities
+    @param timestamps: (N,) datetime64 timestamps of each text
+    @param asset_ids: (N,) asset identifier of each text
+    @param sources: (N,) source codes (SOURCE_NEWS, SOURCE_SOCIAL, SOURCE_YOUTUBE)
+    @param weights: Optional (N,) per-text weights (e.g. author reach)
+    @param volatility_window: Rolling window for sentiment volatility, in days
+    @param history: Stored rows of the days before the batch (asset_id,
+                    date, finbert_polarity, yt_mentions), see
+                    read_sentiment_history; rolling columns continue from them
+    @return: DataFrame with one row per (asset, day) that has any text
+    """
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    if probabilities.ndim != 2 or probabilities.shape[1] != len(FINBERT_LABELS):
+        raise ValueError("probabilities must have shape (N, 3)")
+    n = probabilities.shape[0]
+    if n == 0:
+        return pd.DataFrame(columns=SENTIMENT_COLUMNS)
+    if volatility_window < 1:
+        raise ValueError("volatility_window must be at least 1")
+
+    days = np.asarray(timestamps).astype("datetime64[D]")
+    sources = np.asarray(sources)
+    if len(days) != n or len(asset_ids) != n or len(sources) != n:
+        raise ValueError("All per-text arrays must have the same length")
+
+    # Only stored days strictly before the batch, for assets in the batch
+    assets, asset_idx = np.unique(np.asarray(asset_ids), return_inverse=True)
+    if history is not None and not history.empty:
+        history_days = pd.to_datetime(history["date"]).values.astype("datetime64[D]")
+        keep = (history_days < days.min()) & np.isin(history["asset_id"].values, assets)
+        history, history_days = history[keep], history_days[keep]
+    else:
+        history, history_days = None, None
+
+    # Dense (asset x day) grid keyed by a single integer per text
+    day0 = days.min() if history is None or history.empty else min(days.min(), history_days.min())
+    day_idx = (days - day0).astype(np.int64)
+    n_assets, n_days = len(assets), int(day_idx.max()) + 1
+    key = asset_idx * n_days + day_idx
+    size = n_assets * n_days
+
+    def grouped_sum(values: Optional[np.ndarray] = None, mask=None) -> np.ndarray:
+        k = key if mask is None else key[mask]
+        w = values if (values is None or mask is None) else values[mask]
+        return np.bincount(k, weights=w, minlength=size).reshape(n_assets, n_days)
+
+    polarity = probabilities[:, POSITIVE] - probabilities[:, NEGATIVE]
+    w = probabilities.max(axis=1)
+    if weights is not None:
+        w = w * np.asarray(weights, dtype=np.float64)
+
+    total = grouped_sum()
+    weight_sum = grouped_sum(w)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        daily_polarity = grouped_sum(w * polarity) / weight_sum
+    daily_polarity[weight_sum == 0] = np.nan
+
+    news = grouped_sum(mask=sources == SOURCE_NEWS)
+    social = grouped_sum(mask=sources == SOURCE_SOCIAL)
+    youtube = grouped_sum(mask=sources == SOURCE_YOUTUBE)
+
+    if history is not None and not history.empty:
+        rows_a = np.searchsorted(assets, history["asset_id"].values)
+        rows_d = (history_days - day0).astype(np.int64)
+        daily_polarity[rows_a, rows_d] = history["finbert_polarity"].astype(np.float64).values
+        youtube[rows_a, rows_d] = history["yt_mentions"].fillna(0).astype(np.float64).values
+
+    prev_youtube = np.zeros_like(youtube)
+    prev_youtube[:, 1:] = youtube[:, :-1]
+    yt_growth = np.divide(
+        youtube - prev_youtube,
+        prev_youtube,
+        out=np.zeros(youtube.shape),
+        where=prev_youtube > 0
+    )
+
+    volatility = _rolling_std(daily_polarity, volatility_window)
+
+    # Rows are emitted for batch days only; history just seeds the windows
+    rows_a, rows_d = np.nonzero(total)
+    return pd.DataFrame({
+        "asset_id": assets[rows_a],
+        "date": day0 + rows_d.astype("timedelta64[D]"),
+        "finbert_polarity": np.nan_to_num(daily_polarity[rows_a, rows_d]),
+        "sentiment_volatility": volatility[rows_a, rows_d],
+        "news_freq": news[rows_a, rows_d].astype(np.int64),
+        "social_mentions": social[rows_a, rows_d].astype(np.int64),
+        "yt_growth": yt_growth[rows_a, rows_d],
+        "yt_mentions": youtube[rows_a, rows_d].astype(np.int64),
+    }, columns=SENTIMENT_COLUMNS)
+
+
+def read_sentiment_history(
+    session: Any,
+    asset_ids: Sequence[str],
+    before: datetime,
+    days: int = 7
+) -> pd.DataFrame:
+    """
+    Stored daily rows preceding a batch, to seed the rolling columns.
+
+    @param session: SQLAlchemy session
+    @param asset_ids: Assets of the batch
+    @param before: First day of the batch (rows strictly before it are read)
+    @param days: Days to read; at least the volatility window
+    @return: DataFrame with asset_id, date, finbert_polarity and yt_mentions
+    """
+    from sqlalchemy import select
+    from api.db.timescaledb import SentimentFeatures
+
+    return pd.read_sql(
+        select(
+            SentimentFeatures.asset_id,
+            SentimentFeatures.date,
+            SentimentFeatures.finbert_polarity,
+            SentimentFeatures.yt_mentions
+        ).where(
+            SentimentFeatures.asset_id.in_(list(asset_ids)),
+            SentimentFeatures.date >= before - timedelta(days=days),
+            SentimentFeatures.date < before
+        ),
+        session.connection()
+    )
+
+
+def write_sentiment_features(
+    rows: pd.DataFrame,
+    session: Any,
+    batch_size: int = 10000
+) -> int:
+    """
+    Bulk-write aggregated rows into ``sentiment_features``.
+
+    Existing rows for the same assets and dates are replaced, so re-running
+    the aggregation for a day is idempotent.
+
+    @param rows: Output of aggregate_daily_sentiment
+    @param session: SQLAlchemy session
+    @param batch_size: Rows per multi-row insert statement
+    @return: Number of rows written
+    """
+    from api.db.timescaledb import SentimentFeatures
+    from api.services.feature_store import write_feature_rows
+
+    return write_feature_rows(SentimentFeatures, rows, session, batch_size)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    probs = rng.dirichlet(np.ones(3), size=n)
+    ts = np.datetime64("2024-01-01") + rng.integers(0, 7 * 86400, n).astype("timedelta64[s]")
+    assets = rng.choice(np.array(["BTC", "ETH", "SOL"]), n)
+    srcs = rng.integers(0, 3, n)
+    logger.info(f"Aggregated rows:\n{aggregate_daily_sentiment(probs, ts, assets, srcs)}")
@@ -2,20 +2,88 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any
 
+TECHNICAL_COLUMNS = [
+    "ma_50",
+    "ma_200",
+    "ma_crossover",
+    "rsi_14",
+    "macd_hist",
+    "bb_width",
+    "obv",
+]
+
+
+def compute_technical_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute daily technical features for one or more assets from OHLCV bars.
+
+    Bars of any frequency are resampled to daily candles per asset before
+    computing indicators, so the output matches the ``technical_features``
+    table (one row per asset per day).
+    """
+    if data.empty:
+        return pd.DataFrame(columns=["asset_id", "date"] + TECHNICAL_COLUMNS)
+
+    if "asset_id" not in data:
+        data = data.assign(asset_id="")
+
+    frames = []
+    for asset_id, bars in data.groupby("asset_id", sort=False):
+        daily = (
+            bars.set_index(pd.to_datetime(bars["timestamp"]))
+            .sort_index()
+            .resample("1D")
+            .agg({"close": "last", "volume": "sum"})
+            .dropna(subset=["close"])
+        )
+        close, volume = daily["close"], daily["volume"]
+
+        ma_20 = close.rolling(20, min_periods=1).mean()
+        ma_50 = close.rolling(50, min_periods=1).mean()
+        ma_200 = close.rolling(200, min_periods=1).mean()
+
+        delta = close.diff()
+        gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False).mean()
+        rsi = (100 - 100 / (1 + gain / loss.replace(0, np.nan))).where(
+            loss > 0, np.where(gain > 0, 100.0, 50.0)
+        )
+
+        macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        signal = macd.ewm(span=9, adjust=False).mean()
+
+        std_20 = close.rolling(20, min_periods=1).std(ddof=0)
+
+        frames.append(pd.DataFrame({
+            "asset_id": asset_id,
+            "date": daily.index,
+            "ma_50": ma_50.values,
+            "ma_200": ma_200.values,
+            "ma_crossover": (ma_50 > ma_200).values,
+            "rsi_14": rsi.values,
+            "macd_hist": (macd - signal).values,
+            "bb_width": (4 * std_20 / ma_20).values,
+            "obv": (np.sign(delta.fillna(0)) * volume).cumsum().values,
+        }))
+
+    return pd.concat(frames, ignore_index=True)
+
+
 def compute_technical_features(data: pd.DataFrame) -> Dict[str, Any]:
     """
     Compute technical analysis features from OHLCV data
     """
-    # Placeholder for technical analysis
-    return {
-        "ma_50": 0.0,
-        "ma_200": 0.0,
-        "rsi": 0.0,
-        "macd": 0.0
-    }
+    frame = compute_technical_frame(data)
+    if frame.empty:
+        return {column: 0.0 for column in TECHNICAL_COLUMNS}
+    return frame.iloc[-1][TECHNICAL_COLUMNS].to_dict()
 
 if __name__ == "__main__":
     # Dummy data
-    df = pd.DataFrame()
+    df = pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=300, freq="D"),
+        "close": np.random.rand(300) * 100,
+        "volume": np.random.rand(300) * 1000,
+    })
     features = compute_technical_features(df)
-    print(features) 
\ No newline at end of file
+    print(features)
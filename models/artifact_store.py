@@ -0,0 +1,253 @@
+"""
+@file artifact_store.py
+@brief Versioned on-disk store for model artifacts
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements the model artifact store. Every published model
+gets its own immutable version directory holding the artifact (a file
+or a directory such as a Hugging Face checkpoint) and a manifest with
+the model type, version, feature schema, metrics and a SHA-256 checksum
+per file. A LATEST pointer per slot names the version to serve.
+Directories are written under a temporary name and renamed into place,
+and the pointer is replaced atomically, so readers never see a partial
+version.
+
+Layout::
+
+    <root>/<slot>/<version>/<artifact>
+    <root>/<slot>/<version>/manifest.json
+    <root>/<slot>/LATEST
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+from datetime import datetime
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = os.getenv("MODEL_STORE_DIR", "models/store")
+
+MANIFEST_NAME = "manifest.json"
+LATEST_NAME = "LATEST"
+
+
+def file_checksum(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    @brief SHA-256 of a file, read in chunks
+    @param path: File path
+    @return: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _checksums(root: str) -> Dict[str, str]:
+    checksums = {}
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            relative = os.path.relpath(path, root)
+            if relative != MANIFEST_NAME:
+                checksums[relative] = file_checksum(path)
+    return dict(sorted(checksums.items()))
+
+
+class ArtifactStore:
+    """Versioned model artifacts with manifests and a LATEST pointer per slot."""
+
+    def __init__(self, root: Optional[str] = None):
+        """
+        @param root: Store directory (defaults to MODEL_STORE_DIR)
+        """
+        self.root = root or DEFAULT_STORE_DIR
+
+    def _slot_dir(self, slot: str) -> str:
+        return os.path.join(self.root, slot)
+
+    def version_dir(self, slot: str, version: str) -> str:
+        """
+        @brief Directory of one version
+        @param slot: Model slot
+        @param version: Version
+        @return: Directory path
+        """
+        return os.path.join(self._slot_dir(slot), version)
+
+    def publish(
+        self,
+        slot: str,
+        source: str,
+        model_type: str,
+        feature_schema: Optional[Sequence[str]] = None,
+        version: Optional[str] = None,
+        metrics: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        make_latest: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Add a new immutable version of a model.
+
+        @param slot: Model slot (e.g. "technical")
+        @param source: Artifact file or directory to copy into the store
+        @param model_type: Model type (e.g. "cnn_lstm", "xgboost")
+        @param feature_schema: Ordered input feature names
+        @param version: Version label (defaults to a timestamp plus checksum prefix)
+        @param metrics: Validation metrics to record
+        @param metadata: Extra manifest fields (e.g. window length)
+        @param make_latest: Point LATEST at the new version
+        @return: Manifest of the new version
+        """
+        artifact = os.path.basename(os.path.normpath(source))
+        tmp_dir = os.path.join(self._slot_dir(slot), f".tmp-{os.getpid()}-{datetime.now():%Y%m%dT%H%M%S%f}")
+        os.makedirs(tmp_dir)
+        try:
+            if os.path.isdir(source):
+                shutil.copytree(source, os.path.join(tmp_dir, artifact))
+            else:
+                shutil.copy2(source, os.path.join(tmp_dir, artifact))
+            files = _checksums(tmp_dir)
+            if version is None:
+                combined = hashlib.sha256("".join(files.values()).encode()).hexdigest()
+                version = f"{datetime.now():%Y%m%dT%H%M%S}-{combined[:8]}"
+            if os.path.exists(self.version_dir(slot, version)):
+                raise ValueError(f"Version {version} of {slot} already exists")
+
+            manifest = {
+                **(metadata or {}),
+                "slot": slot,
+                "model_type": model_type,
+                "version": version,
+                "created_at": datetime.now().isoformat(),
+                "artifact": artifact,
+                "feature_schema": list(feature_schema or []),
+                "metrics": metrics or {},
+                "files": files,
+            }
+            with open(os.path.join(tmp_dir, MANIFEST_NAME), "w") as f:
+                json.dump(manifest, f, indent=2)
+            os.rename(tmp_dir, self.version_dir(slot, version))
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        logger.info(f"Published {slot} version {version}")
+        if make_latest:
+            self.set_latest(slot, version)
+        return manifest
+
+    def set_latest(self, slot: str, version: str) -> None:
+        """
+        @brief Point LATEST at a version (also used to roll back)
+        @param slot: Model slot
+        @param version: Existing version
+        """
+        if not os.path.exists(os.path.join(self.version_dir(slot, version), MANIFEST_NAME)):
+            raise ValueError(f"Unknown version {version} of {slot}")
+        path = os.path.join(self._slot_dir(slot), LATEST_NAME)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(version)
+        os.replace(tmp_path, path)
+
+    def latest(self, slot: str) -> Optional[str]:
+        """
+        @brief Version LATEST points at
+        @param slot: Model slot
+        @return: Version, or None if nothing was published
+        """
+        try:
+            with open(os.path.join(self._slot_dir(slot), LATEST_NAME)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def versions(self, slot: str) -> List[str]:
+        """
+        @brief Published versions of a slot, oldest first
+        @param slot: Model slot
+        @return: Versions
+        """
+        if not os.path.isdir(self._slot_dir(slot)):
+            return []
+        return sorted(
+            name for name in os.listdir(self._slot_dir(slot))
+            if os.path.exists(os.path.join(self.version_dir(slot, name), MANIFEST_NAME))
+        )
+
+    def manifest(self, slot: str, version: str) -> Dict[str, Any]:
+        """
+        @brief Manifest of a version
+        @param slot: Model slot
+        @param version: Version
+        @return: Manifest dict
+        """
+        with open(os.path.join(self.version_dir(slot, version), MANIFEST_NAME)) as f:
+            return json.load(f)
+
+    def artifact_path(self, slot: str, version: str) -> str:
+        """
+        @brief Path of a version's artifact file or directory
+        @param slot: Model slot
+        @param version: Version
+        @return: Path to pass to the model loader
+        """
+        return os.path.join(self.version_dir(slot, version), self.manifest(slot, version)["artifact"])
+
+    def verify(self, slot: str, version: str) -> Dict[str, Any]:
+        """
+        Check a version's files against its manifest checksums.
+
+        @param slot: Model slot
+        @param version: Version
+        @return: Manifest
+        @throws ValueError: If a file is missing, unexpected or corrupted
+        """
+        manifest = self.manifest(slot, version)
+        actual = _checksums(self.version_dir(slot, version))
+        if actual != manifest["files"]:
+            bad = sorted(
+                name for name in set(actual) | set(manifest["files"])
+                if actual.get(name) != manifest["files"].get(name)
+            )
+            raise ValueError(f"Checksum mismatch in {slot} version {version}: {bad}")
+        return manifest
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage versioned model artifacts")
+    parser.add_argument("--root", default=None, help="Store directory (defaults to MODEL_STORE_DIR)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    publish = commands.add_parser("publish", help="Publish a new version and make it LATEST")
+    publish.add_argument("slot")
+    publish.add_argument("source")
+    publish.add_argument("model_type")
+    publish.add_argument("--version")
+    publish.add_argument("--features", nargs="*", default=[], help="Ordered input feature names")
+    rollback = commands.add_parser("set-latest", help="Point LATEST at an existing version")
+    rollback.add_argument("slot")
+    rollback.add_argument("version")
+    listing = commands.add_parser("list", help="List versions of a slot")
+    listing.add_argument("slot")
+    args = parser.parse_args()
+
+    store = ArtifactStore(args.root)
+    if args.command == "publish":
+        print(json.dumps(store.publish(args.slot, args.source, args.model_type, args.features, args.version), indent=2))
+    elif args.command == "set-latest":
+        store.set_latest(args.slot, args.version)
+    else:
+        latest = store.latest(args.slot)
+        for version in store.versions(args.slot):
+            print(f"{version}{' (latest)' if version == latest else ''}")
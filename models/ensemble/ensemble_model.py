@@ -8,56 +8,185 @@
 
 This module implements the ensemble model that combines predictions
 from different models (technical, sentiment, etc.) into a final prediction.
+Scores for a whole universe of assets are combined at once from an
+(assets x models) matrix; models missing for an asset drop out and the
+remaining weights are renormalized. A trained stacking meta-learner
+(see stacking.py) can replace the fixed weights for the score.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_WEIGHTS = {
+    'technical': 0.4,
+    'sentiment': 0.3,
+    'fundamental': 0.2,
+    'onchain': 0.1
+}
+
+# Score thresholds between the RISK_LEVELS bands (score >= 0.8 is low risk)
+RISK_THRESHOLDS = np.array([0.4, 0.6, 0.8])
+RISK_LEVELS = np.array(['extreme', 'high', 'medium', 'low'])
+
+# Score returned for assets without any model prediction
+NEUTRAL_SCORE = 0.5
+
 class EnsembleModel:
     """Ensemble model for combining multiple predictions."""
-    
-    def __init__(self):
-        """Initialize the ensemble model."""
-        self.weights = {
-            'technical': 0.4,
-            'sentiment': 0.3,
-            'fundamental': 0.2,
-            'onchain': 0.1
-        }
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, stacker: Any = None):
+        """
+        Initialize the ensemble model.
+
+        @param weights: Weight per model slot (defaults to DEFAULT_WEIGHTS)
+        @param stacker: Optional trained StackingEnsemble producing the score
+        """
+        self._set_weights(dict(weights or DEFAULT_WEIGHTS))
+        self.stacker = stacker
+        if stacker is not None:
+            unknown = set(stacker.slots) - set(self.slots)
+            if unknown:
+                raise ValueError(f"Stacker slots not in the ensemble: {sorted(unknown)}")
+            self._stacker_columns = [self.slots.index(s) for s in stacker.slots]
         logger.info("Ensemble model initialized")
 
+    def _set_weights(self, weights: Dict[str, float]) -> None:
+        self.weights = weights
+        self.slots = tuple(weights)
+        self.weight_vector = np.array([weights[s] for s in self.slots], dtype=np.float64)
+
+    def weight_array(self, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        Weight vector in slot order.
+
+        @param weights: Custom weight per slot (missing slots get 0), or None
+                        for the precomputed default vector
+        @return: (slots,) weights
+        """
+        if weights is None:
+            return self.weight_vector
+        unknown = set(weights) - set(self.slots)
+        if unknown:
+            raise ValueError(f"Unknown ensemble slots: {sorted(unknown)}")
+        return np.array([weights.get(s, 0.0) for s in self.slots], dtype=np.float64)
+
+    def to_matrix(self, predictions: Sequence[Dict[str, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pack per-asset prediction dicts into a score matrix and mask.
+
+        @param predictions: One {slot: score} dict per asset
+        @return: (assets x slots) scores and availability mask
+        """
+        scores = np.full((len(predictions), len(self.slots)), np.nan)
+        for i, row in enumerate(predictions):
+            for j, slot in enumerate(self.slots):
+                value = row.get(slot)
+                if value is not None:
+                    scores[i, j] = value
+        return scores, ~np.isnan(scores)
+
+    def combine(
+        self,
+        scores: np.ndarray,
+        mask: Optional[np.ndarray] = None,
+        weights: Any = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Combine model scores for many assets at once.
+
+        The score is the weighted mean of the available model scores, or the
+        stacker's probability when one is loaded and no custom weights are
+        given. The confidence is the share of ensemble weight that was
+        available times the agreement between models (1 - 2 x weighted
+        standard deviation, since scores lie in [0, 1]). The model is not
+        modified, so concurrent requests with different weights can share
+        one instance.
+
+        @param scores: (assets x slots) scores in ``self.slots`` order
+        @param mask: (assets x slots) True where a score is available
+                     (defaults to the non-NaN entries)
+        @param weights: None for the default weights, a {slot: weight} dict
+                        applied to every asset, or a (slots,) or
+                        (assets x slots) weight array
+        @return: "score", "confidence" and "risk" arrays, one entry per asset
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        if mask is None:
+            mask = ~np.isnan(scores)
+        scores = np.where(mask, scores, 0.0)
+
+        custom = weights is not None
+        if weights is None or isinstance(weights, dict):
+            weights = self.weight_array(weights)
+        weights = np.asarray(weights, dtype=np.float64)
+
+        w = mask * weights
+        total = w.sum(axis=1)
+        has_any = total > 0
+        denominator = np.where(has_any, total, 1.0)
+        if self.stacker is not None and not custom:
+            columns = self._stacker_columns
+            combined = self.stacker.predict_proba(scores[:, columns], mask[:, columns])
+        else:
+            combined = (scores * w).sum(axis=1) / denominator
+        score = np.where(has_any, combined, NEUTRAL_SCORE)
+        spread = np.sqrt((w * (scores - score[:, None]) ** 2).sum(axis=1) / denominator)
+        coverage = total / np.maximum(weights.sum(axis=-1), 1e-12)
+        confidence = np.clip(coverage * (1.0 - 2.0 * spread), 0.0, 1.0)
+
+        return {
+            'score': score,
+            'confidence': confidence,
+            'risk': RISK_LEVELS[np.searchsorted(RISK_THRESHOLDS, score, side='right')]
+        }
+
+    def combine_dicts(
+        self,
+        predictions: Sequence[Dict[str, float]],
+        weights: Optional[Dict[str, float]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        @brief Combine per-asset prediction dicts
+        @param predictions: One {slot: score} dict per asset
+        @param weights: Optional custom weight per slot
+        @return: One {"score", "confidence", "risk"} dict per asset
+        """
+        scores, mask = self.to_matrix(predictions)
+        result = self.combine(scores, mask, weights)
+        return [
+            {
+                'score': float(result['score'][i]),
+                'confidence': float(result['confidence'][i]),
+                'risk': str(result['risk'][i])
+            }
+            for i in range(len(predictions))
+        ]
+
     def predict(self, predictions: Dict[str, float]) -> float:
         """
         Combine multiple predictions into a final prediction.
-        
+
         @param predictions: Dictionary of predictions from different models
         @return: Combined prediction score
         """
         try:
-            weighted_sum = 0
-            total_weight = 0
-            
-            for model_name, prediction in predictions.items():
-                if model_name in self.weights:
-                    weighted_sum += prediction * self.weights[model_name]
-                    total_weight += self.weights[model_name]
-            
-            if total_weight == 0:
-                return 0.5  # Default neutral prediction
-            
-            return weighted_sum / total_weight
-            
+            return self.combine_dicts([predictions])[0]['score']
         except Exception as e:
             logger.error(f"Ensemble prediction failed: {str(e)}")
-            return 0.5  # Return neutral prediction on error
+            return NEUTRAL_SCORE  # Return neutral prediction on error
 
     def update_weights(self, new_weights: Dict[str, float]) -> None:
         """
-        Update the weights for different models.
-        
+        Update the default weights for different models.
+
+        The slots must stay the same, so the precomputed vector is replaced
+        in one assignment and in-flight combine calls never see a mix of
+        old and new weights. Per-request weights should be passed to
+        combine() instead.
+
         @param new_weights: Dictionary of new weights
         """
         try:
@@ -65,10 +194,13 @@ class EnsembleModel:
             total = sum(new_weights.values())
             if not 0.99 <= total <= 1.01:  # Allow for small floating point errors
                 raise ValueError("Weights must sum to 1")
-            
-            self.weights = new_weights
+            if set(new_weights) != set(self.slots):
+                raise ValueError(f"Weights must cover exactly the slots {list(self.slots)}")
+
+            self.weights = dict(new_weights)
+            self.weight_vector = self.weight_array(new_weights)
             logger.info("Ensemble weights updated")
-            
+
         except Exception as e:
             logger.error(f"Failed to update weights: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
@@ -0,0 +1,295 @@
+"""
+@file stacking.py
+@brief Stacked meta-learner for the ensemble
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements a stacking ensemble that learns how to combine the
+per-model scores logged in ``model_predictions``. The meta-learner is an
+L2-regularized logistic regression on each model's score logit and an
+availability indicator, labelled with the realized price direction over a
+horizon. It is refit incrementally: the previous fit (mean and Hessian)
+becomes a Gaussian prior for Newton steps on the newly realized outcomes,
+so each refit only touches new rows. The fit is exported as a small JSON
+artifact that serving loads without any training dependencies.
+"""
+
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+import json
+import logging
+import os
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STACKER_PATH = os.getenv(
+    "ENSEMBLE_STACKER_PATH",
+    "models/ensemble/saved/stacker.json"
+)
+
+# Scores are clipped before the logit so confident members stay finite
+SCORE_EPSILON = 1e-4
+
+
+class StackingEnsemble:
+    """Online Bayesian logistic stacker over per-model scores."""
+
+    def __init__(
+        self,
+        slots: Sequence[str],
+        l2: float = 1.0,
+        decay: float = 1.0,
+        prior_weights: Optional[Dict[str, float]] = None
+    ):
+        """
+        @param slots: Model slots in score-column order
+        @param l2: Prior precision of a fresh fit (regularization strength)
+        @param decay: Factor in (0, 1] discounting older evidence at each refit
+        @param prior_weights: Initial coefficient per slot logit, e.g. the
+                              fixed ensemble weights; zeros when omitted
+        """
+        self.slots = tuple(slots)
+        self.l2 = l2
+        self.decay = decay
+        n_features = 2 * len(self.slots) + 1
+        self.coef = np.zeros(n_features)
+        if prior_weights:
+            self.coef[:len(self.slots)] = [prior_weights.get(s, 0.0) for s in self.slots]
+        self.precision = l2 * np.eye(n_features)
+        self.n_seen = 0
+        self.trained_through: Optional[datetime] = None
+
+    def design_matrix(self, scores: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        @brief Meta-features: score logits (0 when missing), availability, intercept
+        @param scores: (rows x slots) model scores
+        @param mask: (rows x slots) availability (defaults to non-NaN entries)
+        @return: (rows x 2*slots+1) design matrix
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        if mask is None:
+            mask = ~np.isnan(scores)
+        clipped = np.clip(np.where(mask, scores, 0.5), SCORE_EPSILON, 1 - SCORE_EPSILON)
+        logits = np.log(clipped / (1 - clipped)) * mask
+        return np.hstack([logits, mask, np.ones((len(scores), 1))])
+
+    def predict_proba(self, scores: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        @brief Stacked up-move probability per row
+        @param scores: (rows x slots) model scores
+        @param mask: (rows x slots) availability
+        @return: (rows,) probabilities
+        """
+        return 1.0 / (1.0 + np.exp(-self.design_matrix(scores, mask) @ self.coef))
+
+    def partial_fit(
+        self,
+        scores: np.ndarray,
+        mask: Optional[np.ndarray],
+        y: np.ndarray,
+        max_iter: int = 25,
+        tol: float = 1e-6
+    ) -> Dict[str, float]:
+        """
+        Update the fit with newly realized outcomes.
+
+        Minimizes the logistic loss of the new rows plus a quadratic penalty
+        pulling towards the previous coefficients with the previous Hessian
+        (a Laplace-approximated posterior), using Newton's method.
+
+        @param scores: (rows x slots) model scores
+        @param mask: (rows x slots) availability
+        @param y: (rows,) binary realized direction
+        @param max_iter: Maximum Newton iterations
+        @param tol: Convergence threshold on the largest step
+        @return: Rows used and log loss before/after the update
+        """
+        X = self.design_matrix(scores, mask)
+        y = np.asarray(y, dtype=np.float64)
+        if not len(y):
+            return {"rows": 0}
+
+        identity = np.eye(len(self.coef))
+        prior_precision = self.decay * self.precision + (1 - self.decay) * self.l2 * identity
+        prior_coef = self.coef.copy()
+        before = _log_loss(y, X @ self.coef)
+
+        coef = prior_coef.copy()
+        for _ in range(max_iter):
+            p = 1.0 / (1.0 + np.exp(-X @ coef))
+            gradient = X.T @ (p - y) + prior_precision @ (coef - prior_coef)
+            hessian = (X * (p * (1 - p))[:, None]).T @ X + prior_precision
+            step = np.linalg.solve(hessian, gradient)
+            coef -= step
+            if np.abs(step).max() < tol:
+                break
+
+        p = 1.0 / (1.0 + np.exp(-X @ coef))
+        self.coef = coef
+        self.precision = (X * (p * (1 - p))[:, None]).T @ X + prior_precision
+        self.n_seen += len(y)
+        return {"rows": len(y), "log_loss_before": before, "log_loss_after": _log_loss(y, X @ coef)}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        @brief Serializable artifact
+        @return: Slots, coefficients, precision and training state
+        """
+        return {
+            "slots": list(self.slots),
+            "l2": self.l2,
+            "decay": self.decay,
+            "coef": self.coef.tolist(),
+            "precision": self.precision.tolist(),
+            "n_seen": self.n_seen,
+            "trained_through": self.trained_through.isoformat() if self.trained_through else None,
+        }
+
+    @classmethod
+    def from_dict(cls, artifact: Dict[str, Any]) -> "StackingEnsemble":
+        """
+        @brief Rebuild a stacker from to_dict() output
+        @param artifact: Serialized stacker
+        @return: Stacker
+        """
+        stacker = cls(artifact["slots"], l2=artifact["l2"], decay=artifact["decay"])
+        stacker.coef = np.array(artifact["coef"])
+        stacker.precision = np.array(artifact["precision"])
+        stacker.n_seen = artifact["n_seen"]
+        if artifact.get("trained_through"):
+            stacker.trained_through = datetime.fromisoformat(artifact["trained_through"])
+        return stacker
+
+    def save(self, path: str) -> None:
+        """
+        @brief Write the artifact atomically
+        @param path: Output .json path
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+        logger.info(f"Stacking ensemble saved to {path}")
+
+
+def _log_loss(y: np.ndarray, logits: np.ndarray) -> float:
+    # log(1 + exp(-z)) for y=1 and log(1 + exp(z)) for y=0, computed stably
+    return float(np.mean(np.logaddexp(0.0, np.where(y > 0.5, -logits, logits))))
+
+
+def load_stacker(path: Optional[str] = None) -> Optional[StackingEnsemble]:
+    """
+    @brief Load a stacker artifact
+    @param path: Artifact path (defaults to ENSEMBLE_STACKER_PATH)
+    @return: Stacker, or None if no artifact exists
+    """
+    path = path or DEFAULT_STACKER_PATH
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        stacker = StackingEnsemble.from_dict(json.load(f))
+    logger.info(f"Stacking ensemble loaded from {path}")
+    return stacker
+
+
+def build_training_set(
+    session: Any,
+    slots: Sequence[str],
+    horizon: timedelta = timedelta(days=1),
+    since: Optional[datetime] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[datetime]]:
+    """
+    Join logged per-model predictions with their realized outcomes.
+
+    Predictions logged together for an asset form one row. The label is
+    whether the close one ``horizon`` after the prediction is above the
+    close at prediction time (see api.db.prices). Only predictions up to
+    the outcome watermark are read, so an asset whose bars lag is waited
+    for; rows without both closes are dropped, never labelled.
+
+    @param session: SQLAlchemy session
+    @param slots: Model slots (model_name values) in column order
+    @param horizon: Outcome horizon
+    @param since: Only predictions created after this time
+    @return: (scores, mask, labels, latest created_at used)
+    """
+    from sqlalchemy import select
+    from api.db.timescaledb import ModelPrediction
+    from api.db.prices import attach_outcome_closes, outcome_watermark
+
+    until = outcome_watermark(session, horizon)
+    empty = (np.empty((0, len(slots))), np.empty((0, len(slots)), bool), np.empty(0), None)
+    if until is None:
+        return empty
+
+    query = (
+        select(
+            ModelPrediction.asset_id,
+            ModelPrediction.model_name,
+            ModelPrediction.prediction,
+            ModelPrediction.created_at
+        )
+        .where(
+            ModelPrediction.model_name.in_(list(slots)),
+            ModelPrediction.created_at <= until
+        )
+    )
+    if since is not None:
+        query = query.where(ModelPrediction.created_at > since)
+    logged = pd.DataFrame(session.execute(query).all(), columns=["asset_id", "model_name", "prediction", "created_at"])
+    if logged.empty:
+        return empty
+
+    wide = logged.pivot_table(
+        index=["asset_id", "created_at"], columns="model_name", values="prediction", aggfunc="last"
+    ).reindex(columns=list(slots)).reset_index()
+    wide = attach_outcome_closes(session, wide, horizon)
+
+    scores = wide[list(slots)].to_numpy(np.float64)
+    labels = (wide["close_after"] > wide["close_then"]).to_numpy(np.float64)
+    return scores, ~np.isnan(scores), labels, logged["created_at"].max()
+
+
+def update_stacker(
+    stacker: StackingEnsemble,
+    session_factory: Callable[[], Any],
+    horizon: timedelta = timedelta(days=1)
+) -> Dict[str, float]:
+    """
+    Refit the stacker on outcomes realized since its last update.
+
+    @param stacker: Stacker to update in place
+    @param session_factory: Callable returning a new SQLAlchemy session
+    @param horizon: Outcome horizon
+    @return: partial_fit metrics
+    """
+    with session_factory() as session:
+        scores, mask, labels, latest = build_training_set(
+            session, stacker.slots, horizon, since=stacker.trained_through
+        )
+    metrics = stacker.partial_fit(scores, mask, labels)
+    if latest is not None:
+        stacker.trained_through = pd.Timestamp(latest).to_pydatetime()
+    logger.info(f"Stacking ensemble updated: {metrics}")
+    return metrics
+
+
+if __name__ == "__main__":
+    from models.ensemble.ensemble_model import DEFAULT_WEIGHTS
+
+    # Dummy data: the technical model is informative, sentiment is noise
+    rng = np.random.default_rng(0)
+    y = (rng.random(5000) > 0.5).astype(float)
+    scores = np.column_stack([
+        np.clip(0.5 + 0.3 * (y - 0.5) + 0.15 * rng.standard_normal(5000), 0, 1),
+        rng.random(5000),
+    ])
+    stacker = StackingEnsemble(["technical", "sentiment"], prior_weights=DEFAULT_WEIGHTS)
+    for batch in np.array_split(np.arange(5000), 5):
+        print(stacker.partial_fit(scores[batch], None, y[batch]))
+    print(dict(zip(stacker.slots, stacker.coef)))
@@ -0,0 +1,242 @@
+"""
+@file onnx_backend.py
+@brief ONNX export and ONNX Runtime inference backend
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements the ONNX Runtime backend for the model layer.
+Models are exported once from PyTorch and then served through ORT with
+full graph optimizations and explicit thread control. Serving through
+this backend only needs numpy and onnxruntime; torch is imported by the
+export and equivalence-check helpers alone.
+"""
+
+from typing import Any, Dict, Optional, Sequence
+import logging
+import os
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("torch", "onnx")
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """
+    Resolve the inference backend.
+
+    @param backend: Explicit backend, or None to read MODEL_BACKEND
+    @return: "torch" or "onnx"
+    """
+    backend = (backend or os.getenv("MODEL_BACKEND", "torch")).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown model backend: {backend}")
+    return backend
+
+
+class OnnxModel:
+    """ONNX Runtime session wrapper returning the first model output."""
+
+    backend = "onnx"
+
+    def __init__(
+        self,
+        model_path: str,
+        intra_op_threads: Optional[int] = None,
+        inter_op_threads: Optional[int] = None
+    ):
+        """
+        Create an optimized CPU inference session.
+
+        @param model_path: Path to the .onnx file
+        @param intra_op_threads: Threads per operator (defaults to ORT_NUM_THREADS)
+        @param inter_op_threads: Threads across operators
+        """
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        intra_op_threads = intra_op_threads or int(os.getenv("ORT_NUM_THREADS", "0"))
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        if inter_op_threads:
+            options.inter_op_num_threads = inter_op_threads
+
+        self.model_path = model_path
+        self.session = ort.InferenceSession(
+            model_path,
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        logger.info(f"ONNX model loaded from {model_path}")
+
+    def run(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        @brief Run the session on named inputs the model declares
+        @param inputs: Input name -> array
+        @return: First model output
+        """
+        feed = {name: inputs[name] for name in self.input_names if name in inputs}
+        return self.session.run(None, feed)[0]
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        """
+        @brief Run a single-input model
+        @param x: Input array
+        @return: First model output
+        """
+        return self.session.run(None, {self.input_names[0]: x})[0]
+
+
+def export_cnn_lstm_onnx(
+    model: Any,
+    path: str,
+    window: int = 50,
+    opset_version: int = 17
+) -> None:
+    """
+    Export a CNN-LSTM model with dynamic batch and window axes.
+
+    @param model: Trained CNNLSTMModel
+    @param path: Output .onnx path
+    @param window: Window length of the example input
+    @param opset_version: ONNX opset
+    """
+    import torch
+
+    model = model.eval()
+    example = torch.zeros(1, window, model.config["input_size"])
+    torch.onnx.export(
+        model,
+        (example,),
+        path,
+        input_names=["windows"],
+        output_names=["logits"],
+        dynamic_axes={"windows": {0: "batch", 1: "window"}, "logits": {0: "batch"}},
+        opset_version=opset_version
+    )
+    logger.info(f"CNN-LSTM exported to {path}")
+
+
+def export_finbert_onnx(
+    model: Any,
+    tokenizer: Any,
+    path: str,
+    opset_version: int = 17
+) -> None:
+    """
+    Export a FinBERT classifier with dynamic batch and sequence axes.
+
+    @param model: Sequence classification model
+    @param tokenizer: Matching tokenizer (used to build the example input)
+    @param path: Output .onnx path
+    @param opset_version: ONNX opset
+    """
+    import torch
+
+    class LogitsOnly(torch.nn.Module):
+        def __init__(self, classifier):
+            super().__init__()
+            self.classifier = classifier
+
+        def forward(self, input_ids, attention_mask):
+            return self.classifier(
+                input_ids=input_ids,
+                attention_mask=attention_mask
+            ).logits
+
+    example = tokenizer(["bitcoin price"], return_tensors="pt", padding=True, truncation=True)
+    axes = {0: "batch", 1: "sequence"}
+    torch.onnx.export(
+        LogitsOnly(model.eval()),
+        (example["input_ids"], example["attention_mask"]),
+        path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={"input_ids": axes, "attention_mask": axes, "logits": {0: "batch"}},
+        opset_version=opset_version
+    )
+    logger.info(f"FinBERT exported to {path}")
+
+
+def check_cnn_lstm_equivalence(
+    torch_model: Any,
+    onnx_model: OnnxModel,
+    windows: np.ndarray,
+    atol: float = 1e-4
+) -> Dict[str, Any]:
+    """
+    Compare ONNX Runtime and PyTorch CNN-LSTM logits.
+
+    @param torch_model: PyTorch model
+    @param onnx_model: Exported model loaded in ORT
+    @param windows: (assets x window x features) inputs
+    @param atol: Largest acceptable absolute difference
+    @return: Max/mean absolute difference and pass flag
+    """
+    import torch
+
+    windows = np.ascontiguousarray(windows, dtype=np.float32)
+    with torch.inference_mode():
+        expected = torch_model(torch.from_numpy(windows)).numpy()
+    diff = np.abs(expected - onnx_model(windows))
+    return {
+        "max_abs_diff": float(diff.max()),
+        "mean_abs_diff": float(diff.mean()),
+        "ok": bool(diff.max() <= atol),
+    }
+
+
+def check_finbert_equivalence(
+    torch_model: Any,
+    onnx_model: OnnxModel,
+    tokenizer: Any,
+    texts: Sequence[str],
+    atol: float = 1e-4
+) -> Dict[str, Any]:
+    """
+    Compare ONNX Runtime and PyTorch FinBERT probabilities.
+
+    @param torch_model: PyTorch classifier
+    @param onnx_model: Exported classifier loaded in ORT
+    @param tokenizer: Matching tokenizer
+    @param texts: Texts to score
+    @param atol: Largest acceptable absolute difference
+    @return: Max/mean absolute difference, label agreement and pass flag
+    """
+    import torch
+
+    inputs = tokenizer(list(texts), return_tensors="pt", padding=True, truncation=True)
+    with torch.inference_mode():
+        expected = torch_model(**inputs).logits.softmax(dim=-1).numpy()
+    actual = softmax(onnx_model.run({k: v.numpy() for k, v in inputs.items()}))
+    diff = np.abs(expected - actual)
+    return {
+        "max_abs_diff": float(diff.max()),
+        "mean_abs_diff": float(diff.mean()),
+        "label_agreement": float(np.mean(expected.argmax(1) == actual.argmax(1))),
+        "ok": bool(diff.max() <= atol),
+    }
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    """
+    @brief Row-wise softmax
+    @param logits: (N x classes) logits
+    @return: Probabilities
+    """
+    shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+def sigmoid(logits: np.ndarray) -> np.ndarray:
+    """
+    @brief Element-wise logistic function
+    @param logits: Logits
+    @return: Probabilities
+    """
+    return 1.0 / (1.0 + np.exp(-logits))
@@ -0,0 +1,184 @@
+"""
+@file quantization.py
+@brief Dynamic INT8 quantization and accuracy checks for CPU serving
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements the opt-in quantized inference mode for the
+CNN-LSTM technical model and the FinBERT sentiment classifier. LSTM and
+Linear weights are quantized to INT8 ahead of time while activations are
+quantized on the fly, which needs no calibration data. The comparison
+utilities report how far quantized scores move from FP32 on a held-out
+set, so a quantized model is only rolled out when the delta is acceptable.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import copy
+import io
+import logging
+import os
+import time
+import numpy as np
+import torch
+import torch.nn as nn
+from torch.ao.quantization import quantize_dynamic
+
+logger = logging.getLogger(__name__)
+
+# Layer types quantized for each model family
+CNN_LSTM_LAYERS = {nn.LSTM, nn.Linear}
+TRANSFORMER_LAYERS = {nn.Linear}
+
+
+def quantization_enabled(quantize: Optional[bool] = None) -> bool:
+    """
+    Resolve the quantization switch.
+
+    @param quantize: Explicit setting, or None to read QUANTIZE_MODELS
+    @return: Whether models should be quantized
+    """
+    if quantize is not None:
+        return quantize
+    return os.getenv("QUANTIZE_MODELS", "").lower() in ("1", "true", "yes")
+
+
+def quantize_model(model: nn.Module, layers: Iterable[type] = CNN_LSTM_LAYERS) -> nn.Module:
+    """
+    Dynamically quantize the given layer types to INT8.
+
+    @param model: FP32 model in eval mode
+    @param layers: Module types to quantize
+    @return: Quantized copy of the model
+    """
+    quantized = quantize_dynamic(copy.deepcopy(model).eval(), set(layers), dtype=torch.qint8)
+    logger.info(
+        f"Quantized {type(model).__name__}: "
+        f"{model_size_bytes(model) / 1e6:.1f} MB -> "
+        f"{model_size_bytes(quantized) / 1e6:.1f} MB"
+    )
+    return quantized
+
+
+def model_size_bytes(model: nn.Module) -> int:
+    """
+    @brief Serialized size of a model's state dict
+    @param model: Model
+    @return: Size in bytes
+    """
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
+
+
+def _timed(fn, repeats: int):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        out = fn()
+    return out, (time.perf_counter() - start) / repeats
+
+
+def compare_cnn_lstm(
+    fp32_model: nn.Module,
+    quantized_model: nn.Module,
+    windows: np.ndarray,
+    repeats: int = 5
+) -> Dict[str, float]:
+    """
+    Compare quantized and FP32 technical scores on held-out windows.
+
+    @param fp32_model: Original model
+    @param quantized_model: Quantized model
+    @param windows: (assets x window x features) held-out inputs
+    @param repeats: Timed repetitions per model
+    @return: Score deltas, direction agreement, latency and size ratios
+    """
+    from models.technical.infer_cnn_lstm import predict_batch
+
+    fp32, fp32_latency = _timed(lambda: predict_batch(fp32_model, windows), repeats)
+    int8, int8_latency = _timed(lambda: predict_batch(quantized_model, windows), repeats)
+    delta = np.abs(fp32 - int8)
+    return {
+        "mean_abs_delta": float(delta.mean()),
+        "max_abs_delta": float(delta.max()),
+        "direction_agreement": float(np.mean((fp32 > 0.5) == (int8 > 0.5))),
+        "fp32_latency_s": fp32_latency,
+        "int8_latency_s": int8_latency,
+        "speedup": fp32_latency / int8_latency,
+        "size_ratio": model_size_bytes(quantized_model) / model_size_bytes(fp32_model),
+    }
+
+
+def compare_finbert(
+    fp32_model: nn.Module,
+    quantized_model: nn.Module,
+    tokenizer: Any,
+    texts: Sequence[str],
+    labels: Optional[Sequence[int]] = None,
+    batch_size: int = 32,
+    repeats: int = 1
+) -> Dict[str, float]:
+    """
+    Compare quantized and FP32 FinBERT outputs on held-out texts.
+
+    @param fp32_model: Original classifier
+    @param quantized_model: Quantized classifier
+    @param tokenizer: Tokenizer matching the classifier
+    @param texts: Held-out texts
+    @param labels: Optional gold labels to report accuracy for both models
+    @param batch_size: Texts per forward pass
+    @param repeats: Timed repetitions per model
+    @return: Probability deltas, label agreement, accuracies and latency
+    """
+    batches = [
+        tokenizer(list(texts[i:i + batch_size]), return_tensors="pt", padding=True, truncation=True)
+        for i in range(0, len(texts), batch_size)
+    ]
+
+    def run(model) -> np.ndarray:
+        with torch.inference_mode():
+            return torch.cat([
+                model(**inputs).logits.softmax(dim=-1) for inputs in batches
+            ]).numpy()
+
+    fp32, fp32_latency = _timed(lambda: run(fp32_model), repeats)
+    int8, int8_latency = _timed(lambda: run(quantized_model), repeats)
+    delta = np.abs(fp32 - int8)
+    report = {
+        "mean_abs_delta": float(delta.mean()),
+        "max_abs_delta": float(delta.max()),
+        "label_agreement": float(np.mean(fp32.argmax(axis=1) == int8.argmax(axis=1))),
+        "fp32_latency_s": fp32_latency,
+        "int8_latency_s": int8_latency,
+        "speedup": fp32_latency / int8_latency,
+        "size_ratio": model_size_bytes(quantized_model) / model_size_bytes(fp32_model),
+    }
+    if labels is not None:
+        labels = np.asarray(labels)
+        report["fp32_accuracy"] = float(np.mean(fp32.argmax(axis=1) == labels))
+        report["int8_accuracy"] = float(np.mean(int8.argmax(axis=1) == labels))
+    return report
+
+
+def check_report(report: Dict[str, float], max_mean_abs_delta: float = 0.02) -> bool:
+    """
+    @brief Accuracy gate for rolling out a quantized model
+    @param report: Output of compare_cnn_lstm or compare_finbert
+    @param max_mean_abs_delta: Largest acceptable mean score delta
+    @return: True if the quantized model is within tolerance
+    """
+    ok = report["mean_abs_delta"] <= max_mean_abs_delta
+    if "fp32_accuracy" in report:
+        ok = ok and report["int8_accuracy"] >= report["fp32_accuracy"] - max_mean_abs_delta
+    return ok
+
+
+if __name__ == "__main__":
+    from models.technical.cnn_lstm import CNNLSTMModel
+
+    model = CNNLSTMModel(input_size=10, hidden_size=64, num_layers=2).eval()
+    windows = np.random.randn(256, 50, 10).astype(np.float32)
+    report = compare_cnn_lstm(model, quantize_model(model), windows)
+    print(report, "ok" if check_report(report) else "rejected")
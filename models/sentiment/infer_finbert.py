@@ -1,21 +1,93 @@
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import torch
-from typing import Dict, Any, List
+import functools
+import logging
+import os
+from typing import Dict, Any, List, Optional
+from models.onnx_backend import OnnxModel, resolve_backend, softmax
+
+logger = logging.getLogger(__name__)
+
+TOKENIZER_NAME = os.getenv("FINBERT_TOKENIZER", "ProsusAI/finbert")
+DEFAULT_MODEL_PATH = os.getenv("SENTIMENT_MODEL_PATH", "models/sentiment/saved/finbert")
+# Files save_pretrained() writes for a tokenizer
+TOKENIZER_FILES = ("tokenizer.json", "tokenizer_config.json", "vocab.txt")
+
+@functools.lru_cache(maxsize=4)
+def get_tokenizer(name: str = TOKENIZER_NAME) -> Any:
+    """
+    Load a tokenizer once per process.
+    """
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(name)
+
+def _model_tokenizer(model_path: str) -> Optional[Any]:
+    """
+    Tokenizer saved with the model, or None if the model directory has none.
+    """
+    directory = model_path if os.path.isdir(model_path) else os.path.dirname(model_path)
+    if not any(os.path.exists(os.path.join(directory, name)) for name in TOKENIZER_FILES):
+        return None
+    return get_tokenizer(directory)
+
+def load_model(
+    model_path: Optional[str] = None,
+    quantize: Optional[bool] = None,
+    backend: Optional[str] = None
+) -> Any:
+    """
+    Load the FinBERT classifier, optionally with INT8 dynamic quantization
+    of its Linear layers (defaults to the QUANTIZE_MODELS environment variable).
+
+    With the ONNX backend (MODEL_BACKEND=onnx) ``model_path`` is an exported
+    .onnx file, or a directory containing model.onnx, served through ONNX
+    Runtime without importing torch.
+
+    A tokenizer saved next to the weights is attached to the model as
+    ``model.tokenizer`` and used by predict(), so a versioned model is
+    always served with its own vocabulary. Without one, predict() falls
+    back to TOKENIZER_NAME.
+
+    Returns None if nothing exists at ``model_path`` (defaults to the
+    SENTIMENT_MODEL_PATH environment variable).
+    """
+    model_path = model_path or DEFAULT_MODEL_PATH
+    if not os.path.exists(model_path):
+        logger.warning(f"No sentiment model at {model_path}")
+        return None
+
+    if resolve_backend(backend) == "onnx":
+        if os.path.isdir(model_path):
+            model_path = os.path.join(model_path, "model.onnx")
+        model = OnnxModel(model_path)
+        model.tokenizer = _model_tokenizer(model_path)
+        return model
+
+    from transformers import AutoModelForSequenceClassification
+    from models.quantization import TRANSFORMER_LAYERS, quantization_enabled, quantize_model
 
-def load_model(model_path: str) -> AutoModelForSequenceClassification:
     model = AutoModelForSequenceClassification.from_pretrained(model_path)
     model.eval()
+    if quantization_enabled(quantize):
+        model = quantize_model(model, TRANSFORMER_LAYERS)
+    model.tokenizer = _model_tokenizer(model_path)
     return model
 
-def predict(model: AutoModelForSequenceClassification, texts: List[str]) -> Dict[str, Any]:
-    tokenizer = AutoTokenizer.from_pretrained("ProsusAI/finbert")
-    inputs = tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
-    
-    with torch.no_grad():
-        outputs = model(**inputs)
-    
+def predict(model: Any, texts: List[str], tokenizer: Any = None) -> Dict[str, Any]:
+    tokenizer = tokenizer or getattr(model, "tokenizer", None) or get_tokenizer()
+
+    if isinstance(model, OnnxModel):
+        inputs = tokenizer(texts, return_tensors="np", padding=True, truncation=True)
+        probabilities = softmax(model.run(dict(inputs))).tolist()
+    else:
+        import torch
+
+        inputs = tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
+        with torch.inference_mode():
+            outputs = model(**inputs)
+        probabilities = outputs.logits.softmax(dim=1).tolist()
+
     return {
-        "predictions": outputs.logits.softmax(dim=1).tolist(),
+        "predictions": probabilities,
         "sentiment": "positive"  # Placeholder
     }
 
@@ -23,4 +95,4 @@ if __name__ == "__main__":
     texts = ["Bitcoin is going up!", "Market looks bearish"]
     model = load_model("finbert_model")
     result = predict(model, texts)
-    print(result) 
\ No newline at end of file
+    print(result)
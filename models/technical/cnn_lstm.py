@@ -0,0 +1,42 @@
+"""
+@file cnn_lstm.py
+@brief CNN-LSTM technical model architecture
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module defines the CNN-LSTM network and its checkpoint format. It
+only depends on torch, so the serving path can rebuild checkpoints
+without importing the training code.
+"""
+
+import torch
+import torch.nn as nn
+
+class CNNLSTMModel(nn.Module):
+    """CNN-LSTM over (batch x window x feature) inputs, one logit per window."""
+
+    def __init__(self, input_size: int, hidden_size: int, num_layers: int, kernel_size: int = 3):
+        super().__init__()
+        self.config = {
+            "input_size": input_size,
+            "hidden_size": hidden_size,
+            "num_layers": num_layers,
+            "kernel_size": kernel_size,
+        }
+        self.cnn = nn.Conv1d(input_size, hidden_size, kernel_size=kernel_size, padding=kernel_size // 2)
+        self.lstm = nn.LSTM(hidden_size, hidden_size, num_layers, batch_first=True)
+        self.fc = nn.Linear(hidden_size, 1)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        # Conv1d convolves over time with features as channels
+        x = torch.relu(self.cnn(x.transpose(1, 2)))
+        x = self.lstm(x.transpose(1, 2))[0]
+        return self.fc(x[:, -1])
+
+def save_model(model: CNNLSTMModel, path: str) -> None:
+    """
+    Save weights together with the constructor config needed to rebuild the model.
+    """
+    torch.save({"config": model.config, "state_dict": model.state_dict()}, path)
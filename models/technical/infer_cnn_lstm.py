@@ -7,48 +7,221 @@
 @copyright [Your Organization]
 
 This module implements the technical analysis model using a CNN-LSTM
-architecture for cryptocurrency price prediction.
+architecture for cryptocurrency price prediction. Trained weights are
+loaded once, optionally compiled with TorchScript or torch.compile, and
+scored as a single batched forward pass over (asset x window x feature)
+inputs. With the ONNX backend the model is served through ONNX Runtime
+and torch is never imported.
+
+Checkpoints are memory-mapped by default and their tensors used in place,
+so the weights live in the page cache and are shared by every worker
+process that loads the same file instead of being copied into each one.
 """
 
-from typing import Dict, Any
+from typing import Any, Dict, Optional
+import os
 import numpy as np
 import logging
+from models.onnx_backend import OnnxModel, resolve_backend, sigmoid
 
 logger = logging.getLogger(__name__)
 
-def load_model(model_path: str = None) -> Any:
+DEFAULT_MODEL_PATH = os.getenv(
+    "TECHNICAL_MODEL_PATH",
+    "models/technical/saved/cnn_lstm_model.pt"
+)
+DEFAULT_ONNX_PATH = os.getenv(
+    "TECHNICAL_ONNX_PATH",
+    "models/technical/saved/cnn_lstm_model.onnx"
+)
+
+# File extensions of exported TorchScript archives
+TORCHSCRIPT_EXTENSIONS = (".ts", ".torchscript")
+
+COMPILE_MODES = (None, "torchscript", "compile")
+
+
+def _build_model(checkpoint: Dict[str, Any], config: Dict[str, Any], assign: bool = False) -> Any:
+    """
+    Rebuild a CNNLSTMModel from a checkpoint.
+
+    @param checkpoint: Either {"config", "state_dict"} or a bare state dict
+    @param config: Constructor arguments used when the checkpoint has none
+    @param assign: Use the checkpoint tensors as parameters instead of
+                   copying them (keeps memory-mapped weights shared)
+    @return: Model with weights loaded, in eval mode
+    """
+    from models.technical.cnn_lstm import CNNLSTMModel
+
+    if "state_dict" in checkpoint:
+        config = {**config, **checkpoint.get("config", {})}
+        checkpoint = checkpoint["state_dict"]
+    model = CNNLSTMModel(**config)
+    model.load_state_dict(checkpoint, assign=assign)
+    return model.eval()
+
+
+def compile_model(model: Any, compile_mode: Optional[str]) -> Any:
+    """
+    Compile a model for faster CPU inference.
+
+    @param model: Model in eval mode
+    @param compile_mode: None, "torchscript" or "compile"
+    @return: Compiled (or unchanged) model
+    """
+    import torch
+
+    if compile_mode not in COMPILE_MODES:
+        raise ValueError(f"Unknown compile mode: {compile_mode}")
+    if compile_mode == "torchscript":
+        return torch.jit.optimize_for_inference(torch.jit.script(model))
+    if compile_mode == "compile":
+        return torch.compile(model, dynamic=True)
+    return model
+
+
+def export_torchscript(model: Any, path: str) -> None:
+    """
+    Export a frozen TorchScript archive that loads without the model class.
+
+    @param model: Trained model
+    @param path: Output path (use a .ts extension so load_model detects it)
+    """
+    import torch
+
+    scripted = torch.jit.freeze(torch.jit.script(model.eval()))
+    torch.jit.save(scripted, path)
+    logger.info(f"Technical model exported to {path}")
+
+
+def load_model(
+    model_path: Optional[str] = None,
+    compile_mode: Optional[str] = None,
+    quantize: Optional[bool] = None,
+    backend: Optional[str] = None,
+    input_size: int = 10,
+    hidden_size: int = 64,
+    num_layers: int = 2,
+    mmap: Optional[bool] = None
+) -> Any:
     """
     Load the technical analysis model.
-    
-    @param model_path: Optional path to model weights
-    @return: Loaded model
+
+    @param model_path: Optional path to model weights or a TorchScript archive
+    @param compile_mode: None, "torchscript" or "compile"
+    @param quantize: Dynamically quantize LSTM/Linear layers to INT8
+                     (defaults to the QUANTIZE_MODELS environment variable)
+    @param backend: "torch" or "onnx" (defaults to the MODEL_BACKEND
+                    environment variable)
+    @param input_size: Feature count, for checkpoints saved without config
+    @param hidden_size: Hidden size, for checkpoints saved without config
+    @param num_layers: LSTM layers, for checkpoints saved without config
+    @param mmap: Memory-map the checkpoint (defaults to the MODEL_MMAP
+                 environment variable, on unless set to "0")
+    @return: Loaded model, or None if no weights are available
     """
     try:
-        # Placeholder for model loading
+        backend = resolve_backend(backend)
+        model_path = model_path or (
+            DEFAULT_ONNX_PATH if backend == "onnx" else DEFAULT_MODEL_PATH
+        )
+        if not os.path.exists(model_path):
+            logger.warning(f"No technical model weights at {model_path}")
+            return None
+
+        if backend == "onnx":
+            model = OnnxModel(model_path)
+        elif model_path.endswith(TORCHSCRIPT_EXTENSIONS):
+            import torch
+
+            model = torch.jit.load(model_path, map_location="cpu").eval()
+        else:
+            import torch
+            from models.quantization import CNN_LSTM_LAYERS, quantization_enabled, quantize_model
+
+            if mmap is None:
+                mmap = os.getenv("MODEL_MMAP", "1") != "0"
+            checkpoint = torch.load(model_path, map_location="cpu", weights_only=True, mmap=mmap)
+            model = _build_model(checkpoint, {
+                "input_size": input_size,
+                "hidden_size": hidden_size,
+                "num_layers": num_layers,
+            }, assign=mmap)
+            if quantization_enabled(quantize):
+                model = quantize_model(model, CNN_LSTM_LAYERS)
+            model = compile_model(model, compile_mode)
+
         logger.info("Technical model loaded")
-        return None
+        return model
     except Exception as e:
         logger.error(f"Failed to load technical model: {str(e)}")
         raise
 
-def predict(model: Any, features: Dict[str, Any]) -> float:
+def predict_batch(
+    model: Any,
+    windows: Any,
+    batch_size: Optional[int] = None
+) -> np.ndarray:
+    """
+    Score many assets in one batched forward pass.
+
+    @param model: Loaded model
+    @param windows: (assets x window x features) array of feature windows
+    @param batch_size: Optional chunk size to bound peak memory
+    @return: (assets,) array of up-move probabilities
+    """
+    try:
+        if np.ndim(windows) != 3:
+            raise ValueError("windows must have shape (assets, window, features)")
+        if len(windows) == 0:
+            return np.empty(0, dtype=np.float32)
+
+        if isinstance(model, OnnxModel):
+            x = np.ascontiguousarray(windows, dtype=np.float32)
+            step = batch_size or len(x)
+            logits = np.concatenate([
+                model(x[start:start + step]) for start in range(0, len(x), step)
+            ])
+            return sigmoid(logits).reshape(-1)
+
+        import torch
+
+        x = torch.as_tensor(windows, dtype=torch.float32)
+        with torch.inference_mode():
+            if batch_size is None or batch_size >= x.shape[0]:
+                logits = model(x)
+            else:
+                logits = torch.cat([
+                    model(chunk) for chunk in torch.split(x, batch_size)
+                ])
+            return torch.sigmoid(logits).reshape(-1).numpy()
+    except Exception as e:
+        logger.error(f"Technical batch prediction failed: {str(e)}")
+        raise
+
+def predict(model: Any, features: Any) -> float:
     """
     Make prediction using the technical model.
-    
+
     @param model: Loaded model
-    @param features: Technical features
+    @param features: (window x features) or (1 x window x features) window,
+                     as an array or nested lists
     @return: Prediction score
     """
     try:
-        # Placeholder for prediction logic
-        return 0.75
+        x = np.asarray(features, dtype=np.float32)
+        x = x if x.ndim == 3 else x[None]
+        return float(predict_batch(model, x)[0])
     except Exception as e:
         logger.error(f"Technical prediction failed: {str(e)}")
         raise
 
 if __name__ == "__main__":
+    import torch
+    from models.technical.cnn_lstm import CNNLSTMModel
+
     # Dummy data
-    X = torch.randn(1, 10, 50)
-    model = load_model("model.pth")
-    result = predict(model, X)
-    print(result) 
\ No newline at end of file
+    X = torch.randn(1, 50, 10)
+    model = CNNLSTMModel(input_size=10, hidden_size=64, num_layers=2).eval()
+    result = predict(compile_model(model, "torchscript"), X)
+    print(result)
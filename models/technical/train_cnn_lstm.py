@@ -1,30 +1,271 @@
+"""
+@file train_cnn_lstm.py
+@brief Training for the CNN-LSTM technical model
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements the training loop of the CNN-LSTM technical model
+(the architecture lives in cnn_lstm.py so serving never imports it).
+Training data is one (rows x features) float32 array holding the bars of
+all assets back to back, usually a memory-mapped .npy file. Sliding windows
+are served as views into that array, so windows are never materialized and
+the working set stays bounded by the DataLoader batches.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import copy
+import logging
+import math
+import numpy as np
 import torch
 import torch.nn as nn
-from typing import Tuple
-
-class CNNLSTMModel(nn.Module):
-    def __init__(self, input_size: int, hidden_size: int, num_layers: int):
-        super().__init__()
-        self.cnn = nn.Conv1d(input_size, hidden_size, kernel_size=3)
-        self.lstm = nn.LSTM(hidden_size, hidden_size, num_layers)
-        self.fc = nn.Linear(hidden_size, 1)
-
-    def forward(self, x: torch.Tensor) -> torch.Tensor:
-        x = self.cnn(x)
-        x = self.lstm(x)[0]
-        return self.fc(x)
-
-def train_model(X: torch.Tensor, y: torch.Tensor) -> Tuple[CNNLSTMModel, float]:
-    model = CNNLSTMModel(input_size=10, hidden_size=64, num_layers=2)
-    criterion = nn.MSELoss()
-    optimizer = torch.optim.Adam(model.parameters())
-    
-    # Placeholder for training loop
-    return model, 0.0
+from torch.utils.data import DataLoader, Dataset, TensorDataset
+from models.technical.cnn_lstm import CNNLSTMModel, save_model
+
+logger = logging.getLogger(__name__)
+
+class WindowedDataset(Dataset):
+    """
+    Sliding windows over a (rows x features) array of concatenated assets.
+
+    Item ``i`` is the window of ``window`` rows ending at row ``ends[i]``
+    and the target of that row. ``asset_offsets`` holds the first row of
+    each asset (plus the total row count), and no window crosses an asset
+    boundary. When built from file paths the arrays are opened with
+    ``np.load(mmap_mode="c")`` and reopened in each DataLoader worker, so
+    workers share the page cache instead of pickling the data.
+    """
+
+    def __init__(
+        self,
+        features: Any,
+        targets: Any,
+        window: int,
+        asset_offsets: Optional[Sequence[int]] = None,
+        ends: Optional[np.ndarray] = None
+    ):
+        """
+        @param features: (rows x features) array or path to a .npy file
+        @param targets: (rows,) array or .npy path; the label of the window
+                        ending at each row, NaN where there is none
+        @param window: Window length in rows
+        @param asset_offsets: Start row of each asset followed by the row count
+        @param ends: Window end rows to serve (computed when omitted)
+        """
+        self.window = window
+        self._paths = (
+            (features, targets) if isinstance(features, str) else None
+        )
+        self._features = None if self._paths else features
+        self._targets = None if self._paths else targets
+
+        self._open()
+        self.offsets = np.asarray(
+            asset_offsets if asset_offsets is not None else [0, len(self._features)],
+            dtype=np.int64
+        )
+        if ends is None:
+            ends = self._window_ends()
+        self.ends = np.asarray(ends, dtype=np.int64)
+
+    def _open(self) -> None:
+        if self._features is None:
+            self._features = np.load(self._paths[0], mmap_mode="c")
+            self._targets = np.load(self._paths[1], mmap_mode="c")
+
+    def _window_ends(self) -> np.ndarray:
+        rows = np.arange(len(self._features))
+        # Start row of the asset each row belongs to
+        asset_start = self.offsets[np.searchsorted(self.offsets, rows, side="right") - 1]
+        valid = (rows - asset_start >= self.window - 1) & ~np.isnan(self._targets)
+        return rows[valid]
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        if self._paths:
+            state["_features"] = state["_targets"] = None
+        return state
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+    def __getitem__(self, index: int) -> Tuple[torch.Tensor, torch.Tensor]:
+        self._open()
+        end = int(self.ends[index]) + 1
+        window = torch.from_numpy(self._features[end - self.window:end]).float()
+        target = torch.tensor([self._targets[end - 1]], dtype=torch.float32)
+        return window, target
+
+    def subset(self, ends: np.ndarray) -> "WindowedDataset":
+        """
+        @brief Dataset over the same arrays serving only the given window ends
+        @param ends: Window end rows
+        @return: New dataset sharing the underlying arrays
+        """
+        subset = copy.copy(self)
+        subset.ends = np.asarray(ends, dtype=np.int64)
+        return subset
+
+    def time_split(self, val_fraction: float = 0.2, gap: int = 0) -> Tuple["WindowedDataset", "WindowedDataset"]:
+        """
+        Split windows by time: within each asset the latest ``val_fraction``
+        of windows go to validation. The first ``gap`` windows after the cut
+        are dropped so targets looking ahead do not leak into training.
+
+        @param val_fraction: Fraction of windows held out per asset
+        @param gap: Windows dropped between the training and validation parts
+        @return: (train, validation) datasets
+        """
+        breaks = np.searchsorted(self.ends, self.offsets[1:-1])
+        train, val = [], []
+        for ends in np.split(self.ends, breaks):
+            cut = len(ends) - int(math.ceil(len(ends) * val_fraction))
+            train.append(ends[:cut])
+            val.append(ends[cut + gap:])
+        return self.subset(np.concatenate(train)), self.subset(np.concatenate(val))
+
+def fit(
+    model: CNNLSTMModel,
+    train_data: Dataset,
+    val_data: Dataset,
+    epochs: int = 20,
+    batch_size: int = 256,
+    learning_rate: float = 1e-3,
+    num_workers: int = 0,
+    max_grad_norm: float = 1.0,
+    patience: int = 3,
+    checkpoint_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Train with early stopping on validation loss.
+
+    Targets are binary up/down labels trained with BCE on the model's logit.
+    The best weights by validation loss are restored into ``model`` at the
+    end and, when ``checkpoint_path`` is set, saved on every improvement.
+
+    @param model: Model to train in place
+    @param train_data: Training windows
+    @param val_data: Validation windows, later in time than training
+    @param epochs: Maximum epochs
+    @param batch_size: Windows per batch
+    @param learning_rate: Adam learning rate
+    @param num_workers: DataLoader worker processes
+    @param max_grad_norm: Gradient clipping norm
+    @param patience: Epochs without improvement before stopping
+    @param checkpoint_path: Optional path for the best checkpoint
+    @return: Per-epoch losses, best validation loss and best epoch
+    """
+    loader_args = {
+        "batch_size": batch_size,
+        "num_workers": num_workers,
+        "persistent_workers": num_workers > 0,
+    }
+    train_loader = DataLoader(train_data, shuffle=True, **loader_args)
+    val_loader = DataLoader(val_data, shuffle=False, **loader_args)
+
+    criterion = nn.BCEWithLogitsLoss()
+    optimizer = torch.optim.Adam(model.parameters(), lr=learning_rate)
+    history: Dict[str, List[float]] = {"train_loss": [], "val_loss": []}
+    best_loss, best_epoch, best_state = math.inf, -1, None
+
+    for epoch in range(epochs):
+        model.train()
+        total, count = 0.0, 0
+        for x, y in train_loader:
+            optimizer.zero_grad()
+            loss = criterion(model(x), y)
+            loss.backward()
+            nn.utils.clip_grad_norm_(model.parameters(), max_grad_norm)
+            optimizer.step()
+            total += loss.item() * len(x)
+            count += len(x)
+        history["train_loss"].append(total / max(count, 1))
+
+        val_loss = evaluate(model, val_loader, criterion)
+        history["val_loss"].append(val_loss)
+        logger.info(
+            f"Epoch {epoch + 1}: train {history['train_loss'][-1]:.4f}, val {val_loss:.4f}"
+        )
+
+        if val_loss < best_loss:
+            best_loss, best_epoch = val_loss, epoch
+            best_state = copy.deepcopy(model.state_dict())
+            if checkpoint_path:
+                save_model(model, checkpoint_path)
+        elif epoch - best_epoch >= patience:
+            logger.info(f"Early stopping after epoch {epoch + 1}")
+            break
+
+    if best_state is not None:
+        model.load_state_dict(best_state)
+    model.eval()
+    return {**history, "best_val_loss": best_loss, "best_epoch": best_epoch}
+
+def evaluate(model: CNNLSTMModel, loader: DataLoader, criterion: nn.Module) -> float:
+    """
+    @brief Mean loss over a loader
+    @param model: Model
+    @param loader: Batches of (windows, targets)
+    @param criterion: Loss function
+    @return: Mean loss per window
+    """
+    model.eval()
+    total, count = 0.0, 0
+    with torch.inference_mode():
+        for x, y in loader:
+            total += criterion(model(x), y).item() * len(x)
+            count += len(x)
+    return total / count if count else math.inf
+
+def train_model(
+    X: Any,
+    y: Any,
+    window: int = 50,
+    asset_offsets: Optional[Sequence[int]] = None,
+    model: Optional[CNNLSTMModel] = None,
+    hidden_size: int = 64,
+    num_layers: int = 2,
+    val_fraction: float = 0.2,
+    **fit_args: Any
+) -> Tuple[CNNLSTMModel, float]:
+    """
+    Train the technical model.
+
+    @param X: (rows x features) array or .npy path served as sliding windows,
+              or an already windowed (samples x window x features) array
+    @param y: Binary targets per row, or per sample for windowed input
+    @param window: Window length for row input
+    @param asset_offsets: Start row of each asset followed by the row count
+    @param model: Optional model to continue training
+    @param hidden_size: Hidden size of a new model
+    @param num_layers: LSTM layers of a new model
+    @param val_fraction: Fraction of the latest windows held out for validation
+    @param fit_args: Extra arguments for fit()
+    @return: Trained model and best validation loss
+    """
+    if not isinstance(X, str) and np.ndim(X) == 3:
+        X = torch.as_tensor(X, dtype=torch.float32)
+        y = torch.as_tensor(y, dtype=torch.float32).reshape(-1, 1)
+        cut = len(X) - int(math.ceil(len(X) * val_fraction))
+        train_data = TensorDataset(X[:cut], y[:cut])
+        val_data = TensorDataset(X[cut:], y[cut:])
+        input_size = X.shape[2]
+    else:
+        dataset = WindowedDataset(X, y, window, asset_offsets)
+        train_data, val_data = dataset.time_split(val_fraction, gap=window)
+        input_size = dataset[0][0].shape[1]
+
+    model = model or CNNLSTMModel(input_size, hidden_size, num_layers)
+    result = fit(model, train_data, val_data, **fit_args)
+    return model, result["best_val_loss"]
 
 if __name__ == "__main__":
-    # Dummy data
-    X = torch.randn(100, 10, 50)
-    y = torch.randn(100, 1)
-    model, loss = train_model(X, y)
-    print(f"Training loss: {loss}") 
\ No newline at end of file
+    # Dummy data: two assets of random bars with next-bar direction labels
+    rng = np.random.default_rng(0)
+    features = rng.standard_normal((2000, 10)).astype(np.float32)
+    targets = (rng.standard_normal(2000) > 0).astype(np.float32)
+    targets[[999, 1999]] = np.nan
+    model, loss = train_model(features, targets, asset_offsets=[0, 1000, 2000], epochs=2)
+    print(f"Best validation loss: {loss}")
@@ -0,0 +1,117 @@
+"""
+@file infer_xgboost.py
+@brief Tokenomics model serving with XGBoost
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements inference for the XGBoost tokenomics model. The
+booster is loaded once per process and scored with ``inplace_predict`` on
+contiguous float32 arrays, so no DMatrix or DataFrame is built per call.
+xgboost (and the scikit-learn it pulls in) is imported when a booster is
+loaded, not when the module is.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence
+import logging
+import os
+import numpy as np
+
+if TYPE_CHECKING:
+    import xgboost as xgb
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = os.getenv(
+    "TOKENOMICS_MODEL_PATH",
+    "models/tokenomics/saved/xgboost_model.ubj"
+)
+
+# Column order the booster was trained on (tokenomics_features table)
+TOKENOMICS_FEATURES = [
+    "tvl_ratio",
+    "weekly_active_wallets",
+    "dev_commit_activity",
+    "wallet_concentration",
+    "unlock_volume",
+    "fdv_ratio",
+    "avg_daily_volume",
+]
+
+def load_model(model_path: Optional[str] = None, nthread: Optional[int] = None) -> Optional["xgb.Booster"]:
+    """
+    Load the tokenomics booster.
+
+    @param model_path: Path to a saved booster (.ubj or .json)
+    @param nthread: Prediction threads (defaults to XGBOOST_NTHREAD, 0 = all cores)
+    @return: Loaded booster, or None if no model is available
+    """
+    try:
+        model_path = model_path or DEFAULT_MODEL_PATH
+        if not os.path.exists(model_path):
+            logger.warning(f"No tokenomics model at {model_path}")
+            return None
+
+        import xgboost as xgb
+
+        booster = xgb.Booster(model_file=model_path)
+        nthread = nthread if nthread is not None else int(os.getenv("XGBOOST_NTHREAD", "0"))
+        if nthread:
+            booster.set_param({"nthread": nthread})
+        logger.info("Tokenomics model loaded")
+        return booster
+    except Exception as e:
+        logger.error(f"Failed to load tokenomics model: {str(e)}")
+        raise
+
+def features_to_matrix(rows: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """
+    @brief Pack tokenomics feature dicts into a (rows x features) float32 array
+    @param rows: Feature dicts keyed by TOKENOMICS_FEATURES (missing values become NaN)
+    @return: C-contiguous feature matrix
+    """
+    matrix = np.full((len(rows), len(TOKENOMICS_FEATURES)), np.nan, dtype=np.float32)
+    for i, row in enumerate(rows):
+        for j, name in enumerate(TOKENOMICS_FEATURES):
+            value = row.get(name)
+            if value is not None:
+                matrix[i, j] = value
+    return matrix
+
+def predict_batch(model: "xgb.Booster", X: Any) -> np.ndarray:
+    """
+    Score many assets in one call.
+
+    @param model: Loaded booster
+    @param X: (assets x features) array in TOKENOMICS_FEATURES order
+    @return: (assets,) array of up-move probabilities
+    """
+    try:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2:
+            raise ValueError("X must have shape (assets, features)")
+        if len(X) == 0:
+            return np.empty(0, dtype=np.float32)
+        return model.inplace_predict(X)
+    except Exception as e:
+        logger.error(f"Tokenomics batch prediction failed: {str(e)}")
+        raise
+
+def predict(model: "xgb.Booster", features: Dict[str, Any]) -> float:
+    """
+    Make prediction using the tokenomics model.
+
+    @param model: Loaded booster
+    @param features: Tokenomics feature values for one asset
+    @return: Prediction score
+    """
+    return float(predict_batch(model, features_to_matrix([features]))[0])
+
+if __name__ == "__main__":
+    from models.tokenomics.train_xgboost import train_xgboost
+
+    # Dummy data
+    X = np.random.randn(1000, len(TOKENOMICS_FEATURES)).astype(np.float32)
+    model = train_xgboost(X, (X[:, 0] > 0).astype(np.float32))
+    print(predict(model, dict(zip(TOKENOMICS_FEATURES, X[0]))))
@@ -1,14 +1,191 @@
-# Placeholder: Train XGBoost on tokenomics features
+"""
+@file train_xgboost.py
+@brief Training for the XGBoost tokenomics model
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements training of the tokenomics classifier with the
+histogram tree method. Inputs are converted once to C-contiguous float32
+arrays and quantized into a QuantileDMatrix; the latest rows are held out
+for early stopping. Datasets larger than RAM are streamed batch by batch
+from .npy files into an external-memory matrix.
+"""
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+import logging
+import os
+import numpy as np
 import xgboost as xgb
-from typing import List, Any
 
-def train_xgboost(X: List[Any], y: List[int]) -> xgb.XGBClassifier:
-    model = xgb.XGBClassifier()
-    model.fit(X, y)
-    return model
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARAMS = {
+    "objective": "binary:logistic",
+    "eval_metric": "logloss",
+    "tree_method": "hist",
+    "max_depth": 6,
+    "eta": 0.1,
+    "subsample": 0.8,
+    "colsample_bytree": 0.8,
+}
+
+def as_contiguous(X: Any) -> np.ndarray:
+    """
+    @brief Convert features to a C-contiguous float32 array (no copy if already one)
+    @param X: Array-like features
+    @return: Contiguous float32 array
+    """
+    return np.ascontiguousarray(X, dtype=np.float32)
+
+def _params(params: Optional[Dict[str, Any]], nthread: Optional[int], max_bin: int) -> Dict[str, Any]:
+    nthread = nthread if nthread is not None else int(os.getenv("XGBOOST_NTHREAD", "0"))
+    merged = {**DEFAULT_PARAMS, "max_bin": max_bin, **(params or {})}
+    if nthread:
+        merged["nthread"] = nthread
+    return merged
+
+def _best_rounds(booster: xgb.Booster) -> xgb.Booster:
+    """Drop the trees boosted after the best early-stopping round."""
+    best = booster.attr("best_iteration")
+    if best is not None and int(best) + 1 < booster.num_boosted_rounds():
+        attributes = booster.attributes()
+        booster = booster[:int(best) + 1]
+        booster.set_attr(**attributes)
+    return booster
+
+def train_xgboost(
+    X: Any,
+    y: Any,
+    params: Optional[Dict[str, Any]] = None,
+    num_boost_round: int = 500,
+    early_stopping_rounds: int = 20,
+    val_fraction: float = 0.2,
+    nthread: Optional[int] = None,
+    max_bin: int = 256,
+    xgb_model: Optional[xgb.Booster] = None
+) -> xgb.Booster:
+    """
+    Train the tokenomics classifier on in-memory data.
+
+    Rows must be in time order; the last ``val_fraction`` of them is the
+    early-stopping set, binned with the training set's quantiles. With
+    ``xgb_model`` boosting continues from the existing trees, so a
+    retrain on recent data only adds rounds.
+
+    @param X: (rows x features) features, ideally already contiguous float32
+    @param y: Binary targets
+    @param params: Booster parameters overriding DEFAULT_PARAMS
+    @param num_boost_round: Maximum boosting rounds
+    @param early_stopping_rounds: Rounds without improvement before stopping
+    @param val_fraction: Fraction of the latest rows held out (0 disables early stopping)
+    @param nthread: Training threads (defaults to XGBOOST_NTHREAD, 0 = all cores)
+    @param max_bin: Histogram bins per feature
+    @param xgb_model: Booster to continue training from
+    @return: Trained booster, truncated to the best round
+    """
+    X = as_contiguous(X)
+    y = np.asarray(y, dtype=np.float32)
+    cut = len(X) - int(len(X) * val_fraction)
+
+    dtrain = xgb.QuantileDMatrix(X[:cut], y[:cut], max_bin=max_bin)
+    evals = []
+    if cut < len(X):
+        evals = [(xgb.QuantileDMatrix(X[cut:], y[cut:], ref=dtrain), "validation")]
+
+    booster = xgb.train(
+        _params(params, nthread, max_bin),
+        dtrain,
+        num_boost_round=num_boost_round,
+        evals=evals,
+        early_stopping_rounds=early_stopping_rounds if evals else None,
+        verbose_eval=False,
+        xgb_model=xgb_model
+    )
+    booster = _best_rounds(booster)
+    logger.info(f"XGBoost trained: {booster.num_boosted_rounds()} rounds")
+    return booster
+
+class NpyBatchIter(xgb.DataIter):
+    """Stream (features, target) .npy file pairs into XGBoost one batch at a time."""
+
+    def __init__(self, batches: Sequence[Tuple[str, str]], cache_dir: Optional[str] = None):
+        """
+        @param batches: (features path, target path) pairs in time order
+        @param cache_dir: Directory for XGBoost's external-memory cache pages
+        """
+        self.batches = list(batches)
+        self._index = 0
+        cache_prefix = os.path.join(cache_dir, "xgb_cache") if cache_dir else None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data) -> bool:
+        if self._index == len(self.batches):
+            return False
+        features, target = self.batches[self._index]
+        input_data(
+            data=as_contiguous(np.load(features, mmap_mode="r")),
+            label=np.load(target, mmap_mode="r")
+        )
+        self._index += 1
+        return True
+
+    def reset(self) -> None:
+        self._index = 0
+
+def train_xgboost_external(
+    batches: Sequence[Tuple[str, str]],
+    params: Optional[Dict[str, Any]] = None,
+    num_boost_round: int = 500,
+    early_stopping_rounds: int = 20,
+    val_batches: int = 1,
+    nthread: Optional[int] = None,
+    max_bin: int = 256,
+    cache_dir: Optional[str] = None
+) -> xgb.Booster:
+    """
+    Train on data larger than RAM with XGBoost's external-memory mode.
+
+    Batches are read one at a time from .npy files; the last ``val_batches``
+    (the latest in time) form the early-stopping set.
+
+    @param batches: (features path, target path) pairs in time order
+    @param params: Booster parameters overriding DEFAULT_PARAMS
+    @param num_boost_round: Maximum boosting rounds
+    @param early_stopping_rounds: Rounds without improvement before stopping
+    @param val_batches: Trailing batches held out for early stopping
+    @param nthread: Training threads (defaults to XGBOOST_NTHREAD, 0 = all cores)
+    @param max_bin: Histogram bins per feature
+    @param cache_dir: Directory for external-memory cache pages
+    @return: Trained booster, truncated to the best round
+    """
+    if val_batches >= len(batches):
+        raise ValueError("Need at least one training batch besides the validation batches")
+    cut = len(batches) - val_batches
+
+    dtrain = xgb.ExtMemQuantileDMatrix(NpyBatchIter(batches[:cut], cache_dir), max_bin=max_bin)
+    evals = []
+    if val_batches:
+        dval = xgb.ExtMemQuantileDMatrix(NpyBatchIter(batches[cut:], cache_dir), ref=dtrain)
+        evals = [(dval, "validation")]
+
+    booster = xgb.train(
+        _params(params, nthread, max_bin),
+        dtrain,
+        num_boost_round=num_boost_round,
+        evals=evals,
+        early_stopping_rounds=early_stopping_rounds if evals else None,
+        verbose_eval=False
+    )
+    booster = _best_rounds(booster)
+    logger.info(f"XGBoost trained in external memory: {booster.num_boosted_rounds()} rounds")
+    return booster
 
 if __name__ == "__main__":
     # Dummy data
-    X, y = [[0]*5]*10, [0,1]*5
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((10000, 5), dtype=np.float32)
+    y = (X[:, 0] + rng.standard_normal(10000) > 0).astype(np.float32)
     model = train_xgboost(X, y)
-    print(model) 
\ No newline at end of file
+    print(model.num_boosted_rounds())
@@ -0,0 +1,362 @@
+"""
+@file walk_forward.py
+@brief Parallel walk-forward validation
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements walk-forward validation for the model layer. Folds
+are expanding or rolling train windows followed by a test window, cut on
+time so no fold ever trains on data later than its test period. Each
+fold's feature matrix is built once and cached as .npy files, then every
+(fold, model) pair is trained and scored in a process pool that maps the
+cached arrays copy-on-write. Per-fold metrics are consolidated into one
+report.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import hashlib
+import logging
+import os
+import sys
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, brier_score_loss, log_loss, roc_auc_score
+
+logger = logging.getLogger(__name__)
+
+# Row roles within a cached fold
+TRAIN, TEST, PURGED = 0, 1, -1
+
+# Walk-forward name of each ensemble member
+ENSEMBLE_MEMBERS = {"cnn_lstm": "technical", "xgboost": "fundamental"}
+
+
+def make_folds(
+    timestamps: Sequence[Any],
+    n_folds: int,
+    test_periods: Optional[int] = None,
+    train_periods: Optional[int] = None,
+    expanding: bool = True,
+    gap: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Cut walk-forward folds on the distinct timestamps of a dataset.
+
+    The last ``n_folds * test_periods`` periods are split into consecutive
+    test windows. Each fold trains on everything before its test window
+    (expanding) or on the ``train_periods`` periods before it (rolling),
+    leaving ``gap`` periods out so look-ahead targets cannot leak.
+
+    @param timestamps: Row timestamps (any sortable type)
+    @param n_folds: Number of folds
+    @param test_periods: Periods per test window (default: equal split)
+    @param train_periods: Periods per rolling train window
+    @param expanding: Expanding (True) or rolling (False) train windows
+    @param gap: Periods purged between train and test
+    @return: Folds with inclusive train/test start and end timestamps
+    """
+    periods = pd.Index(timestamps).unique().sort_values()
+    test_periods = test_periods or len(periods) // (n_folds + 1)
+    if not expanding and not train_periods:
+        raise ValueError("Rolling folds need train_periods")
+
+    folds = []
+    for fold in range(n_folds):
+        test_start = len(periods) - (n_folds - fold) * test_periods
+        train_end = test_start - gap
+        train_start = 0 if expanding else max(0, train_end - train_periods)
+        if test_start < 0 or train_end <= train_start:
+            raise ValueError(f"Not enough history for {n_folds} folds")
+        folds.append({
+            "fold": fold,
+            "train_start": periods[train_start],
+            "train_end": periods[train_end - 1],
+            "test_start": periods[test_start],
+            "test_end": periods[test_start + test_periods - 1],
+        })
+    return folds
+
+
+class FoldCache:
+    """On-disk cache of per-fold feature matrices shared by all models."""
+
+    def __init__(self, cache_dir: str, dataset_key: str):
+        """
+        @param cache_dir: Directory holding cached folds
+        @param dataset_key: Fingerprint of the source dataset
+        """
+        self.cache_dir = cache_dir
+        self.dataset_key = dataset_key
+
+    def fold_dir(self, fold: Dict[str, Any]) -> str:
+        """
+        @brief Cache directory of a fold
+        @param fold: Fold from make_folds
+        @return: Directory path
+        """
+        key = hashlib.sha1(
+            f"{self.dataset_key}|{fold['train_start']}|{fold['train_end']}|"
+            f"{fold['test_start']}|{fold['test_end']}".encode()
+        ).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"fold_{fold['fold']:03d}_{key}")
+
+    def build(self, fold: Dict[str, Any], data: pd.DataFrame, feature_columns: List[str]) -> str:
+        """
+        Write a fold's arrays unless they are already cached.
+
+        Rows from the train start to the test end are kept, sorted by asset
+        and time so sequence models can window them, with a role per row.
+
+        @param fold: Fold from make_folds
+        @param data: Rows with asset_id, timestamp, target and feature columns
+        @param feature_columns: Feature column names
+        @return: Fold cache directory
+        """
+        path = self.fold_dir(fold)
+        if os.path.exists(os.path.join(path, "role.npy")):
+            return path
+
+        timestamps = data["timestamp"]
+        rows = data[
+            (timestamps >= fold["train_start"]) & (timestamps <= fold["test_end"])
+        ].sort_values(["asset_id", "timestamp"], kind="stable")
+        role = np.full(len(rows), PURGED, dtype=np.int8)
+        role[(rows["timestamp"] <= fold["train_end"]).to_numpy()] = TRAIN
+        role[(rows["timestamp"] >= fold["test_start"]).to_numpy()] = TEST
+
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "features.npy"),
+                np.ascontiguousarray(rows[feature_columns].to_numpy(np.float32)))
+        np.save(os.path.join(path, "target.npy"), rows["target"].to_numpy(np.float32))
+        np.save(os.path.join(path, "asset_id.npy"), rows["asset_id"].to_numpy())
+        # Written last: its presence marks a complete fold
+        np.save(os.path.join(path, "role.npy"), role)
+        return path
+
+
+def load_fold(path: str) -> Dict[str, np.ndarray]:
+    """
+    @brief Map a cached fold copy-on-write, so the cache is never modified
+    @param path: Fold cache directory
+    @return: features, target, asset_id and role arrays
+    """
+    return {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="c")
+        for name in ("features", "target", "asset_id", "role")
+    }
+
+
+def xgboost_fold(fold: Dict[str, np.ndarray], params: Dict[str, Any]) -> np.ndarray:
+    """
+    @brief Train XGBoost on a fold's train rows and score its test rows
+    @param fold: Arrays from load_fold
+    @param params: Keyword arguments for train_xgboost
+    @return: Up-move probabilities for the test rows
+    """
+    from models.tokenomics.train_xgboost import train_xgboost
+
+    train, test = fold["role"] == TRAIN, fold["role"] == TEST
+    # One thread per pool worker unless the caller asks for more
+    params = {"nthread": 1, **params}
+    booster = train_xgboost(fold["features"][train], fold["target"][train], **params)
+    return booster.inplace_predict(fold["features"][test])
+
+
+def cnn_lstm_fold(fold: Dict[str, np.ndarray], params: Dict[str, Any]) -> np.ndarray:
+    """
+    Train the CNN-LSTM on windows ending in the fold's train rows and score
+    windows ending in its test rows. Test rows without a full window of
+    history score NaN.
+
+    @param fold: Arrays from load_fold
+    @param params: window, hidden_size, num_layers and fit() arguments
+    @return: Up-move probabilities for the test rows
+    """
+    import torch
+    from models.technical.train_cnn_lstm import CNNLSTMModel, WindowedDataset, fit
+    from models.technical.infer_cnn_lstm import predict_batch
+
+    # The thread pool may already be sized from the parent's environment
+    torch.set_num_threads(1)
+    params = dict(params)
+    window = params.pop("window", 50)
+    hidden_size = params.pop("hidden_size", 64)
+    num_layers = params.pop("num_layers", 2)
+    val_fraction = params.pop("val_fraction", 0.2)
+
+    asset_id, role = fold["asset_id"], fold["role"]
+    offsets = np.concatenate([[0], np.flatnonzero(asset_id[1:] != asset_id[:-1]) + 1, [len(role)]])
+    dataset = WindowedDataset(fold["features"], fold["target"], window, offsets)
+    train_data, val_data = dataset.subset(
+        dataset.ends[role[dataset.ends] == TRAIN]
+    ).time_split(val_fraction, gap=window)
+
+    model = CNNLSTMModel(fold["features"].shape[1], hidden_size, num_layers)
+    fit(model, train_data, val_data, **params)
+
+    test_rows = np.flatnonzero(role == TEST)
+    test_ends = dataset.ends[role[dataset.ends] == TEST]
+    scores = np.full(len(test_rows), np.nan, dtype=np.float32)
+    if len(test_ends):
+        windows = np.stack([
+            fold["features"][end - window + 1:end + 1] for end in test_ends
+        ])
+        scores[np.searchsorted(test_rows, test_ends)] = predict_batch(model, windows, batch_size=1024)
+    return scores
+
+
+MODEL_TRAINERS: Dict[str, Callable[[Dict[str, np.ndarray], Dict[str, Any]], np.ndarray]] = {
+    "xgboost": xgboost_fold,
+    "cnn_lstm": cnn_lstm_fold,
+}
+
+
+def score_predictions(y_true: np.ndarray, scores: np.ndarray) -> Dict[str, float]:
+    """
+    @brief Classification metrics over rows with a score
+    @param y_true: Binary targets
+    @param scores: Up-move probabilities (NaN where not scored)
+    @return: Row count, accuracy, AUC, log loss and Brier score
+    """
+    scored = ~np.isnan(scores) & ~np.isnan(y_true)
+    y_true, scores = y_true[scored], np.clip(scores[scored], 1e-7, 1 - 1e-7)
+    metrics = {"n": int(scored.sum())}
+    if not len(y_true):
+        return metrics
+    metrics["accuracy"] = float(accuracy_score(y_true, scores > 0.5))
+    metrics["brier"] = float(brier_score_loss(y_true, scores))
+    if len(np.unique(y_true)) == 2:
+        metrics["auc"] = float(roc_auc_score(y_true, scores))
+        metrics["log_loss"] = float(log_loss(y_true, scores))
+    return metrics
+
+
+def _limit_threads() -> None:
+    """
+    Pin each pool worker to one thread so workers do not oversubscribe cores.
+
+    The environment only reaches libraries that initialize after the fork;
+    the fold trainers also pin XGBoost (nthread) and torch explicitly.
+    """
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "XGBOOST_NTHREAD"):
+        os.environ[variable] = "1"
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(1)
+
+
+def _run_fold(fold: Dict[str, Any], path: str, model: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    arrays = load_fold(path)
+    scores = MODEL_TRAINERS[model](arrays, params)
+    return {"fold": fold["fold"], "model": model, "scores": scores}
+
+
+def walk_forward(
+    data: pd.DataFrame,
+    feature_columns: List[str],
+    models: Dict[str, Dict[str, Any]],
+    n_folds: int,
+    cache_dir: str,
+    max_workers: Optional[int] = None,
+    ensemble_weights: Optional[Dict[str, float]] = None,
+    **fold_args: Any
+) -> Dict[str, pd.DataFrame]:
+    """
+    Run walk-forward validation of several models in parallel.
+
+    @param data: Rows with asset_id, timestamp, binary target and features
+    @param feature_columns: Feature column names
+    @param models: Model name (see MODEL_TRAINERS) -> training parameters
+    @param n_folds: Number of folds
+    @param cache_dir: Directory for cached fold matrices
+    @param max_workers: Pool size (defaults to all cores)
+    @param ensemble_weights: Ensemble weight per member role; when given, an
+                             "ensemble" model is scored from member predictions
+    @param fold_args: Extra arguments for make_folds
+    @return: "folds" (metrics per fold and model) and "summary" (mean/std per model)
+    """
+    unknown = set(models) - set(MODEL_TRAINERS)
+    if unknown:
+        raise ValueError(f"Unknown walk-forward models: {sorted(unknown)}")
+
+    folds = make_folds(data["timestamp"], n_folds, **fold_args)
+    dataset_key = str(pd.util.hash_pandas_object(
+        data[["asset_id", "timestamp", "target", *feature_columns]], index=False
+    ).sum())
+    cache = FoldCache(cache_dir, dataset_key)
+    paths = {fold["fold"]: cache.build(fold, data, feature_columns) for fold in folds}
+
+    predictions: Dict[int, Dict[str, np.ndarray]] = {fold["fold"]: {} for fold in folds}
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_limit_threads) as pool:
+        futures = [
+            pool.submit(_run_fold, fold, paths[fold["fold"]], model, params)
+            for fold in folds
+            for model, params in models.items()
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            predictions[result["fold"]][result["model"]] = result["scores"]
+            logger.info(f"Walk-forward fold {result['fold']} {result['model']} done")
+
+    rows = []
+    for fold in folds:
+        arrays = load_fold(paths[fold["fold"]])
+        y_test = np.asarray(arrays["target"][arrays["role"] == TEST])
+        scores = predictions[fold["fold"]]
+        if ensemble_weights:
+            scores["ensemble"] = combine_members(scores, ensemble_weights)
+        for model, model_scores in scores.items():
+            rows.append({
+                "fold": fold["fold"],
+                "model": model,
+                "test_start": fold["test_start"],
+                "test_end": fold["test_end"],
+                **score_predictions(y_test, model_scores),
+            })
+
+    report = pd.DataFrame(rows).sort_values(["model", "fold"], ignore_index=True)
+    metrics = [c for c in ("accuracy", "auc", "log_loss", "brier") if c in report]
+    summary = report.groupby("model")[metrics].agg(["mean", "std"])
+    return {"folds": report, "summary": summary}
+
+
+def combine_members(scores: Dict[str, np.ndarray], weights: Dict[str, float]) -> np.ndarray:
+    """
+    Combine member scores per row with the serving ensemble, renormalizing
+    over the members that scored the row.
+
+    @param scores: Walk-forward model name -> scores
+    @param weights: Ensemble weight per member role (e.g. EnsembleModel.weights)
+    @return: Ensemble scores (NaN where no member scored)
+    """
+    from models.ensemble.ensemble_model import EnsembleModel
+
+    members = [m for m in scores if ENSEMBLE_MEMBERS.get(m) in weights]
+    if not members:
+        raise ValueError("No ensemble members among the walk-forward models")
+    ensemble = EnsembleModel({ENSEMBLE_MEMBERS[m]: weights[ENSEMBLE_MEMBERS[m]] for m in members})
+    matrix = np.stack([scores[m] for m in members], axis=1)
+    mask = ~np.isnan(matrix)
+    return np.where(mask.any(axis=1), ensemble.combine(matrix, mask)["score"], np.nan)
+
+if __name__ == "__main__":
+    from models.ensemble.ensemble_model import EnsembleModel
+
+    # Dummy data: 4 assets x 400 days of random features
+    rng = np.random.default_rng(0)
+    n_days, n_assets = 400, 4
+    data = pd.DataFrame({
+        "asset_id": np.repeat(np.arange(n_assets), n_days),
+        "timestamp": np.tile(pd.date_range("2023-01-01", periods=n_days), n_assets),
+        **{f"f{i}": rng.standard_normal(n_days * n_assets) for i in range(5)},
+    })
+    data["target"] = (data["f0"] + rng.standard_normal(len(data)) > 0).astype(float)
+    report = walk_forward(
+        data, [f"f{i}" for i in range(5)],
+        {"xgboost": {}, "cnn_lstm": {"window": 20, "epochs": 2}},
+        n_folds=5, cache_dir="walk_forward_cache",
+        ensemble_weights=EnsembleModel().weights
+    )
+    print(report["summary"])
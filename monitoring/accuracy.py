@@ -0,0 +1,273 @@
+"""
+@file accuracy.py
+@brief Online accuracy tracking of logged model predictions
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements online accuracy tracking for the Crypto
+Investment Analysis System. A background job periodically reads the
+predictions in ``model_predictions`` whose outcome has been realized
+since its watermark, labels them with the realized return over each
+horizon from ``ohlcv`` (as-of joins on the bar timestamps), and updates
+rolling accuracy, Brier score and information coefficient per model and
+ticker. Only rows past the watermark are read on each run, and the
+rolling windows are bounded, so the cost does not grow with history.
+"""
+
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import logging
+import os
+import numpy as np
+import pandas as pd
+from prometheus_client import Gauge
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MODEL_ACCURACY = Gauge(
+    'model_accuracy',
+    'Model accuracy score',
+    ['model', 'ticker', 'horizon', 'metric']
+)
+
+# Ticker label of the rolling scores pooled over all tickers
+ALL_TICKERS = "all"
+
+
+def horizon_label(horizon: timedelta) -> str:
+    """
+    @brief Short label for a horizon ("1d", "4h")
+    @param horizon: Outcome horizon
+    @return: Label
+    """
+    if horizon % timedelta(days=1) == timedelta(0):
+        return f"{horizon.days}d"
+    return f"{int(horizon.total_seconds() // 3600)}h"
+
+
+class RollingScores:
+    """Bounded window of predictions and their realized outcomes."""
+
+    def __init__(self, window: int = 500):
+        """
+        @param window: Number of most recent outcomes kept
+        """
+        self.predictions = deque(maxlen=window)
+        self.returns = deque(maxlen=window)
+
+    def extend(self, predictions: Iterable[float], returns: Iterable[float]) -> None:
+        """
+        @brief Add realized outcomes, oldest first
+        @param predictions: Predicted up-move probabilities
+        @param returns: Realized returns over the horizon
+        """
+        self.predictions.extend(predictions)
+        self.returns.extend(returns)
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        @brief Scores over the window
+        @return: Directional accuracy, Brier score, rank IC and sample count
+        """
+        p = np.fromiter(self.predictions, dtype=np.float64)
+        r = np.fromiter(self.returns, dtype=np.float64)
+        if not len(p):
+            return {"n": 0.0}
+        up = (r > 0).astype(np.float64)
+        metrics = {
+            "accuracy": float(np.mean((p > 0.5) == (up > 0.5))),
+            "brier": float(np.mean((p - up) ** 2)),
+            "n": float(len(p)),
+        }
+        if len(p) > 2 and np.ptp(p) > 0 and np.ptp(r) > 0:
+            ranks_p = pd.Series(p).rank().to_numpy()
+            ranks_r = pd.Series(r).rank().to_numpy()
+            metrics["ic"] = float(np.corrcoef(ranks_p, ranks_r)[0, 1])
+        return metrics
+
+
+def realized_outcomes(
+    session: Any,
+    horizon: timedelta,
+    since: Optional[datetime],
+    until: datetime
+) -> pd.DataFrame:
+    """
+    Logged predictions in (since, until] with their realized return.
+
+    The return is from the close at the prediction to the close one
+    ``horizon`` later (see api.db.prices); predictions without both
+    closes are dropped rather than scored.
+
+    @param session: SQLAlchemy session
+    @param horizon: Outcome horizon
+    @param since: Exclusive lower bound on created_at (None for no bound)
+    @param until: Inclusive upper bound on created_at
+    @return: asset_id, model_name, prediction, created_at and realized_return
+             ordered by created_at
+    """
+    from sqlalchemy import select
+    from api.db.timescaledb import ModelPrediction
+    from api.db.prices import attach_outcome_closes
+
+    columns = ["asset_id", "model_name", "prediction", "created_at"]
+    query = select(
+        ModelPrediction.asset_id,
+        ModelPrediction.model_name,
+        ModelPrediction.prediction,
+        ModelPrediction.created_at
+    ).where(ModelPrediction.created_at <= until)
+    if since is not None:
+        query = query.where(ModelPrediction.created_at > since)
+    logged = pd.DataFrame(session.execute(query).all(), columns=columns)
+    if logged.empty:
+        return logged.assign(realized_return=pd.Series(dtype=np.float64))
+
+    logged = attach_outcome_closes(session, logged, horizon)
+    logged["realized_return"] = logged["close_after"] / logged["close_then"] - 1.0
+    return logged[columns + ["realized_return"]]
+
+
+class AccuracyTracker:
+    """Incremental accuracy, Brier and IC per model, ticker and horizon."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Any]] = None,
+        horizons: Iterable[timedelta] = (timedelta(days=1),),
+        window: int = 500,
+        initial_lookback: timedelta = timedelta(days=30)
+    ):
+        """
+        @param session_factory: Callable returning a new SQLAlchemy session
+                                (defaults to SessionLocal)
+        @param horizons: Outcome horizons to score
+        @param window: Outcomes kept per model and ticker
+        @param initial_lookback: History read on the first run, before any
+                                 watermark exists
+        """
+        if session_factory is None:
+            from api.db.timescaledb import SessionLocal
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+        self.horizons = tuple(horizons)
+        self.window = window
+        self.initial_lookback = initial_lookback
+        self.watermarks: Dict[timedelta, Optional[datetime]] = {h: None for h in self.horizons}
+        self.scores: Dict[Tuple[str, str, str], RollingScores] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _rolling(self, model: str, ticker: str, horizon: str) -> RollingScores:
+        key = (model, ticker, horizon)
+        if key not in self.scores:
+            self.scores[key] = RollingScores(self.window)
+        return self.scores[key]
+
+    def update(self) -> Dict[str, int]:
+        """
+        Score predictions realized since each horizon's watermark.
+
+        @return: Horizon label -> number of predictions scored
+        """
+        from api.db.prices import outcome_watermark
+
+        processed = {}
+        with self.session_factory() as session:
+            for horizon in self.horizons:
+                # Waits for live assets whose bars lag behind the others
+                until = outcome_watermark(session, horizon)
+                if until is None:
+                    return processed
+                label = horizon_label(horizon)
+                since = self.watermarks[horizon]
+                if since is None:
+                    since = until - self.initial_lookback
+                if until <= since:
+                    processed[label] = 0
+                    continue
+                outcomes = realized_outcomes(session, horizon, since, until)
+                for (model, ticker), rows in outcomes.groupby(["model_name", "asset_id"], sort=False):
+                    self._rolling(model, ticker, label).extend(rows["prediction"], rows["realized_return"])
+                for model, rows in outcomes.groupby("model_name", sort=False):
+                    self._rolling(model, ALL_TICKERS, label).extend(rows["prediction"], rows["realized_return"])
+                # Predictions up to ``until`` are final; those of assets no
+                # longer priced were dropped
+                self.watermarks[horizon] = until
+                processed[label] = len(outcomes)
+
+        self.export()
+        return processed
+
+    def metrics(self) -> Dict[Tuple[str, str, str], Dict[str, float]]:
+        """
+        @brief Current rolling scores
+        @return: (model, ticker, horizon) -> metrics
+        """
+        return {key: rolling.metrics() for key, rolling in self.scores.items()}
+
+    def export(self) -> None:
+        """Set the MODEL_ACCURACY gauges from the rolling scores."""
+        for (model, ticker, horizon), metrics in self.metrics().items():
+            for metric in ("accuracy", "brier", "ic"):
+                if metric in metrics:
+                    MODEL_ACCURACY.labels(
+                        model=model, ticker=ticker, horizon=horizon, metric=metric
+                    ).set(metrics[metric])
+
+    async def start(self, interval: float = 300.0) -> None:
+        """
+        @brief Run update() every ``interval`` seconds in an executor
+        @param interval: Seconds between updates
+        """
+        if self._task is not None and not self._task.done():
+            return
+
+        async def run() -> None:
+            loop = asyncio.get_running_loop()
+            while True:
+                try:
+                    processed = await loop.run_in_executor(None, self.update)
+                    logger.info(f"Accuracy tracker scored {processed}")
+                except Exception as e:
+                    logger.error(f"Accuracy update failed: {str(e)}")
+                await asyncio.sleep(interval)
+
+        self._task = asyncio.get_running_loop().create_task(run())
+        logger.info("Accuracy tracker started")
+
+    async def stop(self) -> None:
+        """Stop the update job."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+_accuracy_tracker: Optional[AccuracyTracker] = None
+
+
+def get_accuracy_tracker() -> AccuracyTracker:
+    """
+    @brief Process-wide accuracy tracker configured from the environment
+    @return: Shared AccuracyTracker instance
+    """
+    global _accuracy_tracker
+    if _accuracy_tracker is None:
+        _accuracy_tracker = AccuracyTracker(
+            horizons=[
+                timedelta(hours=float(h))
+                for h in os.getenv("ACCURACY_HORIZON_HOURS", "24").split(",")
+            ],
+            window=int(os.getenv("ACCURACY_WINDOW", "500")),
+            initial_lookback=timedelta(days=float(os.getenv("ACCURACY_LOOKBACK_DAYS", "30")))
+        )
+    return _accuracy_tracker
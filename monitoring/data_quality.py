@@ -0,0 +1,220 @@
+"""
+@file data_quality.py
+@brief Vectorized data-quality checks for model features
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements the feature data-quality checks of the Crypto
+Investment Analysis System. A schema of expected features with their
+valid ranges and a staleness limit per feature group is compiled once
+into column-aligned arrays, so checking a prediction's features (or a
+whole batch of rows) is a handful of numpy comparisons: missing
+features, NaN/inf values, out-of-range values, stale groups and
+unexpected features.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+import logging
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+INF = float("inf")
+
+# Expected features per group with their valid (min, max) range
+DEFAULT_SCHEMA: Dict[str, Dict[str, Tuple[float, float]]] = {
+    "technical": {
+        "ma_50": (0.0, INF),
+        "ma_200": (0.0, INF),
+        "ma_crossover": (0.0, 1.0),
+        "rsi_14": (0.0, 100.0),
+        "macd_hist": (-INF, INF),
+        "bb_width": (0.0, INF),
+        "obv": (-INF, INF),
+    },
+    "sentiment": {
+        "finbert_polarity": (-1.0, 1.0),
+        "sentiment_volatility": (0.0, INF),
+        "news_freq": (0.0, INF),
+        "social_mentions": (0.0, INF),
+        "yt_growth": (-INF, INF),
+        "yt_mentions": (0.0, INF),
+    },
+    "tokenomics": {
+        "tvl_ratio": (0.0, INF),
+        "weekly_active_wallets": (0.0, INF),
+        "dev_commit_activity": (0.0, INF),
+        "wallet_concentration": (0.0, 1.0),
+        "unlock_volume": (0.0, INF),
+        "fdv_ratio": (0.0, INF),
+        "avg_daily_volume": (0.0, INF),
+    },
+    "onchain": {
+        "transaction_volume": (0.0, INF),
+        "active_addresses": (0.0, INF),
+        "network_hashrate": (0.0, INF),
+        "gas_price": (0.0, INF),
+        "network_utilization": (0.0, 1.0),
+    },
+}
+
+# Oldest acceptable last bar per group, relative to the prediction time
+DEFAULT_MAX_AGE = {
+    "technical": timedelta(days=2),
+    "sentiment": timedelta(days=2),
+    "tokenomics": timedelta(days=8),
+    "onchain": timedelta(days=2),
+}
+
+
+class QualityRuleSet:
+    """Feature schema compiled into column-aligned rule arrays."""
+
+    def __init__(
+        self,
+        schema: Optional[Dict[str, Dict[str, Tuple[float, float]]]] = None,
+        max_age: Optional[Dict[str, timedelta]] = None
+    ):
+        """
+        @param schema: Group -> feature -> (min, max) (defaults to DEFAULT_SCHEMA)
+        @param max_age: Group -> maximum age of its last bar (defaults to DEFAULT_MAX_AGE)
+        """
+        schema = schema or DEFAULT_SCHEMA
+        self.max_age = dict(max_age or DEFAULT_MAX_AGE)
+        self.columns = [(group, name) for group, fields in schema.items() for name in fields]
+        self.index = {column: i for i, column in enumerate(self.columns)}
+        self.lower = np.array([schema[g][n][0] for g, n in self.columns])
+        self.upper = np.array([schema[g][n][1] for g, n in self.columns])
+        self.groups = list(schema)
+        self._group_of = np.array([self.groups.index(g) for g, _ in self.columns])
+
+    def to_array(self, features: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        Align one prediction's features with the schema columns.
+
+        @param features: Feature groups as returned by FeatureService
+        @return: (columns,) values (NaN where absent), (columns,) presence
+                 mask and the names of features not in the schema
+        """
+        values = np.full(len(self.columns), np.nan)
+        present = np.zeros(len(self.columns), dtype=bool)
+        unexpected = []
+        for group, fields in features.items():
+            if not isinstance(fields, dict):
+                continue
+            for name, value in fields.items():
+                i = self.index.get((group, name))
+                if i is None:
+                    if name != "as_of":
+                        unexpected.append(f"{group}.{name}")
+                    continue
+                present[i] = True
+                if value is not None:
+                    try:
+                        values[i] = float(value)
+                    except (TypeError, ValueError):
+                        pass
+        return values, present, unexpected
+
+    def check_array(
+        self,
+        values: np.ndarray,
+        present: Optional[np.ndarray] = None,
+        groups: Optional[Sequence[str]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Apply the value rules to a batch of rows.
+
+        @param values: (rows x columns) feature values in ``self.columns`` order
+        @param present: (rows x columns) True where the feature was supplied
+                        (defaults to all)
+        @param groups: Feature groups that were requested; missing columns of
+                       other groups are not reported (defaults to all)
+        @return: (rows x columns) boolean masks "missing", "non_finite" and
+                 "out_of_range"
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        present = np.ones(values.shape, dtype=bool) if present is None else np.atleast_2d(present)
+        expected = np.ones(len(self.columns), dtype=bool) if groups is None else \
+            np.isin(self._group_of, [self.groups.index(g) for g in groups if g in self.groups])
+        finite = np.isfinite(values)
+        with np.errstate(invalid="ignore"):
+            in_range = (values >= self.lower) & (values <= self.upper)
+        return {
+            "missing": expected & ~present,
+            "non_finite": present & ~finite,
+            "out_of_range": present & finite & ~in_range,
+        }
+
+    def check(self, features: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Check one prediction's features.
+
+        @param features: Feature groups as returned by FeatureService
+        @param now: Reference time for staleness (defaults to the features'
+                    timestamp, then the current time)
+        @return: Counts and rates per check and the failing feature names
+        """
+        groups = [g for g in features if isinstance(features[g], dict)]
+        values, present, unexpected = self.to_array(features)
+        masks = self.check_array(values, present, groups)
+
+        now = now or features.get("timestamp") or datetime.now()
+        stale = [
+            group for group in groups
+            if isinstance(features[group].get("as_of"), datetime)
+            and group in self.max_age
+            and now - features[group]["as_of"] > self.max_age[group]
+        ]
+
+        n_expected = max(int(masks["missing"].sum() + present.sum()), 1)
+        result: Dict[str, Any] = {"n_features": int(present.sum())}
+        for check, mask in masks.items():
+            failing = np.flatnonzero(mask[0])
+            result[f"{check}_rate"] = float(len(failing) / n_expected)
+            result[check] = [f"{self.columns[i][0]}.{self.columns[i][1]}" for i in failing]
+        result["stale_groups"] = stale
+        result["unexpected"] = unexpected
+        return result
+
+
+_default_rules: Optional[QualityRuleSet] = None
+
+
+def get_quality_rules() -> QualityRuleSet:
+    """
+    @brief Shared rule set compiled from the default schema
+    @return: QualityRuleSet instance
+    """
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = QualityRuleSet()
+    return _default_rules
+
+
+def check_data_quality(features: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    @brief Run all data-quality checks on one prediction's features
+    @param features: Feature groups as returned by FeatureService
+    @return: Quality metrics (see QualityRuleSet.check)
+    """
+    return get_quality_rules().check(features)
+
+
+def validate_features(features: Dict[str, Any]) -> List[str]:
+    """
+    @brief Human-readable data-quality issues
+    @param features: Feature groups as returned by FeatureService
+    @return: One message per issue (empty when the features pass)
+    """
+    result = check_data_quality(features)
+    issues = [f"{name}: missing" for name in result["missing"]]
+    issues += [f"{name}: not finite" for name in result["non_finite"]]
+    issues += [f"{name}: out of range" for name in result["out_of_range"]]
+    issues += [f"{group}: stale" for group in result["stale_groups"]]
+    issues += [f"{name}: unexpected feature" for name in result["unexpected"]]
+    return issues
@@ -0,0 +1,273 @@
+"""
+@file drift.py
+@brief Streaming feature drift detection
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements feature drift monitoring with bounded memory. Each
+numeric feature has a reference distribution stored as a fixed-size
+histogram over reference quantile bins, and a live histogram over the
+same bins that every prediction updates in O(log bins). Live counts decay
+exponentially, so they describe a recent window without storing it. PSI
+and binned KS scores are computed on a timer, never per request, and
+exported to the FEATURE_DRIFT gauge.
+
+Without a saved reference, the first ``reference_size`` values seen for
+each feature become its reference.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+import asyncio
+import json
+import logging
+import math
+import os
+import threading
+import numpy as np
+from prometheus_client import Gauge
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+FEATURE_DRIFT = Gauge(
+    'feature_drift_score',
+    'Feature drift detection score',
+    ['feature', 'metric']
+)
+
+# Floor for bin proportions so PSI stays finite for empty bins
+PSI_EPSILON = 1e-4
+
+
+def flatten_features(features: Dict[str, Any]) -> Dict[str, float]:
+    """
+    @brief Numeric scalar features keyed "group.name"
+    @param features: Feature groups as returned by FeatureService
+    @return: Flat feature values (NaN for missing numeric values)
+    """
+    flat = {}
+    for group, values in features.items():
+        if not isinstance(values, dict):
+            continue
+        for name, value in values.items():
+            if value is None:
+                flat[f"{group}.{name}"] = math.nan
+            elif isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+                flat[f"{group}.{name}"] = float(value)
+    return flat
+
+
+class FeatureHistogram:
+    """Reference and decayed live histograms of one feature over fixed bins."""
+
+    def __init__(self, edges: np.ndarray, reference: np.ndarray):
+        """
+        @param edges: Interior bin edges (bins = len(edges) + 1, open-ended tails)
+        @param reference: Reference count per bin
+        """
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.reference = np.asarray(reference, dtype=np.float64)
+        self.live = np.zeros(len(self.edges) + 1)
+        self.missing = 0.0
+
+    @classmethod
+    def from_values(cls, values: Iterable[float], n_bins: int = 10) -> "FeatureHistogram":
+        """
+        @brief Reference histogram over quantile bins of the given values
+        @param values: Reference sample
+        @param n_bins: Target number of bins (fewer if values repeat)
+        @return: Histogram
+        """
+        values = np.asarray(list(values), dtype=np.float64)
+        values = values[np.isfinite(values)]
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]))
+        counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+        return cls(edges, counts)
+
+    def add(self, value: float) -> None:
+        """
+        @brief Count one live value
+        @param value: Feature value (NaN/inf counted as missing)
+        """
+        if math.isfinite(value):
+            self.live[np.searchsorted(self.edges, value, side="right")] += 1
+        else:
+            self.missing += 1
+
+    def decay(self, factor: float) -> None:
+        """
+        @brief Age the live window
+        @param factor: Multiplier in (0, 1]
+        """
+        self.live *= factor
+        self.missing *= factor
+
+    def scores(self) -> Dict[str, float]:
+        """
+        @brief Drift of the live window against the reference
+        @return: PSI, binned KS statistic, missing rate and live count
+        """
+        n = self.live.sum()
+        p = np.maximum(self.reference / self.reference.sum(), PSI_EPSILON)
+        q = np.maximum(self.live / max(n, 1e-12), PSI_EPSILON)
+        return {
+            "psi": float(np.sum((q - p) * np.log(q / p))),
+            "ks": float(np.abs(np.cumsum(self.live) / max(n, 1e-12)
+                               - np.cumsum(self.reference) / self.reference.sum()).max()),
+            "missing_rate": float(self.missing / max(n + self.missing, 1e-12)),
+            "n": float(n),
+        }
+
+    def to_dict(self) -> Dict[str, List[float]]:
+        return {"edges": self.edges.tolist(), "reference": self.reference.tolist()}
+
+
+class DriftDetector:
+    """Per-feature streaming drift detector evaluated on a timer."""
+
+    def __init__(
+        self,
+        n_bins: int = 10,
+        reference_size: int = 1000,
+        half_life: float = 6 * 3600.0,
+        min_samples: int = 50
+    ):
+        """
+        @param n_bins: Histogram bins per feature
+        @param reference_size: Values collected per feature to build a
+                               reference when none was loaded
+        @param half_life: Seconds for live counts to decay by half
+        @param min_samples: Live count below which a feature is not scored
+        """
+        self.n_bins = n_bins
+        self.reference_size = reference_size
+        self.half_life = half_life
+        self.min_samples = min_samples
+        self.histograms: Dict[str, FeatureHistogram] = {}
+        self.latest: Dict[str, Dict[str, float]] = {}
+        self._warmup: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def fit_reference(self, reference: Dict[str, Iterable[float]]) -> None:
+        """
+        @brief Set reference distributions from historical values
+        @param reference: Feature name -> reference values (e.g. DataFrame columns)
+        """
+        with self._lock:
+            for name, values in reference.items():
+                self.histograms[name] = FeatureHistogram.from_values(values, self.n_bins)
+                self._warmup.pop(name, None)
+
+    def observe(self, features: Dict[str, Any]) -> None:
+        """
+        Add one prediction's features to the live window.
+
+        @param features: Feature groups as returned by FeatureService
+        """
+        with self._lock:
+            for name, value in flatten_features(features).items():
+                histogram = self.histograms.get(name)
+                if histogram is not None:
+                    histogram.add(value)
+                elif math.isfinite(value):
+                    sample = self._warmup.setdefault(name, [])
+                    sample.append(value)
+                    if len(sample) >= self.reference_size:
+                        self.histograms[name] = FeatureHistogram.from_values(sample, self.n_bins)
+                        del self._warmup[name]
+
+    def evaluate(self, elapsed: float = 0.0) -> Dict[str, Dict[str, float]]:
+        """
+        Score every feature, export the gauges and age the live window.
+
+        @param elapsed: Seconds since the previous evaluation (for decay)
+        @return: Feature name -> drift scores
+        """
+        factor = 0.5 ** (elapsed / self.half_life) if self.half_life else 1.0
+        scores = {}
+        with self._lock:
+            for name, histogram in self.histograms.items():
+                if histogram.live.sum() >= self.min_samples:
+                    scores[name] = histogram.scores()
+                histogram.decay(factor)
+        for name, values in scores.items():
+            FEATURE_DRIFT.labels(feature=name, metric="psi").set(values["psi"])
+            FEATURE_DRIFT.labels(feature=name, metric="ks").set(values["ks"])
+        self.latest = scores
+        return scores
+
+    async def start(self, interval: float = 60.0) -> None:
+        """
+        @brief Evaluate drift every ``interval`` seconds on the running loop
+        @param interval: Seconds between evaluations
+        """
+        if self._task is not None and not self._task.done():
+            return
+
+        async def run() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    self.evaluate(interval)
+                except Exception as e:
+                    logger.error(f"Drift evaluation failed: {str(e)}")
+
+        self._task = asyncio.get_running_loop().create_task(run())
+        logger.info("Drift detector started")
+
+    async def stop(self) -> None:
+        """Stop the evaluation timer."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def save_reference(self, path: str) -> None:
+        """
+        @brief Persist reference histograms as JSON
+        @param path: Output path
+        """
+        with self._lock:
+            data = {name: h.to_dict() for name, h in self.histograms.items()}
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    def load_reference(self, path: str) -> None:
+        """
+        @brief Load reference histograms saved by save_reference
+        @param path: Input path
+        """
+        with open(path) as f:
+            data = json.load(f)
+        with self._lock:
+            for name, h in data.items():
+                self.histograms[name] = FeatureHistogram(h["edges"], h["reference"])
+                self._warmup.pop(name, None)
+
+
+_drift_detector: Optional[DriftDetector] = None
+
+
+def get_drift_detector() -> DriftDetector:
+    """
+    @brief Process-wide drift detector configured from the environment
+    @return: Shared DriftDetector instance
+    """
+    global _drift_detector
+    if _drift_detector is None:
+        _drift_detector = DriftDetector(
+            n_bins=int(os.getenv("DRIFT_BINS", "10")),
+            reference_size=int(os.getenv("DRIFT_REFERENCE_SIZE", "1000")),
+            half_life=float(os.getenv("DRIFT_HALF_LIFE", str(6 * 3600)))
+        )
+        reference_path = os.getenv("DRIFT_REFERENCE_PATH")
+        if reference_path and os.path.exists(reference_path):
+            _drift_detector.load_reference(reference_path)
+    return _drift_detector
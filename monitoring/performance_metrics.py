@@ -0,0 +1,118 @@
+"""
+@file performance_metrics.py
+@brief Model performance metrics and threshold alerts
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements the metric and alerting helpers used by the
+monitoring service: classification metrics for directional predictions
+and threshold checks that turn quality, drift and performance metrics
+into alerts.
+"""
+
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import logging
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Metric name -> (threshold, direction, severity); "max" alerts above the
+# threshold and "min" below it
+DEFAULT_THRESHOLDS = {
+    "missing_rate": (0.2, "max", "warning"),
+    "non_finite_rate": (0.0, "max", "critical"),
+    "out_of_range_rate": (0.05, "max", "warning"),
+    "psi": (0.25, "max", "warning"),
+    "ks": (0.2, "max", "warning"),
+    "accuracy": (0.5, "min", "warning"),
+    "brier": (0.25, "max", "warning"),
+}
+
+
+def calculate_metrics(
+    y_true: np.ndarray,
+    y_score: np.ndarray,
+    threshold: float = 0.5
+) -> Dict[str, float]:
+    """
+    @brief Metrics of up-move probabilities against realized directions
+    @param y_true: Binary realized direction
+    @param y_score: Predicted up-move probability
+    @param threshold: Probability above which a prediction counts as "up"
+    @return: Accuracy, precision, recall, F1 and Brier score
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_score = np.asarray(y_score, dtype=np.float64)
+    if not len(y_true):
+        return {}
+    y_pred = y_score > threshold
+    positive = y_true > 0.5
+    tp = float(np.sum(y_pred & positive))
+    precision = tp / max(float(y_pred.sum()), 1.0)
+    recall = tp / max(float(positive.sum()), 1.0)
+    return {
+        "accuracy": float(np.mean(y_pred == positive)),
+        "precision": precision,
+        "recall": recall,
+        "f1_score": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        "brier": float(np.mean((y_score - y_true) ** 2)),
+    }
+
+
+def generate_alert(
+    metric: str,
+    value: float,
+    threshold: float,
+    severity: str = "warning"
+) -> Dict[str, Any]:
+    """
+    @brief Alert record for a metric crossing its threshold
+    @param metric: Metric name (prefixed with its feature or model, if any)
+    @param value: Observed value
+    @param threshold: Threshold that was crossed
+    @param severity: "warning" or "critical"
+    @return: Alert dict
+    """
+    return {
+        "metric": metric,
+        "value": value,
+        "threshold": threshold,
+        "severity": severity,
+        "timestamp": datetime.now(),
+    }
+
+
+def check_thresholds(
+    metrics: Dict[str, Any],
+    thresholds: Optional[Dict[str, Any]] = None,
+    prefix: str = ""
+) -> List[Dict[str, Any]]:
+    """
+    Alerts for every metric crossing its threshold.
+
+    Nested dicts (e.g. drift scores per feature) are checked recursively
+    with the key as a prefix of the metric name. Metrics without a
+    threshold are ignored.
+
+    @param metrics: Metric name -> value or nested metrics
+    @param thresholds: Metric name -> (threshold, "max"|"min", severity)
+                       (defaults to DEFAULT_THRESHOLDS)
+    @param prefix: Prefix for reported metric names
+    @return: List of alerts
+    """
+    thresholds = thresholds or DEFAULT_THRESHOLDS
+    alerts = []
+    for name, value in metrics.items():
+        if isinstance(value, dict):
+            alerts.extend(check_thresholds(value, thresholds, f"{prefix}{name}."))
+            continue
+        if name not in thresholds or not isinstance(value, (int, float)):
+            continue
+        threshold, direction, severity = thresholds[name]
+        if (value > threshold) if direction == "max" else (value < threshold):
+            alerts.append(generate_alert(f"{prefix}{name}", float(value), threshold, severity))
+    return alerts
@@ -1,13 +1,16 @@
-# Placeholder: Prometheus metrics exporter
-from prometheus_client import start_http_server, Gauge
+# Prometheus metrics exporter for processes without an HTTP API
+# (training, retraining and batch jobs). The API serves its own /metrics.
+from prometheus_client import start_http_server
+import os
 import time
 
-def start_exporter() -> None:
-    g = Gauge('model_latency_seconds', 'Model prediction latency')
-    start_http_server(8001)
-    while True:
-        g.set(0.1)  # Dummy value
-        time.sleep(5)
+def start_exporter(port: int = None) -> None:
+    """
+    Expose this process's metrics registry on a background HTTP server.
+    """
+    start_http_server(port or int(os.getenv("METRICS_PORT", "8001")))
 
 if __name__ == "__main__":
-    start_exporter() 
\ No newline at end of file
+    start_exporter()
+    while True:
+        time.sleep(3600)
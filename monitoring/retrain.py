@@ -1,6 +1,584 @@
-# Placeholder: Retrain models on new data
-def retrain_all() -> None:
-    print("Retraining all models...")
+"""
+@file retrain.py
+@brief Drift- and accuracy-triggered retraining scheduler
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module implements incremental retraining for the Crypto Investment
+Analysis System. On each cycle the scheduler reads the drift scores of
+each model's feature group and the model's rolling accuracy, and
+retrains only the models that drifted or degraded. Jobs run in a
+resource-limited process pool and warm-start from the serving checkpoint:
+XGBoost continues boosting and the CNN-LSTM is fine-tuned on recent
+windows. A candidate must not be worse than the current model on the
+latest held-out data; accepted candidates replace the checkpoint on disk
+and are swapped into the serving registry.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime, timedelta
+import asyncio
+import copy
+import logging
+import math
+import multiprocessing
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Serving slot -> trainer and the feature group it is trained on. Slot
+# names match the model_name of logged predictions and registry slots.
+RETRAIN_TARGETS = {
+    "fundamental": {"trainer": "xgboost", "group": "tokenomics"},
+    "technical": {"trainer": "cnn_lstm", "group": "technical"},
+}
+
+
+class RetrainPolicy:
+    """Decides which models need retraining from drift and accuracy."""
+
+    def __init__(
+        self,
+        psi_threshold: float = 0.25,
+        accuracy_floor: float = 0.5,
+        brier_ceiling: float = 0.25,
+        min_outcomes: int = 100,
+        min_interval: timedelta = timedelta(hours=6)
+    ):
+        """
+        @param psi_threshold: PSI above which a feature counts as drifted
+        @param accuracy_floor: Rolling accuracy below which a model is retrained
+        @param brier_ceiling: Rolling Brier score above which a model is retrained
+        @param min_outcomes: Realized outcomes needed before accuracy is trusted
+        @param min_interval: Minimum time between retrains of one model
+        """
+        self.psi_threshold = psi_threshold
+        self.accuracy_floor = accuracy_floor
+        self.brier_ceiling = brier_ceiling
+        self.min_outcomes = min_outcomes
+        self.min_interval = min_interval
+
+    def reasons(
+        self,
+        slot: str,
+        group: str,
+        drift: Dict[str, Dict[str, float]],
+        accuracy: Dict[Any, Dict[str, float]],
+        last_retrained: Optional[datetime] = None,
+        now: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Why a model should be retrained.
+
+        @param slot: Serving slot / logged model name
+        @param group: Feature group the model consumes
+        @param drift: Feature name ("group.name") -> drift scores
+        @param accuracy: (model, ticker, horizon) -> rolling metrics
+        @param last_retrained: When the model was last retrained
+        @param now: Current time
+        @return: Reasons (empty when no retrain is needed)
+        """
+        now = now or datetime.now()
+        if last_retrained is not None and now - last_retrained < self.min_interval:
+            return []
+
+        reasons = [
+            f"drift {name} psi={scores['psi']:.3f}"
+            for name, scores in drift.items()
+            if name.startswith(f"{group}.") and scores.get("psi", 0.0) > self.psi_threshold
+        ]
+        for (model, ticker, horizon), metrics in accuracy.items():
+            if model != slot or ticker != "all" or metrics.get("n", 0) < self.min_outcomes:
+                continue
+            if metrics.get("accuracy", 1.0) < self.accuracy_floor:
+                reasons.append(f"accuracy {horizon}={metrics['accuracy']:.3f}")
+            if metrics.get("brier", 0.0) > self.brier_ceiling:
+                reasons.append(f"brier {horizon}={metrics['brier']:.3f}")
+        return reasons
+
+
+def feature_schema(group: str) -> List[str]:
+    """
+    @brief Ordered feature columns of a group, as exported for training
+    @param group: Feature group (see FEATURE_GROUPS)
+    @return: Column names
+    """
+    from api.services.feature_store import FEATURE_GROUPS, _feature_columns
+
+    return _feature_columns(FEATURE_GROUPS[group].__table__)
+
+
+def export_training_data(
+    group: str,
+    out_dir: str,
+    since: datetime,
+    session_factory: Optional[Callable[[], Any]] = None
+) -> Dict[str, str]:
+    """
+    Write recent labelled feature rows for one group as .npy files.
+
+    Rows are the ``ohlcv`` bars since ``since``, grouped by asset in time
+    order, with the group's features as of each bar (point-in-time join)
+    and the next bar's direction as the label (NaN on each asset's last bar).
+
+    @param group: Feature group (see FEATURE_GROUPS)
+    @param out_dir: Output directory
+    @param since: First bar timestamp
+    @param session_factory: Callable returning a new SQLAlchemy session
+    @return: Paths of "features", "targets", "timestamps" and "offsets"
+    """
+    from api.db.timescaledb import SessionLocal
+    from api.db.prices import read_closes
+    from api.services.feature_store import FeatureStore
+
+    session_factory = session_factory or SessionLocal
+    with session_factory() as session:
+        bars = read_closes(session, start=since)
+    bars["target"] = (bars.groupby("asset_id")["close"].shift(-1) > bars["close"]).astype(np.float32)
+    bars.loc[bars.groupby("asset_id")["close"].shift(-1).isna(), "target"] = np.nan
+
+    columns = [f"{group}_{c}" for c in feature_schema(group)]
+    rows = FeatureStore(session_factory).get_historical_features(
+        bars[["asset_id", "timestamp"]], [group]
+    )
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {name: os.path.join(out_dir, f"{name}.npy") for name in ("features", "targets", "timestamps", "offsets")}
+    np.save(paths["features"], np.ascontiguousarray(rows[columns].to_numpy(np.float32)))
+    np.save(paths["targets"], bars["target"].to_numpy(np.float32))
+    np.save(paths["timestamps"], bars["timestamp"].to_numpy("datetime64[ns]"))
+    starts = np.flatnonzero(bars["asset_id"].ne(bars["asset_id"].shift()).to_numpy())
+    np.save(paths["offsets"], np.append(starts, len(bars)).astype(np.int64))
+    return paths
+
+
+def _log_loss(y: np.ndarray, p: np.ndarray) -> float:
+    p = np.clip(p, 1e-7, 1 - 1e-7)
+    return float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p))) if len(y) else math.inf
+
+
+def retrain_xgboost(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Continue boosting the tokenomics model on recent rows (pool worker).
+
+    The latest ``gate_fraction`` of labelled rows (by time) is held out
+    from training and used to compare the candidate with the current model.
+
+    @param job: Data paths, "current_path", "output_path" and training options
+    @return: Candidate path and gate losses of the current and candidate models
+    """
+    from models.tokenomics.infer_xgboost import load_model
+    from models.tokenomics.train_xgboost import train_xgboost
+
+    X = np.load(job["features"], mmap_mode="r")
+    y = np.load(job["targets"])
+    order = np.argsort(np.load(job["timestamps"]), kind="stable")
+    order = order[~np.isnan(y[order])]
+    X, y = X[order], y[order]
+    cut = len(y) - int(math.ceil(len(y) * job.get("gate_fraction", 0.2)))
+
+    current = load_model(job["current_path"], nthread=job.get("threads"))
+    candidate = train_xgboost(
+        X[:cut], y[:cut],
+        num_boost_round=job.get("num_boost_round", 100),
+        nthread=job.get("threads"),
+        xgb_model=current
+    )
+    candidate.save_model(job["output_path"])
+    return {
+        "path": job["output_path"],
+        "current_loss": _log_loss(y[cut:], current.inplace_predict(X[cut:])) if current is not None else math.inf,
+        "candidate_loss": _log_loss(y[cut:], candidate.inplace_predict(X[cut:])),
+        "rows": int(cut),
+    }
+
+
+def retrain_cnn_lstm(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fine-tune the technical model on recent windows (pool worker).
+
+    Within each asset the latest ``gate_fraction`` of windows is held out
+    for the gate; the rest is split again for early stopping.
+
+    @param job: Data paths, "current_path", "output_path" and training options
+    @return: Candidate path and gate losses of the current and candidate models
+    """
+    import torch
+    from torch import nn
+    from torch.utils.data import DataLoader
+    from models.technical.infer_cnn_lstm import load_model
+    from models.technical.train_cnn_lstm import CNNLSTMModel, WindowedDataset, evaluate, fit, save_model
+
+    window = job.get("window", 50)
+    dataset = WindowedDataset(job["features"], job["targets"], window, np.load(job["offsets"]))
+    fit_part, gate = dataset.time_split(job.get("gate_fraction", 0.2), gap=window)
+    train, val = fit_part.time_split(job.get("val_fraction", 0.2), gap=window)
+    gate_loader = DataLoader(gate, batch_size=job.get("batch_size", 256))
+    criterion = nn.BCEWithLogitsLoss()
+
+    current = load_model(job["current_path"], quantize=False, backend="torch")
+    if isinstance(current, torch.jit.ScriptModule):
+        raise ValueError("Cannot fine-tune a TorchScript archive; retrain from a state-dict checkpoint")
+    candidate = copy.deepcopy(current) if current is not None else CNNLSTMModel(
+        dataset[0][0].shape[1], job.get("hidden_size", 64), job.get("num_layers", 2)
+    )
+    result = fit(
+        candidate, train, val,
+        epochs=job.get("epochs", 3),
+        batch_size=job.get("batch_size", 256),
+        learning_rate=job.get("learning_rate", 1e-4 if current is not None else 1e-3),
+        patience=1
+    )
+    save_model(candidate, job["output_path"])
+    return {
+        "path": job["output_path"],
+        "current_loss": evaluate(current, gate_loader, criterion) if current is not None else math.inf,
+        "candidate_loss": evaluate(candidate, gate_loader, criterion),
+        "rows": len(train),
+        "best_epoch": result["best_epoch"],
+    }
+
+
+TRAINERS = {
+    "xgboost": retrain_xgboost,
+    "cnn_lstm": retrain_cnn_lstm,
+}
+
+
+def _limit_resources(threads: int, memory_mb: Optional[int]) -> None:
+    """Cap threads, address space and priority of a retraining worker."""
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    if memory_mb:
+        import resource
+
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    # Serving traffic keeps priority over retraining on shared hosts
+    os.nice(10)
+
+
+def _serving_paths() -> Dict[str, str]:
+    from models.technical.infer_cnn_lstm import DEFAULT_MODEL_PATH as TECHNICAL_MODEL_PATH
+    from models.tokenomics.infer_xgboost import DEFAULT_MODEL_PATH as TOKENOMICS_MODEL_PATH
+
+    return {"technical": TECHNICAL_MODEL_PATH, "fundamental": TOKENOMICS_MODEL_PATH}
+
+
+def checkpoint_versions(paths: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Version labels last promoted to the serving checkpoints.
+
+    Without an artifact store a promoted model replaces its checkpoint in
+    place, and its label is then written to ``<checkpoint>.version``.
+    Processes that loaded the checkpoint earlier compare the labels to
+    notice the replacement.
+
+    @param paths: Slot -> serving checkpoint path (defaults to the serving paths)
+    @return: Slot -> version, for checkpoints that were promoted
+    """
+    versions = {}
+    for slot, path in (paths or _serving_paths()).items():
+        try:
+            with open(f"{path}.version") as f:
+                versions[slot] = f.read().strip()
+        except FileNotFoundError:
+            continue
+    return versions
+
+
+def _serving_loaders() -> Dict[str, Callable[[str], Any]]:
+    from models.technical.infer_cnn_lstm import load_model as load_technical_model
+    from models.tokenomics.infer_xgboost import load_model as load_tokenomics_model
+
+    return {"technical": load_technical_model, "fundamental": load_tokenomics_model}
+
+
+class RetrainScheduler:
+    """Periodic, metric-triggered retraining with a validation gate."""
+
+    def __init__(
+        self,
+        registry: Any = None,
+        policy: Optional[RetrainPolicy] = None,
+        work_dir: str = "models/retrain",
+        lookback: timedelta = timedelta(days=180),
+        max_workers: int = 1,
+        threads_per_job: int = 2,
+        memory_limit_mb: Optional[int] = None,
+        tolerance: float = 0.0,
+        job_options: Optional[Dict[str, Dict[str, Any]]] = None,
+        session_factory: Optional[Callable[[], Any]] = None,
+        serving_paths: Optional[Dict[str, str]] = None
+    ):
+        """
+        @param registry: Serving ModelRegistry (defaults to the shared one)
+        @param policy: Retrain decision policy
+        @param work_dir: Directory for exported data and candidate models
+        @param lookback: History exported for each retrain
+        @param max_workers: Concurrent retraining processes
+        @param threads_per_job: Threads per retraining process
+        @param memory_limit_mb: Address-space limit per process (None for none)
+        @param tolerance: Relative gate-loss increase still accepted
+        @param job_options: Trainer name -> extra job options
+        @param session_factory: Callable returning a new SQLAlchemy session
+        @param serving_paths: Slot -> serving checkpoint path (defaults to
+                              the inference modules' model paths)
+        """
+        if registry is None:
+            from api.services.model_registry import get_model_registry
+            registry = get_model_registry()
+        self.registry = registry
+        self.policy = policy or RetrainPolicy()
+        self.work_dir = work_dir
+        self.lookback = lookback
+        self.max_workers = max_workers
+        self.threads_per_job = threads_per_job
+        self.memory_limit_mb = memory_limit_mb
+        self.tolerance = tolerance
+        self.job_options = job_options or {}
+        self.session_factory = session_factory
+        self.serving_paths = serving_paths or _serving_paths()
+        self.last_retrained: Dict[str, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def due(
+        self,
+        drift: Optional[Dict[str, Dict[str, float]]] = None,
+        accuracy: Optional[Dict[Any, Dict[str, float]]] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Models that need retraining.
+
+        @param drift: Drift scores (defaults to the shared drift detector's latest)
+        @param accuracy: Rolling metrics (defaults to the shared accuracy tracker's)
+        @param now: Current time
+        @return: Slot -> reasons, for slots due for a retrain only
+        """
+        if drift is None:
+            from monitoring.drift import get_drift_detector
+            drift = get_drift_detector().latest
+        if accuracy is None:
+            from monitoring.accuracy import get_accuracy_tracker
+            accuracy = get_accuracy_tracker().metrics()
+        due = {}
+        for slot, target in RETRAIN_TARGETS.items():
+            # Logged scores of a slot only measure a model the slot serves
+            reasons = self.policy.reasons(
+                slot, target["group"], drift, accuracy if self._serves_model(slot) else {},
+                self.last_retrained.get(slot), now
+            )
+            if reasons:
+                due[slot] = reasons
+        return due
+
+    def _serves_model(self, slot: str) -> bool:
+        try:
+            return self.registry.get(slot) is not None
+        except Exception as e:
+            logger.error(f"Could not load {slot} to check for a served model: {str(e)}")
+            return False
+
+    def run_cycle(
+        self,
+        due: Optional[Dict[str, List[str]]] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrain the models that are due and promote those passing the gate.
+
+        @param due: Slot -> reasons (defaults to due())
+        @param now: Current time
+        @return: Slot -> job result with "accepted" (or "error")
+        """
+        now = now or datetime.now()
+        due = self.due(now=now) if due is None else due
+        if not due:
+            return {}
+        logger.info(f"Retraining {due}")
+
+        stamp = now.strftime("%Y%m%dT%H%M%S")
+        jobs = {}
+        for slot in due:
+            target = RETRAIN_TARGETS[slot]
+            job_dir = os.path.join(self.work_dir, f"{slot}-{stamp}")
+            extension = os.path.splitext(self.serving_paths[slot])[1]
+            jobs[slot] = {
+                **export_training_data(target["group"], job_dir, now - self.lookback, self.session_factory),
+                **self.job_options.get(target["trainer"], {}),
+                "current_path": self._current_path(slot),
+                "output_path": os.path.join(job_dir, f"candidate{extension}"),
+                "threads": self.threads_per_job,
+            }
+
+        results = {}
+        # Spawned, not forked: the serving process runs threads and torch /
+        # OpenMP pools whose locks a forked child could inherit held
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_limit_resources,
+            initargs=(self.threads_per_job, self.memory_limit_mb)
+        ) as pool:
+            futures = {
+                pool.submit(TRAINERS[RETRAIN_TARGETS[slot]["trainer"]], job): slot
+                for slot, job in jobs.items()
+            }
+            for future in as_completed(futures):
+                slot = futures[future]
+                try:
+                    results[slot] = future.result()
+                except Exception as e:
+                    logger.error(f"Retraining {slot} failed: {str(e)}")
+                    results[slot] = {"error": str(e)}
+
+        for slot, result in results.items():
+            self.last_retrained[slot] = now
+            if "error" in result:
+                continue
+            result["accepted"] = result["candidate_loss"] <= result["current_loss"] * (1 + self.tolerance)
+            if result["accepted"]:
+                self.promote(slot, result, f"retrain-{stamp}", jobs[slot])
+            else:
+                logger.info(
+                    f"Rejected {slot} candidate: gate loss {result['candidate_loss']:.4f} "
+                    f"vs current {result['current_loss']:.4f}"
+                )
+        return results
+
+    def _current_path(self, slot: str) -> str:
+        """Checkpoint to warm-start from: the store's LATEST version, else the serving path."""
+        store = self.registry.store
+        version = store.latest(slot) if store is not None else None
+        return store.artifact_path(slot, version) if version else self.serving_paths[slot]
+
+    def promote(
+        self,
+        slot: str,
+        result: Dict[str, Any],
+        version: str,
+        job: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Make a candidate the serving model.
+
+        With an artifact store the candidate is published as a new version
+        (with its feature schema and gate metrics) and activated. Otherwise
+        the serving checkpoint is replaced atomically (so restarts load it)
+        and its version label is written next to it (see
+        checkpoint_versions). Either way the candidate is loaded fully before the registry
+        reference is swapped.
+
+        @param slot: Serving slot
+        @param result: Job result with the candidate "path" and gate losses
+        @param version: Version label
+        @param job: Job options recorded in the manifest (e.g. window)
+        """
+        target = RETRAIN_TARGETS[slot]
+        store = self.registry.store
+        if store is not None:
+            store.publish(
+                slot,
+                result["path"],
+                model_type=target["trainer"],
+                feature_schema=feature_schema(target["group"]),
+                version=version,
+                metrics={k: result[k] for k in ("current_loss", "candidate_loss", "rows") if k in result},
+                metadata={"window": (job or {}).get("window", 50)} if target["trainer"] == "cnn_lstm" else None
+            )
+            self.registry.register_artifact_loader(slot, _serving_loaders()[slot])
+            self.registry.activate(slot, version)
+            return
+
+        model = _serving_loaders()[slot](result["path"])
+        path = self.serving_paths[slot]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        shutil.copyfile(result["path"], tmp_path)
+        os.replace(tmp_path, path)
+        # Written last: the api.serve supervisor reloads the checkpoint when
+        # the label changes and restarts the other workers onto it
+        with open(tmp_path, "w") as f:
+            f.write(version)
+        os.replace(tmp_path, f"{path}.version")
+        self.registry.swap(slot, model, version)
+
+    async def start(self, interval: float = 3600.0) -> None:
+        """
+        @brief Run a retrain cycle every ``interval`` seconds in an executor
+        @param interval: Seconds between cycles
+        """
+        if self._task is not None and not self._task.done():
+            return
+
+        async def run() -> None:
+            loop = asyncio.get_running_loop()
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await loop.run_in_executor(None, self.run_cycle)
+                except Exception as e:
+                    logger.error(f"Retrain cycle failed: {str(e)}")
+
+        self._task = asyncio.get_running_loop().create_task(run())
+        logger.info("Retrain scheduler started")
+
+    async def stop(self) -> None:
+        """Stop the scheduler (a running cycle finishes in its executor)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+_retrain_scheduler: Optional[RetrainScheduler] = None
+
+
+def get_retrain_scheduler() -> RetrainScheduler:
+    """
+    @brief Process-wide retrain scheduler configured from the environment
+    @return: Shared RetrainScheduler instance
+    """
+    global _retrain_scheduler
+    if _retrain_scheduler is None:
+        memory_limit = int(os.getenv("RETRAIN_MEMORY_LIMIT_MB", "0"))
+        _retrain_scheduler = RetrainScheduler(
+            work_dir=os.getenv("RETRAIN_DIR", "models/retrain"),
+            lookback=timedelta(days=float(os.getenv("RETRAIN_LOOKBACK_DAYS", "180"))),
+            max_workers=int(os.getenv("RETRAIN_MAX_WORKERS", "1")),
+            threads_per_job=int(os.getenv("RETRAIN_THREADS", "2")),
+            memory_limit_mb=memory_limit or None
+        )
+    return _retrain_scheduler
+
+
+def retrain_all() -> Dict[str, Dict[str, Any]]:
+    """
+    @brief Retrain every retrainable model now, regardless of metrics
+    @return: Slot -> job result
+    """
+    return get_retrain_scheduler().run_cycle(
+        due={slot: ["manual"] for slot in RETRAIN_TARGETS}
+    )
+
 
 if __name__ == "__main__":
-    retrain_all() 
\ No newline at end of file
+    print(retrain_all())
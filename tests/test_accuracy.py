@@ -0,0 +1,112 @@
+"""
+@file test_accuracy.py
+@brief Test suite for online accuracy tracking
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for joining logged predictions with
+realized outcomes and the rolling accuracy metrics.
+"""
+
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from api.db.timescaledb import ModelPrediction, OHLCV
+from monitoring.accuracy import AccuracyTracker, RollingScores, horizon_label
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def Session():
+    engine = create_engine("sqlite://")
+    for model in (ModelPrediction, OHLCV):
+        model.__table__.create(engine)
+    return sessionmaker(bind=engine)
+
+
+def add_days(Session, closes, first_day=0):
+    """Daily closes for BTC plus a perfect and an inverted prediction each day."""
+    with Session() as session:
+        for d in range(first_day, len(closes)):
+            session.add(OHLCV(asset_id="BTC", timestamp=START + timedelta(days=d), close=float(closes[d])))
+            if d + 1 < len(closes):
+                up = float(closes[d + 1] > closes[d])
+                for name, score in (("perfect", 0.1 + 0.8 * up), ("inverted", 0.9 - 0.8 * up)):
+                    session.add(ModelPrediction(
+                        asset_id="BTC", model_name=name, prediction=score,
+                        score=0.5, created_at=START + timedelta(days=d, hours=1)
+                    ))
+        session.commit()
+
+
+def test_rolling_scores_window():
+    rolling = RollingScores(window=3)
+    rolling.extend([0.9, 0.7, 0.1, 0.8], [-0.1, 0.2, -0.1, 0.3])
+    metrics = rolling.metrics()
+    assert metrics["n"] == 3
+    assert metrics["accuracy"] == 1.0
+    assert metrics["brier"] == pytest.approx((0.09 + 0.01 + 0.04) / 3)
+    assert metrics["ic"] == pytest.approx(1.0)
+
+
+def test_horizon_label():
+    assert horizon_label(timedelta(days=7)) == "7d"
+    assert horizon_label(timedelta(hours=4)) == "4h"
+
+
+def test_tracker_processes_only_new_rows(Session):
+    closes = 100 + np.cumsum(np.random.default_rng(0).standard_normal(40))
+    add_days(Session, closes[:20])
+
+    tracker = AccuracyTracker(Session, horizons=[timedelta(days=1)], window=100)
+    # Day 18's outcome is the last bar, day 19 has no prediction
+    assert tracker.update() == {"1d": 18 * 2}
+    assert tracker.update() == {"1d": 0}
+
+    metrics = tracker.metrics()
+    assert metrics[("perfect", "BTC", "1d")]["accuracy"] == 1.0
+    assert metrics[("inverted", "BTC", "1d")]["accuracy"] == 0.0
+    assert metrics[("perfect", "all", "1d")]["ic"] > 0.5
+    assert REGISTRY.get_sample_value(
+        "model_accuracy", {"model": "perfect", "ticker": "BTC", "horizon": "1d", "metric": "accuracy"}
+    ) == 1.0
+
+    # Later bars realize the remaining predictions exactly once
+    with Session() as session:
+        session.query(ModelPrediction).filter(ModelPrediction.created_at >= START + timedelta(days=19)).delete()
+        session.commit()
+    add_days(Session, closes, first_day=19)
+    assert tracker.update() == {"1d": 20 * 2}
+    assert tracker.metrics()[("perfect", "BTC", "1d")]["n"] == 38
+
+
+def test_lagging_asset_is_scored_once_its_bars_arrive(Session):
+    with Session() as session:
+        # Both rise every day; ETH's bars lag BTC's by a day
+        for asset, days in (("BTC", 10), ("ETH", 9)):
+            for d in range(days):
+                session.add(OHLCV(asset_id=asset, timestamp=START + timedelta(days=d), close=100.0 + d))
+            for d in range(10):
+                session.add(ModelPrediction(
+                    asset_id=asset, model_name="bullish", prediction=0.9,
+                    score=0.5, created_at=START + timedelta(days=d, hours=1)
+                ))
+        session.commit()
+
+    tracker = AccuracyTracker(Session, horizons=[timedelta(days=1)], window=100)
+    # Up to day 6 for both, not ETH's day 7 scored against a stale close
+    assert tracker.update() == {"1d": 7 * 2}
+    assert tracker.metrics()[("bullish", "ETH", "1d")]["accuracy"] == 1.0
+
+    with Session() as session:
+        session.add(OHLCV(asset_id="ETH", timestamp=START + timedelta(days=9), close=109.0))
+        session.commit()
+    assert tracker.update() == {"1d": 2}
+    assert tracker.metrics()[("bullish", "ETH", "1d")] == tracker.metrics()[("bullish", "BTC", "1d")]
+    assert tracker.metrics()[("bullish", "all", "1d")]["accuracy"] == 1.0
@@ -0,0 +1,108 @@
+"""
+@file test_artifact_store.py
+@brief Test suite for versioned model artifacts and hot-swapping
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for the artifact store and the model
+registry loading, warming up and swapping stored versions.
+"""
+
+import os
+import numpy as np
+import pytest
+from api.services.model_registry import ModelRegistry
+from models.artifact_store import ArtifactStore
+from models.tokenomics.infer_xgboost import TOKENOMICS_FEATURES, load_model, predict_batch
+from models.tokenomics.train_xgboost import train_xgboost
+
+
+def booster_file(tmp_path, name, seed):
+    rng = np.random.default_rng(seed)
+    X = rng.random((300, len(TOKENOMICS_FEATURES)))
+    booster = train_xgboost(X, X[:, 0] > 0.5, num_boost_round=5 + seed, val_fraction=0)
+    path = str(tmp_path / f"{name}.ubj")
+    booster.save_model(path)
+    return path
+
+
+def test_publish_verify_and_rollback(tmp_path):
+    store = ArtifactStore(str(tmp_path / "store"))
+    first = store.publish("fundamental", booster_file(tmp_path, "a", 0), "xgboost", TOKENOMICS_FEATURES)
+    checkpoint = tmp_path / "finbert"
+    checkpoint.mkdir()
+    (checkpoint / "config.json").write_text("{}")
+    store.publish("sentiment", str(checkpoint), "finbert", version="v1")
+    second = store.publish("fundamental", booster_file(tmp_path, "b", 1), "xgboost", TOKENOMICS_FEATURES, version="v2")
+
+    assert store.latest("fundamental") == "v2"
+    assert store.versions("fundamental") == sorted([first["version"], "v2"])
+    assert store.manifest("fundamental", "v2")["feature_schema"] == TOKENOMICS_FEATURES
+    assert os.path.isdir(store.artifact_path("sentiment", "v1"))
+    assert set(store.verify("sentiment", "v1")["files"]) == {"finbert/config.json"}
+
+    store.set_latest("fundamental", first["version"])
+    assert store.latest("fundamental") == first["version"]
+    with pytest.raises(ValueError):
+        store.publish("fundamental", booster_file(tmp_path, "c", 2), "xgboost", version="v2")
+
+    with open(store.artifact_path("fundamental", "v2"), "ab") as f:
+        f.write(b"corrupted")
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        store.verify("fundamental", "v2")
+    assert second["files"]
+
+
+def test_registry_preloads_and_swaps_latest(tmp_path):
+    store = ArtifactStore(str(tmp_path / "store"))
+    store.publish("fundamental", booster_file(tmp_path, "a", 0), "xgboost", TOKENOMICS_FEATURES, version="v1")
+
+    warmed = []
+    registry = ModelRegistry(store)
+    registry.register_artifact_loader(
+        "fundamental", load_model,
+        lambda model, manifest: warmed.append((manifest["version"], predict_batch(model, np.zeros((1, 7)))))
+    )
+    in_flight = registry.get("fundamental")
+    assert registry.version("fundamental") == "v1"
+    assert registry.refresh() == []
+
+    store.publish("fundamental", booster_file(tmp_path, "b", 3), "xgboost", TOKENOMICS_FEATURES, version="v2")
+    assert registry.refresh() == ["fundamental"]
+    assert registry.version("fundamental") == "v2"
+    assert [version for version, _ in warmed] == ["v1", "v2"]
+    # A request holding the old model keeps using it
+    assert in_flight.num_boosted_rounds() == 5
+    assert registry.get("fundamental").num_boosted_rounds() == 8
+
+    # A corrupted new version is rejected and the current one keeps serving
+    store.publish("fundamental", booster_file(tmp_path, "c", 4), "xgboost", version="v3")
+    with open(store.artifact_path("fundamental", "v3"), "ab") as f:
+        f.write(b"corrupted")
+    assert registry.refresh() == []
+    assert registry.version("fundamental") == "v2"
+
+
+def test_rejected_version_leaves_manifest_alone(tmp_path):
+    store = ArtifactStore(str(tmp_path / "store"))
+    store.publish("fundamental", booster_file(tmp_path, "a", 0), "xgboost", TOKENOMICS_FEATURES, version="v1")
+
+    def warm_up(model, manifest):
+        if manifest["version"] == "v2":
+            raise RuntimeError("warm-up failed")
+
+    registry = ModelRegistry(store)
+    registry.register_artifact_loader("fundamental", load_model, warm_up)
+    registry.get("fundamental")
+
+    # v2 loads but fails its warm-up: the served model, version and schema stay v1's
+    store.publish("fundamental", booster_file(tmp_path, "b", 3), "xgboost", ["other"], version="v2")
+    assert registry.refresh() == []
+    assert registry.version("fundamental") == registry.manifest("fundamental")["version"] == "v1"
+    assert registry.manifest("fundamental")["feature_schema"] == list(TOKENOMICS_FEATURES)
+
+    # Without warm-up the model and its manifest are swapped in together
+    registry.activate("fundamental", "v2", warm_up=False)
+    assert registry.manifest("fundamental")["feature_schema"] == ["other"]
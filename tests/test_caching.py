@@ -0,0 +1,232 @@
+"""
+@file test_caching.py
+@brief Test suite for the online caching layers
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for the in-memory feature and prediction
+caches used on the prediction hot path.
+"""
+
+import pytest
+import asyncio
+import time
+from api.services.feature_cache import (
+    OnlineFeatureCache,
+    bar_seconds,
+    get_feature_cache,
+    next_bar_close
+)
+from api.services.prediction_cache import PredictionCache
+
+FEATURES = {
+    "technical": {"rsi_14": 55.0},
+    "sentiment": {"finbert_polarity": 0.2},
+}
+
+
+def test_bar_alignment():
+    """
+    @brief Test bar sizes and bar-aligned expiry
+    """
+    assert bar_seconds("1h") == 3600
+    assert next_bar_close("1h", 7200.5) == 10800
+    assert next_bar_close("1d", 86399) == 86400
+    with pytest.raises(ValueError):
+        bar_seconds("5m")
+
+
+def test_hit_miss_and_group_subset():
+    """
+    @brief Test cache hits, misses and partial group coverage
+    """
+    cache = OnlineFeatureCache()
+    assert cache.get("BTC", "1d") is None
+
+    cache.set("btc", "1d", FEATURES)
+    assert cache.get("BTC", "1d", ["technical"]) == {"technical": {"rsi_14": 55.0}}
+    assert cache.get("BTC", "1d", ["technical", "onchain"]) is None
+    assert cache.get("BTC", "1h") is None
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_returned_vectors_are_copies():
+    """
+    @brief Test that callers cannot mutate cached entries
+    """
+    cache = OnlineFeatureCache()
+    cache.set("BTC", "1d", FEATURES)
+    cache.get("BTC", "1d")["technical"]["rsi_14"] = 0.0
+    assert cache.get("BTC", "1d")["technical"]["rsi_14"] == 55.0
+
+
+def test_ttl_and_lru_eviction():
+    """
+    @brief Test TTL expiry and bounded size
+    """
+    cache = OnlineFeatureCache(max_entries=2, max_ttl=0.05)
+    cache.set("BTC", "1d", FEATURES)
+    time.sleep(0.1)
+    assert cache.get("BTC", "1d") is None
+
+    cache = OnlineFeatureCache(max_entries=2)
+    for ticker in ["BTC", "ETH", "SOL"]:
+        cache.set(ticker, "1d", FEATURES)
+    assert cache.get("BTC", "1d") is None
+    assert cache.get("SOL", "1d") is not None
+
+
+def test_invalidation_across_workers(tmp_path):
+    """
+    @brief Test shared entries and invalidation between two cache instances
+    """
+    worker_a = OnlineFeatureCache(shared_dir=str(tmp_path))
+    worker_b = OnlineFeatureCache(shared_dir=str(tmp_path))
+
+    worker_a.set("BTC", "1d", FEATURES)
+    assert worker_b.get("BTC", "1d") == FEATURES
+
+    worker_a.invalidate("BTC")
+    assert worker_a.get("BTC", "1d") is None
+    assert worker_b.get("BTC", "1d") is None
+
+
+def test_write_straddling_invalidation_is_dropped(tmp_path):
+    """
+    @brief Test that features computed before an invalidation are not cached
+    """
+    for shared_dir in (None, str(tmp_path)):
+        cache = OnlineFeatureCache(shared_dir=shared_dir)
+        generation = cache.generation("BTC")
+        assert cache.get("BTC", "1d") is None
+        cache.invalidate("BTC")
+        assert not cache.set("BTC", "1d", FEATURES, generation)
+        assert cache.get("BTC", "1d") is None
+
+        assert cache.set("BTC", "1d", FEATURES, cache.generation("BTC"))
+        assert cache.get("BTC", "1d") == FEATURES
+
+
+def test_feature_services_share_store_and_cache():
+    from api.services.feature_service import FeatureService
+    from api.services.feature_store import get_feature_store
+
+    first, second = FeatureService(), FeatureService()
+    assert first.store is second.store is get_feature_store()
+    assert first.cache is second.cache is get_feature_cache()
+
+
+def test_prediction_key_normalization():
+    """
+    @brief Test that option order does not change the prediction key
+    """
+    a = PredictionCache.make_key("btc", "1d", {"x": 1, "y": "a"}, "1.0.0")
+    b = PredictionCache.make_key("BTC", "1d", {"y": "a", "x": 1}, "1.0.0")
+    assert a == b
+    assert a != PredictionCache.make_key("BTC", "1d", {"x": 1, "y": "a"}, "1.0.1")
+
+
+def test_concurrent_requests_are_coalesced():
+    """
+    @brief Test that N concurrent requests trigger a single computation
+    """
+    cache = PredictionCache()
+    key = cache.make_key("BTC", "1d", {}, "1.0.0")
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"score": 0.7}
+
+    async def run():
+        results = await asyncio.gather(*[cache.get_or_compute(key, compute) for _ in range(10)])
+        results.append(await cache.get_or_compute(key, compute))
+        return results
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result == {"score": 0.7} for result in results)
+    assert (cache.misses, cache.coalesced, cache.hits) == (1, 9, 1)
+
+
+def test_failed_computation_is_not_cached():
+    """
+    @brief Test that errors propagate to all waiters and are not cached
+    """
+    cache = PredictionCache()
+    key = cache.make_key("ETH", "1h", {}, "1.0.0")
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("model unavailable")
+
+    async def run():
+        return await asyncio.gather(
+            *[cache.get_or_compute(key, failing) for _ in range(3)],
+            return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert cache.get(key) is None
+
+    cache.set(key, {"score": 0.5})
+    cache.invalidate("eth")
+    assert cache.get(key) is None
+
+
+def test_cancelled_leader_does_not_fail_waiters():
+    """
+    @brief Test that a disconnecting first caller leaves coalesced callers served
+    """
+    cache = PredictionCache()
+    key = cache.make_key("BTC", "1d", {}, "1.0.0")
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"score": 0.7}
+
+    async def run():
+        leader = asyncio.ensure_future(cache.get_or_compute(key, compute))
+        await asyncio.sleep(0)
+        waiters = [asyncio.ensure_future(cache.get_or_compute(key, compute)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await asyncio.gather(*waiters), leader.cancelled()
+
+    results, cancelled = asyncio.run(run())
+    assert cancelled and len(calls) == 1
+    assert all(result == {"score": 0.7} for result in results)
+    assert cache.get(key) == {"score": 0.7}
+
+
+def test_prediction_straddling_invalidation_is_not_cached():
+    """
+    @brief Test that a computation started before invalidate() is not stored
+    """
+    cache = PredictionCache()
+    key = cache.make_key("BTC", "1d", {}, "1.0.0")
+    started = []
+
+    async def compute():
+        started.append(1)
+        run = len(started)
+        await asyncio.sleep(0.05)
+        return {"score": run}
+
+    async def run():
+        stale = asyncio.ensure_future(cache.get_or_compute(key, compute))
+        await asyncio.sleep(0.01)
+        cache.invalidate("BTC")
+        stale = await stale
+        assert cache.get(key) is None
+        return stale, await cache.get_or_compute(key, compute)
+
+    stale, fresh = asyncio.run(run())
+    assert stale == {"score": 1} and fresh == {"score": 2}
+    assert cache.get(key) == fresh
@@ -0,0 +1,102 @@
+"""
+@file test_data_quality.py
+@brief Test suite for feature data-quality monitoring
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for the vectorized data-quality rules,
+the threshold alerts and the background monitoring queue.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from monitoring.data_quality import QualityRuleSet, check_data_quality, validate_features
+from monitoring.performance_metrics import calculate_metrics, check_thresholds
+from monitoring.drift import DriftDetector
+import monitoring.drift as drift
+from api.services.monitoring_service import MonitoringService
+
+NOW = datetime(2024, 1, 10)
+
+SCHEMA = {
+    "technical": {"rsi_14": (0.0, 100.0), "bb_width": (0.0, float("inf"))},
+    "sentiment": {"finbert_polarity": (-1.0, 1.0)},
+}
+
+
+def test_rules_flag_each_issue():
+    rules = QualityRuleSet(SCHEMA, max_age={"technical": timedelta(days=2)})
+    features = {
+        "technical": {"rsi_14": 130.0, "bb_width": float("nan"), "as_of": NOW - timedelta(days=3), "extra": 1.0},
+        "timestamp": NOW,
+    }
+    result = rules.check(features)
+
+    assert result["out_of_range"] == ["technical.rsi_14"]
+    assert result["non_finite"] == ["technical.bb_width"]
+    assert result["stale_groups"] == ["technical"]
+    assert result["unexpected"] == ["technical.extra"]
+    # Sentiment was not requested, so its columns are not missing
+    assert result["missing"] == []
+
+
+def test_missing_feature_in_requested_group():
+    rules = QualityRuleSet(SCHEMA)
+    result = rules.check({"technical": {"rsi_14": 50.0}, "timestamp": NOW})
+    assert result["missing"] == ["technical.bb_width"]
+    assert result["missing_rate"] == pytest.approx(0.5)
+
+
+def test_check_array_is_vectorized_over_rows():
+    rules = QualityRuleSet(SCHEMA)
+    values = np.array([
+        [50.0, 0.1, 0.0],
+        [-1.0, np.inf, 2.0],
+    ])
+    masks = rules.check_array(values)
+    np.testing.assert_array_equal(masks["out_of_range"], [[False, False, False], [True, False, True]])
+    np.testing.assert_array_equal(masks["non_finite"], [[False, False, False], [False, True, False]])
+
+
+def test_default_rules_and_messages():
+    features = {"onchain": {"network_utilization": 1.5}, "timestamp": datetime.now()}
+    assert "onchain.network_utilization" in check_data_quality(features)["out_of_range"]
+    assert "onchain.network_utilization: out of range" in validate_features(features)
+
+
+def test_thresholds_and_metrics():
+    alerts = check_thresholds({"non_finite_rate": 0.1, "drift": {"technical.rsi_14": {"psi": 0.4, "ks": 0.1}}})
+    assert {a["metric"] for a in alerts} == {"non_finite_rate", "drift.technical.rsi_14.psi"}
+
+    metrics = calculate_metrics(np.array([1, 0, 1, 0]), np.array([0.9, 0.2, 0.4, 0.6]))
+    assert metrics["accuracy"] == pytest.approx(0.5)
+    assert metrics["brier"] == pytest.approx((0.01 + 0.04 + 0.36 + 0.36) / 4)
+
+
+def test_monitoring_runs_drift_in_background(monkeypatch):
+    detector = DriftDetector(min_samples=1)
+    detector.fit_reference({"technical.rsi_14": np.arange(100.0)})
+    monkeypatch.setattr(drift, "_drift_detector", detector)
+
+    async def run():
+        service = MonitoringService()
+        features = {"technical": {"rsi_14": float("nan")}, "timestamp": datetime.now()}
+        start = time.perf_counter()
+        report = await service.monitor_prediction({"score": 0.5}, features, market_context={"regime": "bull"})
+        elapsed = time.perf_counter() - start
+        observed_inline = detector.histograms["technical.rsi_14"].missing
+        await service.stop()
+        return report, elapsed, observed_inline
+
+    report, elapsed, observed_inline = asyncio.run(run())
+    assert report["quality_metrics"]["non_finite"] == ["technical.rsi_14"]
+    assert any(a["metric"] == "non_finite_rate" for a in report["alerts"])
+    assert elapsed < 0.05
+    # Drift tracking happened after the report was returned
+    assert observed_inline == 0
+    assert detector.histograms["technical.rsi_14"].missing == 1
@@ -0,0 +1,95 @@
+"""
+@file test_drift.py
+@brief Test suite for streaming drift detection
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for the histogram drift detector.
+"""
+
+import asyncio
+import numpy as np
+import pytest
+from prometheus_client import REGISTRY
+from monitoring.drift import DriftDetector, FeatureHistogram, flatten_features
+
+
+def features(rsi, volume=None):
+    return {
+        "technical": {"rsi": rsi, "volume": volume, "label": "ignored"},
+        "timestamp": "2024-01-01T00:00:00",
+    }
+
+
+def test_flatten_features_keeps_numeric_scalars():
+    flat = flatten_features(features(55.0))
+    assert flat["technical.rsi"] == 55.0
+    assert np.isnan(flat["technical.volume"])
+    assert "technical.label" not in flat
+
+
+def test_psi_and_ks_detect_shift():
+    rng = np.random.default_rng(0)
+    detector = DriftDetector(n_bins=10, min_samples=100)
+    detector.fit_reference({"technical.rsi": rng.normal(50, 10, 5000)})
+
+    for value in rng.normal(50, 10, 2000):
+        detector.observe(features(value))
+    stable = detector.evaluate()["technical.rsi"]
+
+    shifted_detector = DriftDetector(n_bins=10, min_samples=100)
+    shifted_detector.fit_reference({"technical.rsi": rng.normal(50, 10, 5000)})
+    for value in rng.normal(65, 10, 2000):
+        shifted_detector.observe(features(value))
+    shifted = shifted_detector.evaluate()["technical.rsi"]
+
+    assert stable["psi"] < 0.05 and stable["ks"] < 0.05
+    assert shifted["psi"] > 0.5 and shifted["ks"] > 0.4
+    assert REGISTRY.get_sample_value(
+        "feature_drift_score", {"feature": "technical.rsi", "metric": "psi"}
+    ) == pytest.approx(shifted["psi"])
+
+
+def test_memory_is_bounded_and_live_window_decays(tmp_path):
+    detector = DriftDetector(n_bins=8, reference_size=200, half_life=60.0, min_samples=10)
+    for value in range(10000):
+        detector.observe(features(float(value % 100), volume=None))
+
+    # The reference was bootstrapped from the first values, after which
+    # only fixed-size histograms are kept
+    histogram = detector.histograms["technical.rsi"]
+    assert not detector._warmup
+    assert histogram.live.shape == (len(histogram.edges) + 1,)
+    assert histogram.live.sum() == 10000 - 200
+
+    detector.evaluate(elapsed=60.0)
+    assert histogram.live.sum() == pytest.approx((10000 - 200) / 2)
+
+    path = str(tmp_path / "reference.json")
+    detector.save_reference(path)
+    restored = DriftDetector()
+    restored.load_reference(path)
+    np.testing.assert_array_equal(restored.histograms["technical.rsi"].edges, histogram.edges)
+
+
+def test_missing_values_are_tracked():
+    histogram = FeatureHistogram.from_values(np.arange(100.0), n_bins=4)
+    for value in [1.0, float("nan"), float("inf"), 50.0]:
+        histogram.add(value)
+    assert histogram.scores()["missing_rate"] == pytest.approx(0.5)
+
+
+def test_timer_evaluates_in_background():
+    async def run():
+        detector = DriftDetector(min_samples=1)
+        detector.fit_reference({"technical.rsi": np.arange(100.0)})
+        for value in range(10):
+            detector.observe(features(float(value)))
+        await detector.start(interval=0.01)
+        await asyncio.sleep(0.05)
+        await detector.stop()
+        return detector.latest
+
+    assert "technical.rsi" in asyncio.run(run())
@@ -0,0 +1,226 @@
+"""
+@file test_ensemble.py
+@brief Test suite for the ensemble combiner
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for combining model scores across a
+universe of assets, and for the stacking meta-learner.
+"""
+
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from api.db.timescaledb import ModelPrediction, OHLCV
+from models.ensemble.ensemble_model import EnsembleModel, DEFAULT_WEIGHTS
+from models.ensemble.stacking import (
+    StackingEnsemble,
+    load_stacker,
+    update_stacker,
+    build_training_set
+)
+from ensemble.ensemble_predict import ensemble_predict
+
+N_ASSETS = 1000
+
+@pytest.fixture
+def ensemble():
+    return EnsembleModel()
+
+def test_combine_matches_per_asset_weighting(ensemble):
+    """
+    @brief Vectorized scores equal the renormalized weighted mean per asset
+    """
+    rng = np.random.default_rng(0)
+    scores = rng.random((N_ASSETS, len(ensemble.slots)))
+    mask = rng.random(scores.shape) > 0.3
+    result = ensemble.combine(scores, mask)
+
+    for i in range(0, N_ASSETS, 97):
+        available = {s: scores[i, j] for j, s in enumerate(ensemble.slots) if mask[i, j]}
+        if not available:
+            assert result["score"][i] == 0.5 and result["confidence"][i] == 0.0
+            continue
+        total = sum(DEFAULT_WEIGHTS[s] for s in available)
+        expected = sum(DEFAULT_WEIGHTS[s] * v for s, v in available.items()) / total
+        assert result["score"][i] == pytest.approx(expected)
+    assert ((result["confidence"] >= 0) & (result["confidence"] <= 1)).all()
+
+def test_confidence_and_risk(ensemble):
+    """
+    @brief Agreement and coverage drive confidence; score bands drive risk
+    """
+    scores = np.array([
+        [0.9, 0.9, 0.9, 0.9],
+        [0.9, np.nan, np.nan, np.nan],
+        [1.0, 0.0, 1.0, 0.0],
+        [0.5, 0.5, 0.5, 0.5],
+        [0.1, 0.1, 0.1, 0.1],
+    ])
+    result = ensemble.combine(scores)
+    assert result["confidence"][0] == pytest.approx(1.0)
+    assert result["confidence"][1] == pytest.approx(DEFAULT_WEIGHTS["technical"])
+    assert result["confidence"][2] < 0.1
+    assert list(result["risk"]) == ["low", "low", "medium", "high", "extreme"]
+
+def test_single_asset_paths_share_the_engine(ensemble):
+    """
+    @brief Dict and legacy entry points give the vectorized result
+    """
+    predictions = {"technical": 0.8, "fundamental": 0.6, "sentiment": 0.7, "unknown": 0.0}
+    expected = ensemble.combine(*ensemble.to_matrix([predictions]))["score"][0]
+    assert ensemble.predict(predictions) == pytest.approx(expected)
+    assert ensemble_predict(0.8, 0.6, 0.7) == pytest.approx(expected)
+    assert ensemble.predict({}) == 0.5
+
+def test_per_request_weights_do_not_touch_shared_state(ensemble):
+    """
+    @brief Custom weights apply to one call only, also under concurrency
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    scores = np.random.default_rng(3).random((N_ASSETS, len(ensemble.slots)))
+    default = ensemble.combine(scores)["score"]
+    technical_only = ensemble.combine(scores, weights={"technical": 1.0})
+    np.testing.assert_allclose(technical_only["score"], scores[:, 0])
+    assert technical_only["confidence"].max() <= 1.0
+
+    # Per-asset weight rows
+    rows = np.tile(ensemble.weight_array(), (N_ASSETS, 1))
+    rows[::2] = [0.0, 1.0, 0.0, 0.0]
+    per_asset = ensemble.combine(scores, weights=rows)["score"]
+    np.testing.assert_allclose(per_asset[::2], scores[::2, 1])
+    np.testing.assert_allclose(per_asset[1::2], default[1::2])
+
+    requests = [{"technical": 1.0}, None, {"sentiment": 0.5, "onchain": 0.5}] * 50
+    expected = [ensemble.combine(scores, weights=w)["score"] for w in requests[:3]]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda w: ensemble.combine(scores, weights=w)["score"], requests))
+    for i, result in enumerate(results):
+        np.testing.assert_array_equal(result, expected[i % 3])
+    np.testing.assert_array_equal(ensemble.combine(scores)["score"], default)
+    assert ensemble.weights == DEFAULT_WEIGHTS
+
+    with pytest.raises(ValueError):
+        ensemble.combine(scores, weights={"rsi": 1.0})
+
+def _stacking_data(seed, rows):
+    rng = np.random.default_rng(seed)
+    y = (rng.random(rows) > 0.5).astype(float)
+    scores = np.column_stack([
+        np.clip(0.5 + 0.3 * (y - 0.5) + 0.15 * rng.standard_normal(rows), 0, 1),
+        rng.random(rows),
+    ])
+    mask = rng.random(scores.shape) > 0.1
+    return scores, mask, y
+
+def test_stacker_incremental_fit_matches_batch_fit():
+    """
+    @brief Refitting on successive batches converges to the one-shot fit
+    """
+    scores, mask, y = _stacking_data(0, 4000)
+    batch = StackingEnsemble(["technical", "sentiment"])
+    batch.partial_fit(scores, mask, y)
+
+    online = StackingEnsemble(["technical", "sentiment"])
+    for rows in np.array_split(np.arange(len(y)), 8):
+        online.partial_fit(scores[rows], mask[rows], y[rows])
+
+    assert online.n_seen == len(y)
+    np.testing.assert_allclose(online.coef, batch.coef, atol=0.05)
+    # The informative model gets the weight; the noise model does not
+    assert online.coef[0] > 2.0 and abs(online.coef[1]) < 0.3
+
+def test_stacker_artifact_serves_through_ensemble(tmp_path):
+    """
+    @brief The saved artifact reloads and drives the ensemble score
+    """
+    scores, mask, y = _stacking_data(1, 1000)
+    stacker = StackingEnsemble(["technical", "sentiment"])
+    stacker.partial_fit(scores, mask, y)
+    path = str(tmp_path / "stacker.json")
+    stacker.save(path)
+
+    loaded = load_stacker(path)
+    assert load_stacker(str(tmp_path / "missing.json")) is None
+    np.testing.assert_allclose(loaded.predict_proba(scores, mask), stacker.predict_proba(scores, mask))
+
+    ensemble = EnsembleModel(stacker=loaded)
+    full = np.full((len(scores), len(ensemble.slots)), np.nan)
+    full[:, :2] = np.where(mask, scores, np.nan)
+    result = ensemble.combine(full)
+    has_any = mask.any(axis=1)
+    np.testing.assert_allclose(result["score"][has_any], stacker.predict_proba(scores, mask)[has_any])
+
+def test_update_stacker_from_logged_predictions():
+    """
+    @brief Logged predictions are labelled with realized returns once, in order
+    """
+    engine = create_engine("sqlite://")
+    for model in (ModelPrediction, OHLCV):
+        model.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+
+    start = datetime(2024, 1, 1)
+    closes = 100 + np.cumsum(np.random.default_rng(2).standard_normal(30))
+    with Session() as session:
+        session.add_all(
+            OHLCV(asset_id="BTC", timestamp=start + timedelta(days=d), close=float(c))
+            for d, c in enumerate(closes)
+        )
+        for d in range(30):
+            up = float(closes[min(d + 1, 29)] > closes[d])
+            for name, score in (("technical", 0.2 + 0.6 * up), ("sentiment", 0.5)):
+                session.add(ModelPrediction(
+                    asset_id="BTC", model_name=name, prediction=score,
+                    score=0.5, created_at=start + timedelta(days=d, hours=1)
+                ))
+        session.commit()
+
+    stacker = StackingEnsemble(["technical", "sentiment"])
+    metrics = update_stacker(stacker, Session)
+    # The last day's outcome has not been realized yet
+    assert metrics["rows"] == 28
+    assert metrics["log_loss_after"] < metrics["log_loss_before"]
+    assert stacker.trained_through == start + timedelta(days=27, hours=1)
+    assert update_stacker(stacker, Session)["rows"] == 0
+
+
+def test_lagging_asset_is_waited_for_not_mislabelled():
+    """
+    @brief Outcomes of an asset whose bars lag are labelled once its bars arrive
+    """
+    engine = create_engine("sqlite://")
+    for model in (ModelPrediction, OHLCV):
+        model.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+
+    start = datetime(2024, 1, 1)
+    # Prices rise every day, so every realized label is 1
+    with Session() as session:
+        for asset, days in (("BTC", 30), ("ETH", 29), ("DOGE", 20)):
+            session.add_all(
+                OHLCV(asset_id=asset, timestamp=start + timedelta(days=d), close=100.0 + d)
+                for d in range(days)
+            )
+            session.add_all(
+                ModelPrediction(asset_id=asset, model_name="technical", prediction=0.8,
+                                score=0.5, created_at=start + timedelta(days=d, hours=1))
+                for d in range(30)
+            )
+        session.commit()
+
+        # ETH lags a day and holds the watermark back; DOGE stopped trading
+        scores, mask, labels, latest = build_training_set(session, ["technical"])
+        assert latest == start + timedelta(days=26, hours=1)
+        assert len(labels) == 27 + 27 + 19 and labels.all()
+
+        session.add(OHLCV(asset_id="ETH", timestamp=start + timedelta(days=29), close=129.0))
+        session.commit()
+        scores, mask, labels, latest = build_training_set(session, ["technical"], since=latest)
+        assert latest == start + timedelta(days=27, hours=1)
+        assert len(labels) == 2 and labels.all()
@@ -0,0 +1,173 @@
+"""
+@file test_feature_store.py
+@brief Test suite for the materialized feature store
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for feature materialization and
+point-in-time correct reads from the feature store.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from api.db.timescaledb import Asset, OHLCV
+from api.services.feature_store import (
+    FeatureStore,
+    FEATURE_GROUPS,
+    write_feature_rows
+)
+
+
+@pytest.fixture
+def store():
+    """
+    @brief Feature store backed by an in-memory SQLite database
+    """
+    engine = create_engine("sqlite://")
+    for model in [Asset, OHLCV] + list(FEATURE_GROUPS.values()):
+        model.__table__.create(engine)
+    return FeatureStore(sessionmaker(bind=engine), max_staleness=timedelta(days=2))
+
+
+def _write_sentiment(store, days):
+    rows = pd.DataFrame({
+        "asset_id": "BTC",
+        "date": pd.to_datetime(days),
+        "finbert_polarity": np.arange(len(days), dtype=float),
+        "sentiment_volatility": 0.1,
+        "news_freq": 1,
+        "social_mentions": 2,
+        "yt_growth": 0.0,
+    })
+    with store.session_factory() as session:
+        write_feature_rows(FEATURE_GROUPS["sentiment"], rows, session)
+
+
+def test_online_read_is_point_in_time(store):
+    """
+    @brief Test that a day's row is only visible after the day has closed
+    """
+    _write_sentiment(store, ["2024-01-01", "2024-01-02", "2024-01-03"])
+
+    features = store.get_online_features("BTC", datetime(2024, 1, 3, 12), ["sentiment"])
+    assert features["sentiment"]["finbert_polarity"] == 1.0
+    assert features["sentiment"]["as_of"] == datetime(2024, 1, 2)
+
+    features = store.get_online_features("BTC", datetime(2024, 1, 4), ["sentiment"])
+    assert features["sentiment"]["finbert_polarity"] == 2.0
+
+
+def test_online_read_skips_stale_rows(store):
+    """
+    @brief Test that rows older than max_staleness are not served
+    """
+    _write_sentiment(store, ["2024-01-01"])
+    assert store.get_online_features("BTC", datetime(2024, 1, 10), ["sentiment"]) == {}
+
+
+def test_rewrite_only_replaces_written_days(store):
+    """
+    @brief Test that a batch with gaps keeps the stored days it does not rewrite
+    """
+    _write_sentiment(store, ["2024-01-01", "2024-01-02", "2024-01-03"])
+    _write_sentiment(store, ["2024-01-01", "2024-01-03"])
+
+    with store.session_factory() as session:
+        stored = pd.read_sql(
+            FEATURE_GROUPS["sentiment"].__table__.select(), session.bind
+        ).sort_values("date")
+    assert pd.to_datetime(stored["date"]).dt.day.tolist() == [1, 2, 3]
+    assert stored["finbert_polarity"].tolist() == [0.0, 1.0, 1.0]
+
+
+def test_historical_features_avoid_lookahead(store):
+    """
+    @brief Test the as-of join used for training sets
+    """
+    _write_sentiment(store, ["2024-01-01", "2024-01-02", "2024-01-03"])
+    events = pd.DataFrame({
+        "asset_id": ["BTC", "BTC", "BTC"],
+        "timestamp": [datetime(2024, 1, 3, 12), datetime(2024, 1, 1, 12), datetime(2024, 1, 2, 0)],
+    })
+
+    frame = store.get_historical_features(events, ["sentiment"])
+
+    assert frame["timestamp"].tolist() == list(pd.to_datetime(events["timestamp"]))
+    polarity = frame["sentiment_finbert_polarity"].tolist()
+    assert polarity[0] == 1.0
+    assert np.isnan(polarity[1])
+    assert polarity[2] == 0.0
+
+
+def test_materialize_technical_from_ohlcv(store):
+    """
+    @brief Test scheduled materialization of technical features
+    """
+    start = datetime(2024, 1, 1)
+    with store.session_factory() as session:
+        session.add(Asset(id="BTC", symbol="BTC", name="Bitcoin"))
+        session.add_all([
+            OHLCV(asset_id="BTC", timestamp=start + timedelta(days=i),
+                  open=100 + i, high=101 + i, low=99 + i, close=100 + i, volume=10)
+            for i in range(60)
+        ])
+        session.commit()
+
+    written = store.materialize(since=start + timedelta(days=50))
+    assert written["technical"] == 10
+
+    features = store.get_online_features("BTC", start + timedelta(days=60), ["technical"])
+    assert features["technical"]["ma_50"] == pytest.approx(np.mean(100 + np.arange(10, 60)))
+    assert features["technical"]["rsi_14"] == pytest.approx(100.0)
+
+
+def test_materialize_all_groups_on_schedule():
+    """
+    @brief Test sentiment and snapshot producers through the scheduler
+    """
+    import asyncio
+    from sqlalchemy.pool import StaticPool
+
+    # The scheduler materializes from an executor thread
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    for model in [Asset, OHLCV] + list(FEATURE_GROUPS.values()):
+        model.__table__.create(engine)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    texts = pd.DataFrame({
+        "asset_id": ["BTC", "BTC", "ETH"],
+        "timestamp": [today, today + timedelta(hours=1), today],
+        "source": [0, 1, 2],
+        "text": ["up", "down", "flat"],
+    })
+    store = FeatureStore(
+        sessionmaker(bind=engine),
+        text_source=lambda tickers, since: texts[texts["asset_id"].isin(tickers)],
+        text_scorer=lambda batch: np.tile([[0.7, 0.2, 0.1]], (len(batch), 1)),
+        snapshot_sources={
+            "tokenomics": lambda ticker: {"tvl_ratio": 0.5, "unknown": 1.0} if ticker == "BTC" else {},
+            "onchain": lambda ticker: {"active_addresses": 10},
+        }
+    )
+    with store.session_factory() as session:
+        session.add_all([Asset(id="BTC", symbol="BTC", name="Bitcoin"), Asset(id="ETH", symbol="ETH", name="Ether")])
+        session.commit()
+
+    async def run():
+        store.start_scheduler(interval_seconds=3600)
+        await asyncio.sleep(0.5)
+        await store.stop_scheduler()
+
+    asyncio.run(run())
+    features = store.get_online_features("BTC", today + timedelta(days=1))
+    assert features["sentiment"]["finbert_polarity"] == pytest.approx(0.5)
+    assert features["sentiment"]["news_freq"] == 1
+    assert features["tokenomics"]["tvl_ratio"] == 0.5
+    assert features["onchain"]["active_addresses"] == 10
+    # Assets whose source has no data get no row
+    assert "tokenomics" not in store.get_online_features("ETH", today + timedelta(days=1))
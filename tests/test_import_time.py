@@ -0,0 +1,62 @@
+"""
+@file test_import_time.py
+@brief Import-time regression checks for the API
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module imports the API in a fresh interpreter under
+``python -X importtime`` and fails if model frameworks or training code
+are imported at startup. Those are only imported by the model backends
+that load them, so workers that never load a model do not pay for them.
+The slowest imports are printed with any failure.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the API must not import before a model is loaded
+HEAVY_MODULES = ("torch", "transformers", "xgboost", "sklearn", "onnxruntime")
+TRAINING_MODULE = re.compile(r"^models\.\w+\.train_\w+$")
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_report(module: str) -> List[Tuple[str, int, int]]:
+    """
+    @brief Import a module in a fresh interpreter and parse -X importtime
+    @param module: Module to import
+    @return: (module, self us, cumulative us) per imported module
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, timeout=300
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    report = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            report.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return report
+
+
+def summary(report: List[Tuple[str, int, int]], top: int = 15) -> str:
+    slowest = sorted(report, key=lambda row: row[2], reverse=True)[:top]
+    return "\n".join(f"{cumulative / 1000:9.1f} ms  {name}" for name, _, cumulative in slowest)
+
+
+def test_api_import_skips_model_frameworks_and_training_code():
+    report = import_report("api.main")
+    imported: Dict[str, int] = {name: cumulative for name, _, cumulative in report}
+    heavy = sorted(name for name in imported if name.split(".")[0] in HEAVY_MODULES)
+    training = sorted(name for name in imported if TRAINING_MODULE.match(name))
+    assert not heavy and not training, (
+        f"API import pulled in {heavy + training}; slowest imports:\n{summary(report)}"
+    )
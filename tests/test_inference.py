@@ -0,0 +1,331 @@
+"""
+@file test_inference.py
+@brief Test suite for the model serving paths
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for loading trained models and running
+batched inference on CPU.
+"""
+
+import pytest
+import numpy as np
+import torch
+from models.technical.train_cnn_lstm import CNNLSTMModel, save_model
+from models.technical.infer_cnn_lstm import (
+    load_model,
+    predict,
+    predict_batch,
+    compile_model,
+    export_torchscript
+)
+from models.onnx_backend import (
+    OnnxModel,
+    export_cnn_lstm_onnx,
+    export_finbert_onnx,
+    check_cnn_lstm_equivalence,
+    check_finbert_equivalence
+)
+from models.quantization import (
+    quantize_model,
+    compare_cnn_lstm,
+    compare_finbert,
+    check_report
+)
+
+N_ASSETS = 16
+WINDOW = 50
+N_FEATURES = 10
+
+
+@pytest.fixture
+def technical_model():
+    """
+    @brief Small CNN-LSTM model with fixed weights
+    """
+    torch.manual_seed(0)
+    return CNNLSTMModel(input_size=N_FEATURES, hidden_size=16, num_layers=2).eval()
+
+
+@pytest.fixture
+def windows():
+    """
+    @brief Batch of (asset x window x feature) inputs
+    """
+    return np.random.default_rng(0).standard_normal((N_ASSETS, WINDOW, N_FEATURES)).astype(np.float32)
+
+
+def test_forward_shape(technical_model, windows):
+    """
+    @brief Test that the model maps a batch of windows to one logit each
+    """
+    assert technical_model(torch.from_numpy(windows)).shape == (N_ASSETS, 1)
+
+
+def test_batch_matches_single_predictions(technical_model, windows):
+    """
+    @brief Test batched scoring against per-asset scoring
+    """
+    scores = predict_batch(technical_model, windows)
+    assert scores.shape == (N_ASSETS,)
+    assert np.all((scores > 0) & (scores < 1))
+    single = [predict(technical_model, window) for window in windows]
+    np.testing.assert_allclose(scores, single, rtol=1e-5, atol=1e-6)
+    # Nested lists are accepted like arrays
+    assert predict(technical_model, windows[0].tolist()) == pytest.approx(single[0], rel=1e-5)
+    np.testing.assert_allclose(predict_batch(technical_model, windows, batch_size=5), scores, rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.parametrize("compile_mode", [None, "torchscript"])
+def test_load_checkpoint(tmp_path, technical_model, windows, compile_mode):
+    """
+    @brief Test loading saved weights with and without TorchScript
+    """
+    path = str(tmp_path / "cnn_lstm_model.pt")
+    save_model(technical_model, path)
+
+    model = load_model(path, compile_mode=compile_mode)
+    np.testing.assert_allclose(
+        predict_batch(model, windows),
+        predict_batch(technical_model, windows),
+        rtol=1e-4,
+        atol=1e-5
+    )
+
+
+def test_load_torchscript_archive(tmp_path, technical_model, windows):
+    """
+    @brief Test loading an exported TorchScript archive
+    """
+    path = str(tmp_path / "cnn_lstm_model.ts")
+    export_torchscript(technical_model, path)
+    np.testing.assert_allclose(
+        predict_batch(load_model(path), windows),
+        predict_batch(technical_model, windows),
+        rtol=1e-4,
+        atol=1e-5
+    )
+
+
+def test_missing_weights_and_bad_input(tmp_path, technical_model):
+    """
+    @brief Test missing weight files and invalid input shapes
+    """
+    assert load_model(str(tmp_path / "missing.pt")) is None
+    with pytest.raises(ValueError):
+        predict_batch(technical_model, np.zeros((WINDOW, N_FEATURES)))
+    with pytest.raises(ValueError):
+        compile_model(technical_model, "unknown")
+
+
+def test_quantized_cnn_lstm_is_close_to_fp32(tmp_path, technical_model, windows):
+    """
+    @brief Test INT8 dynamic quantization of the technical model
+    """
+    path = str(tmp_path / "cnn_lstm_model.pt")
+    save_model(technical_model, path)
+    quantized = load_model(path, quantize=True)
+
+    assert isinstance(quantized.lstm, torch.ao.nn.quantized.dynamic.LSTM)
+    report = compare_cnn_lstm(technical_model, quantized, windows, repeats=1)
+    assert report["size_ratio"] < 1.0
+    assert report["max_abs_delta"] < 0.05
+    assert check_report(report)
+
+
+def toy_tokenizer(texts, return_tensors="pt", **kwargs):
+    """
+    @brief Whitespace tokenizer standing in for the FinBERT tokenizer
+    """
+    ids = np.array([[hash(w) % 100 for w in (t.split() + ["pad"] * 8)[:8]] for t in texts], dtype=np.int64)
+    inputs = {"input_ids": ids, "attention_mask": np.ones_like(ids)}
+    if return_tensors == "pt":
+        inputs = {k: torch.from_numpy(v) for k, v in inputs.items()}
+    return inputs
+
+
+@pytest.fixture
+def finbert_dir(tmp_path):
+    """
+    @brief Directory with a tiny randomly initialised BERT classifier
+    """
+    from transformers import BertConfig, BertForSequenceClassification
+
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=100, hidden_size=32, num_hidden_layers=2,
+        num_attention_heads=2, intermediate_size=64, num_labels=3
+    )
+    BertForSequenceClassification(config).save_pretrained(tmp_path / "finbert")
+    return str(tmp_path / "finbert")
+
+
+def test_quantized_finbert_report(finbert_dir):
+    """
+    @brief Test quantized FinBERT loading and the accuracy report
+    """
+    from models.sentiment.infer_finbert import load_model as load_finbert
+
+    fp32 = load_finbert(finbert_dir, quantize=False)
+    int8 = load_finbert(finbert_dir, quantize=True)
+
+    texts = ["bitcoin rallies hard", "ether sinks on news", "market flat"] * 4
+    report = compare_finbert(fp32, int8, toy_tokenizer, texts, labels=[0, 1, 2] * 4, batch_size=5)
+    assert report["mean_abs_delta"] < 0.05
+    assert 0.0 <= report["label_agreement"] <= 1.0
+    assert "int8_accuracy" in report
+
+
+def test_finbert_uses_tokenizer_saved_with_the_model(finbert_dir):
+    """
+    @brief Test that a model is served with the tokenizer in its directory
+    """
+    from transformers import BertTokenizerFast
+    from models.sentiment.infer_finbert import load_model as load_finbert, predict as predict_sentiment
+
+    assert load_finbert(finbert_dir, quantize=False).tokenizer is None
+
+    tokens = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "bitcoin", "ether", "sinks"]
+    BertTokenizerFast(vocab={token: i for i, token in enumerate(tokens)}).save_pretrained(finbert_dir)
+    model = load_finbert(finbert_dir, quantize=False)
+    assert model.tokenizer(["bitcoin sinks"])["input_ids"] == [[2, 5, 7, 3]]
+    # No tokenizer is passed and none is downloaded
+    assert len(predict_sentiment(model, ["bitcoin sinks", "ether"])["predictions"]) == 2
+
+
+def test_onnx_cnn_lstm_matches_torch(tmp_path, technical_model, windows):
+    """
+    @brief Test the ONNX Runtime technical backend against PyTorch
+    """
+    path = str(tmp_path / "cnn_lstm_model.onnx")
+    export_cnn_lstm_onnx(technical_model, path, window=WINDOW)
+
+    model = load_model(path, backend="onnx")
+    assert isinstance(model, OnnxModel)
+    assert check_cnn_lstm_equivalence(technical_model, model, windows)["ok"]
+    np.testing.assert_allclose(
+        predict_batch(model, windows, batch_size=5),
+        predict_batch(technical_model, windows),
+        rtol=1e-4,
+        atol=1e-5
+    )
+    assert check_cnn_lstm_equivalence(technical_model, model, windows[:, :20])["ok"]
+
+
+def test_onnx_finbert_matches_torch(tmp_path, finbert_dir):
+    """
+    @brief Test the ONNX Runtime sentiment backend against PyTorch
+    """
+    from models.sentiment.infer_finbert import load_model as load_finbert, predict as predict_sentiment
+
+    torch_model = load_finbert(finbert_dir, quantize=False)
+    export_finbert_onnx(torch_model, toy_tokenizer, f"{finbert_dir}/model.onnx")
+    onnx_model = load_finbert(finbert_dir, backend="onnx")
+
+    texts = ["bitcoin rallies hard today", "ether sinks", "market flat again"]
+    report = check_finbert_equivalence(torch_model, onnx_model, toy_tokenizer, texts)
+    assert report["ok"] and report["label_agreement"] == 1.0
+    np.testing.assert_allclose(
+        predict_sentiment(onnx_model, texts, toy_tokenizer)["predictions"],
+        predict_sentiment(torch_model, texts, toy_tokenizer)["predictions"],
+        atol=1e-4
+    )
+
+
+def test_xgboost_tokenomics_serving(tmp_path):
+    """
+    @brief Test loading a saved booster and in-place batch scoring
+    """
+    import xgboost as xgb
+    from models.tokenomics.train_xgboost import train_xgboost
+    from models.tokenomics.infer_xgboost import (
+        TOKENOMICS_FEATURES,
+        load_model as load_tokenomics,
+        predict as predict_tokenomics,
+        predict_batch as predict_tokenomics_batch,
+        features_to_matrix
+    )
+
+    assert load_tokenomics(str(tmp_path / "missing.ubj")) is None
+
+    X = np.random.randn(500, len(TOKENOMICS_FEATURES)).astype(np.float32)
+    path = str(tmp_path / "xgboost_model.ubj")
+    train_xgboost(X, (X[:, 0] > 0).astype(np.float32), num_boost_round=20).save_model(path)
+    booster = load_tokenomics(path, nthread=1)
+
+    expected = booster.predict(xgb.DMatrix(X[:N_ASSETS]))
+    np.testing.assert_allclose(predict_tokenomics_batch(booster, X[:N_ASSETS]), expected, rtol=1e-6)
+
+    row = dict(zip(TOKENOMICS_FEATURES, X[0].tolist()))
+    assert predict_tokenomics(booster, row) == pytest.approx(float(expected[0]), rel=1e-6)
+
+    # Missing features are passed to XGBoost as NaN
+    matrix = features_to_matrix([{"tvl_ratio": 1.0, "fdv_ratio": None}])
+    assert matrix.flags["C_CONTIGUOUS"] and matrix[0, 0] == 1.0
+    assert np.isnan(matrix[0, 1:]).all()
+    assert 0.0 <= predict_tokenomics_batch(booster, matrix)[0] <= 1.0
+
+
+def test_served_technical_score_comes_from_stored_windows(tmp_path, technical_model):
+    """
+    @brief Test that serving scores the loaded model on stored feature rows
+    """
+    import asyncio
+    from datetime import datetime, timedelta
+    import pandas as pd
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from api.db.timescaledb import Asset, OHLCV
+    from api.services.feature_store import FeatureStore, FEATURE_GROUPS, _feature_columns, write_feature_rows
+    from api.services.model_registry import ModelRegistry
+    from api.services.prediction_service import PredictionService, _warm_up_technical
+    from models.artifact_store import ArtifactStore
+    from models.ensemble.ensemble_model import EnsembleModel
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    for table in [Asset, OHLCV] + list(FEATURE_GROUPS.values()):
+        table.__table__.create(engine)
+    feature_store = FeatureStore(sessionmaker(bind=engine), max_staleness=timedelta(days=2))
+
+    # BTC has a full 20-day window; ETH only 5 days and cannot be scored
+    window, columns = 20, _feature_columns(FEATURE_GROUPS["technical"].__table__)
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    rng = np.random.default_rng(1)
+    for ticker, days in (("BTC", 30), ("ETH", 5)):
+        rows = pd.DataFrame(rng.standard_normal((days, len(columns))), columns=columns)
+        rows["ma_crossover"] = rows["ma_crossover"] > 0
+        rows["asset_id"] = ticker
+        rows["date"] = [today - timedelta(days=days - i) for i in range(days)]
+        with feature_store.session_factory() as session:
+            write_feature_rows(FEATURE_GROUPS["technical"], rows, session)
+        if ticker == "BTC":
+            expected_window = rows[columns].to_numpy(np.float32)[-window:]
+
+    model = CNNLSTMModel(input_size=len(columns), hidden_size=16, num_layers=1).eval()
+    checkpoint = str(tmp_path / "cnn_lstm_model.pt")
+    save_model(model, checkpoint)
+    artifacts = ArtifactStore(str(tmp_path / "store"))
+    artifacts.publish("technical", checkpoint, "cnn_lstm", columns, version="v1", metadata={"window": window})
+
+    registry = ModelRegistry(artifacts)
+    registry.register_artifact_loader(
+        "technical", lambda path: load_model(path, quantize=False, backend="torch"), _warm_up_technical
+    )
+    registry.register_loader("ensemble", EnsembleModel)
+    service = PredictionService()
+    service.registry, service.feature_store = registry, feature_store
+
+    expected = float(predict_batch(model, expected_window[None])[0])
+    scores = asyncio.run(service.score_technical(["BTC", "ETH"]))
+    assert scores == {"BTC": pytest.approx(expected, rel=1e-5)}
+
+    prediction = asyncio.run(service.predict({}, ticker="BTC"))
+    assert prediction["predictions"]["technical"] == pytest.approx(expected, rel=1e-5)
+    # Only model outputs are reported for logging; the sentiment placeholder is not
+    assert prediction["model_versions"] == {"technical": "v1"}
+    # Without a complete window the slot is left out, not filled with a constant
+    prediction = asyncio.run(service.predict({}, ticker="ETH"))
+    assert "technical" not in prediction["predictions"]
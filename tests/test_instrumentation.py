@@ -0,0 +1,74 @@
+"""
+@file test_instrumentation.py
+@brief Test suite for pipeline latency instrumentation
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for the per-stage latency histograms.
+"""
+
+import asyncio
+import pytest
+from prometheus_client import REGISTRY, generate_latest
+from api.models.schemas import TimeFrame
+from api.services.instrumentation import stage_timer, timed, track_request
+
+
+def _count(stage, model="", timeframe=""):
+    value = REGISTRY.get_sample_value(
+        "prediction_stage_latency_seconds_count",
+        {"stage": stage, "model": model, "timeframe": timeframe}
+    )
+    return value or 0.0
+
+
+def test_stages_inherit_request_timeframe():
+    """
+    @brief Stages inside a request are labelled with its timeframe
+    """
+    before = _count("feature_fetch", "market", "1w")
+    requests_before = REGISTRY.get_sample_value("prediction_latency_seconds_count") or 0.0
+
+    with track_request(TimeFrame.WEEK):
+        with stage_timer("feature_fetch", "market"):
+            pass
+    with stage_timer("feature_fetch", "market"):
+        pass
+
+    assert _count("feature_fetch", "market", "1w") == before + 1
+    assert _count("feature_fetch", "market", "") >= 1
+    assert REGISTRY.get_sample_value("prediction_latency_seconds_count") == requests_before + 1
+
+
+def test_timed_decorator_sync_and_async():
+    """
+    @brief The decorator times sync and async callables, including failures
+    """
+    @timed("inference", "unit_sync")
+    def sync_stage(x):
+        return x + 1
+
+    @timed("inference", "unit_async")
+    async def async_stage(x):
+        await asyncio.sleep(0)
+        return x * 2
+
+    @timed("inference", "unit_error")
+    def failing_stage():
+        raise RuntimeError("boom")
+
+    async def request():
+        with track_request("1d"):
+            return await async_stage(3)
+
+    assert sync_stage(1) == 2
+    assert asyncio.run(request()) == 6
+    with pytest.raises(RuntimeError):
+        failing_stage()
+
+    assert _count("inference", "unit_sync") == 1
+    assert _count("inference", "unit_async", "1d") == 1
+    assert _count("inference", "unit_error") == 1
+    assert b"prediction_stage_latency_seconds_bucket" in generate_latest()
@@ -0,0 +1,94 @@
+"""
+@file test_prediction_logging.py
+@brief Test suite for the write-behind prediction logger
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for batching, backpressure and
+flush-on-shutdown of prediction log records.
+"""
+
+import pytest
+import asyncio
+from datetime import datetime
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from api.db.timescaledb import ModelPrediction
+from api.models.prediction_log import ModelPredictionLog
+from api.services.prediction_logger import PredictionLogWriter
+
+
+def _records(n):
+    return [
+        ModelPredictionLog(
+            asset_id="BTC",
+            model_name="technical",
+            prediction=0.5,
+            score=0.6,
+            created_at=datetime(2024, 1, 1),
+            extra={"timeframe": "1d"}
+        )
+        for _ in range(n)
+    ]
+
+
+@pytest.fixture
+def session_factory():
+    """
+    @brief Session factory for an in-memory SQLite database
+    """
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    ModelPrediction.__table__.create(engine)
+    return sessionmaker(bind=engine)
+
+
+def _count(session_factory):
+    with session_factory() as session:
+        return session.scalar(select(func.count()).select_from(ModelPrediction))
+
+
+def test_records_are_flushed_in_batches(session_factory):
+    """
+    @brief Test background flushing and flush on shutdown
+    """
+    writer = PredictionLogWriter(session_factory, batch_size=10, flush_interval=0.01)
+    batches = []
+    write_batch = writer._write_batch
+    writer._write_batch = lambda batch: (batches.append(len(batch)), write_batch(batch))
+
+    async def run():
+        await writer.start()
+        assert await writer.log(_records(25)) == 25
+        await asyncio.sleep(0.2)
+        await writer.log(_records(3))
+        await writer.stop()
+
+    asyncio.run(run())
+    assert _count(session_factory) == 28
+    assert writer.written == 28
+    assert max(batches) == 10
+
+
+def test_full_queue_applies_backpressure_then_drops(session_factory):
+    """
+    @brief Test that a full queue drops records instead of blocking forever
+    """
+    writer = PredictionLogWriter(session_factory, max_queue=5, enqueue_timeout=0.01)
+
+    async def run():
+        # Stand-in for a flush task stuck on a slow database
+        writer._queue = asyncio.Queue(maxsize=writer.max_queue)
+        writer._task = asyncio.get_running_loop().create_task(asyncio.sleep(60))
+        enqueued = await writer.log(_records(8))
+        writer._task.cancel()
+        return enqueued
+
+    assert asyncio.run(run()) == 5
+    assert writer.dropped == 3
@@ -0,0 +1,131 @@
+"""
+@file test_profiler.py
+@brief Test suite for request profiling
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for the sampling profiler and the
+profiling middleware.
+"""
+
+import asyncio
+import json
+import os
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api.services.profiler import ProfilingMiddleware, SamplingProfiler
+
+ADMIN_TOKEN = "secret"
+
+
+def busy_inference(seconds):
+    """Stand-in for model inference: burns CPU in an executor thread."""
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = FastAPI()
+
+    @app.get("/predict/{ticker}")
+    async def predict(ticker: str):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, busy_inference, 0.1)
+        return {"ticker": ticker}
+
+    app.add_middleware(
+        ProfilingMiddleware,
+        profile_dir=str(tmp_path),
+        admin_token=ADMIN_TOKEN,
+        sample_rate=0,
+        interval=0.002
+    )
+    return app
+
+
+def test_profiler_captures_executor_threads():
+    """
+    @brief Samples include stacks of worker threads, in both output formats
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(1) as pool, SamplingProfiler(interval=0.002) as profiler:
+        pool.submit(busy_inference, 0.1).result()
+
+    assert "busy_inference (test_profiler.py:" in profiler.collapsed()
+    document = profiler.speedscope()
+    names = {frame["name"] for frame in document["shared"]["frames"]}
+    assert "busy_inference" in names
+    profile = document["profiles"][0]
+    assert len(profile["samples"]) == len(profile["weights"])
+
+
+def test_speedscope_weights_are_measured_time():
+    """
+    @brief Weights add up to wall time however late the sampler wakes
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    # A nominal interval far below what the sampler achieves under load
+    with ThreadPoolExecutor(1) as pool, SamplingProfiler(interval=0.0001) as profiler:
+        pool.submit(busy_inference, 0.2).result()
+
+    worker = next(
+        profile for profile in profiler.speedscope()["profiles"]
+        if profile["name"].startswith("ThreadPoolExecutor")
+    )
+    assert worker["endValue"] == pytest.approx(sum(worker["weights"]))
+    assert 0.1 < worker["endValue"] <= profiler.duration
+
+
+def test_on_demand_profile_requires_admin_token(app, tmp_path):
+    """
+    @brief Only admin requests with the profile flag are profiled
+    """
+    client = TestClient(app)
+    assert "x-profile-file" not in client.get("/predict/BTC", headers={"X-Profile": "1"}).headers
+    assert os.listdir(tmp_path) == []
+
+    response = client.get(
+        "/predict/BTC?profile=1",
+        headers={"X-Admin-Token": ADMIN_TOKEN}
+    )
+    assert response.json() == {"ticker": "BTC"}
+    file_name = response.headers["x-profile-file"]
+    assert os.listdir(tmp_path) == [file_name]
+    with open(tmp_path / file_name) as f:
+        frames = {frame["name"] for frame in json.load(f)["shared"]["frames"]}
+    assert "busy_inference" in frames
+
+
+def test_rolling_mode_samples_one_in_n(tmp_path):
+    """
+    @brief Rolling mode profiles every Nth request without the flag
+    """
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    app.add_middleware(
+        ProfilingMiddleware,
+        profile_dir=str(tmp_path),
+        admin_token="",
+        sample_rate=3,
+        fmt="collapsed"
+    )
+    client = TestClient(app)
+    for _ in range(7):
+        response = client.get("/health")
+        assert "x-profile-file" not in response.headers
+    files = os.listdir(tmp_path)
+    assert len(files) == 2 and all(f.endswith(".collapsed.txt") for f in files)
@@ -0,0 +1,178 @@
+"""
+@file test_retrain.py
+@brief Test suite for the retraining scheduler
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for retrain decisions, warm-started
+retraining in the process pool and promotion into the model registry.
+"""
+
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from api.db.timescaledb import Asset, OHLCV
+from api.services.feature_store import FEATURE_GROUPS, write_feature_rows
+from api.services.model_registry import ModelRegistry
+from models.tokenomics.infer_xgboost import TOKENOMICS_FEATURES
+from models.tokenomics.train_xgboost import train_xgboost
+from monitoring.retrain import RetrainPolicy, RetrainScheduler, checkpoint_versions
+
+START = datetime(2024, 1, 1)
+DAYS = 300
+
+
+def test_policy_reasons():
+    policy = RetrainPolicy(min_outcomes=50)
+    drift = {"tokenomics.tvl_ratio": {"psi": 0.4}, "technical.rsi_14": {"psi": 0.9}}
+    accuracy = {
+        ("fundamental", "all", "1d"): {"accuracy": 0.45, "brier": 0.2, "n": 100},
+        ("fundamental", "BTC", "1d"): {"accuracy": 0.1, "brier": 0.9, "n": 100},
+        ("technical", "all", "1d"): {"accuracy": 0.3, "brier": 0.3, "n": 10},
+    }
+    assert policy.reasons("fundamental", "tokenomics", drift, accuracy) == [
+        "drift tokenomics.tvl_ratio psi=0.400", "accuracy 1d=0.450"
+    ]
+    # Too few outcomes to judge accuracy; only drift counts
+    assert policy.reasons("technical", "technical", drift, accuracy) == ["drift technical.rsi_14 psi=0.900"]
+    # Recently retrained models wait for min_interval
+    assert policy.reasons("fundamental", "tokenomics", drift, accuracy, last_retrained=datetime.now()) == []
+
+
+@pytest.fixture
+def Session():
+    """Two assets whose next-day direction follows the previous day's tvl_ratio."""
+    engine = create_engine("sqlite://")
+    for model in [Asset, OHLCV] + list(FEATURE_GROUPS.values()):
+        model.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+
+    rng = np.random.default_rng(0)
+    with Session() as session:
+        for asset in ("BTC", "ETH"):
+            tvl = rng.random(DAYS)
+            # Feature rows become available one day after their date, so
+            # the bar of day t sees tvl[t - 1]
+            moves = np.where(np.roll(tvl, 1) > 0.5, 1.0, -1.0)
+            closes = 100 + np.cumsum(moves)
+            session.add_all(
+                OHLCV(asset_id=asset, timestamp=START + timedelta(days=d), close=float(closes[d]))
+                for d in range(DAYS)
+            )
+            rows = pd.DataFrame({"asset_id": asset, "date": pd.date_range(START, periods=DAYS)})
+            for column in TOKENOMICS_FEATURES:
+                rows[column] = rng.random(DAYS)
+            rows["tvl_ratio"] = np.roll(tvl, -1)
+            write_feature_rows(FEATURE_GROUPS["tokenomics"], rows, session)
+        session.commit()
+    return Session
+
+
+def test_xgboost_warm_start_is_promoted(Session, tmp_path):
+    rng = np.random.default_rng(1)
+    serving_path = str(tmp_path / "serving" / "tokenomics.ubj")
+    current = train_xgboost(
+        rng.random((500, len(TOKENOMICS_FEATURES))), rng.random(500) > 0.5,
+        num_boost_round=5, val_fraction=0
+    )
+    (tmp_path / "serving").mkdir()
+    current.save_model(serving_path)
+
+    registry = ModelRegistry()
+    scheduler = RetrainScheduler(
+        registry=registry,
+        work_dir=str(tmp_path / "work"),
+        lookback=timedelta(days=DAYS),
+        threads_per_job=1,
+        job_options={"xgboost": {"num_boost_round": 50}},
+        session_factory=Session,
+        serving_paths={"fundamental": serving_path, "technical": str(tmp_path / "missing.pt")}
+    )
+    now = START + timedelta(days=DAYS)
+    results = scheduler.run_cycle(due={"fundamental": ["manual"]}, now=now)
+
+    result = results["fundamental"]
+    assert result["accepted"]
+    assert result["candidate_loss"] < result["current_loss"]
+    assert registry.version("fundamental") == "retrain-20241027T000000"
+    # The label tells the api.serve supervisor to reload the checkpoint
+    assert checkpoint_versions(scheduler.serving_paths) == {"fundamental": "retrain-20241027T000000"}
+    promoted = xgb.Booster(model_file=serving_path)
+    # Continued boosting keeps the original trees
+    assert promoted.num_boosted_rounds() > current.num_boosted_rounds()
+    assert registry.get("fundamental").num_boosted_rounds() == promoted.num_boosted_rounds()
+    # The model is not due again before min_interval has passed
+    assert scheduler.due(drift={"tokenomics.tvl_ratio": {"psi": 1.0}}, accuracy={}, now=now) == {}
+
+
+def test_cnn_lstm_fine_tune_is_published_to_store(Session, tmp_path):
+    import torch
+    from api.services.feature_store import _feature_columns
+    from models.artifact_store import ArtifactStore
+    from models.technical.cnn_lstm import CNNLSTMModel, save_model
+
+    columns = _feature_columns(FEATURE_GROUPS["technical"].__table__)
+    rng = np.random.default_rng(2)
+    with Session() as session:
+        for asset in ("BTC", "ETH"):
+            rows = pd.DataFrame(rng.random((DAYS, len(columns))), columns=columns)
+            rows["ma_crossover"] = rows["ma_crossover"] > 0.5
+            rows["asset_id"] = asset
+            rows["date"] = pd.date_range(START, periods=DAYS)
+            write_feature_rows(FEATURE_GROUPS["technical"], rows, session)
+        session.commit()
+
+    torch.manual_seed(0)
+    serving_path = str(tmp_path / "cnn_lstm_model.pt")
+    current = CNNLSTMModel(len(columns), hidden_size=8, num_layers=1)
+    save_model(current, serving_path)
+
+    store = ArtifactStore(str(tmp_path / "store"))
+    registry = ModelRegistry(store)
+    scheduler = RetrainScheduler(
+        registry=registry,
+        work_dir=str(tmp_path / "work"),
+        # The first bar has no feature row available yet
+        lookback=timedelta(days=DAYS - 1),
+        threads_per_job=1,
+        tolerance=1.0,
+        job_options={"cnn_lstm": {"window": 10, "epochs": 1, "batch_size": 64}},
+        session_factory=Session,
+        serving_paths={"technical": serving_path, "fundamental": str(tmp_path / "missing.ubj")}
+    )
+    now = START + timedelta(days=DAYS)
+    result = scheduler.run_cycle(due={"technical": ["manual"]}, now=now)["technical"]
+
+    assert "error" not in result and result["rows"] > 0
+    assert np.isfinite(result["candidate_loss"]) and np.isfinite(result["current_loss"])
+    assert result["accepted"]
+
+    # Published as a store version carrying its schema and window, and served
+    version = "retrain-20241027T000000"
+    manifest = store.verify("technical", version)
+    assert store.latest("technical") == registry.version("technical") == version
+    assert manifest["window"] == 10 and manifest["feature_schema"] == columns
+    served = registry.get("technical")
+    candidate = torch.load(result["path"], map_location="cpu")["state_dict"]
+    for name, tensor in served.state_dict().items():
+        assert torch.equal(tensor, candidate[name])
+
+
+def test_accuracy_only_triggers_slots_served_by_a_model(tmp_path):
+    registry = ModelRegistry()
+    registry.register_loader("fundamental", lambda: "booster")
+    scheduler = RetrainScheduler(
+        registry=registry,
+        policy=RetrainPolicy(min_outcomes=10),
+        serving_paths={"fundamental": str(tmp_path / "a.ubj"), "technical": str(tmp_path / "b.pt")}
+    )
+    poor = {"accuracy": 0.2, "brier": 0.4, "n": 100}
+    accuracy = {("fundamental", "all", "1d"): poor, ("technical", "all", "1d"): poor}
+    # No technical model is served, so its logged scores are not a model's
+    assert list(scheduler.due(drift={}, accuracy=accuracy)) == ["fundamental"]
@@ -0,0 +1,126 @@
+"""
+@file test_sentiment_aggregation.py
+@brief Test suite for daily sentiment aggregation
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for aggregating per-text FinBERT outputs
+into daily sentiment_features rows.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from feature_engineering.aggregate_sentiment import (
+    aggregate_daily_sentiment,
+    write_sentiment_features,
+    SOURCE_NEWS,
+    SOURCE_SOCIAL,
+    SOURCE_YOUTUBE
+)
+
+PROBS = np.array([
+    [0.8, 0.1, 0.1],
+    [0.6, 0.2, 0.2],
+    [0.1, 0.7, 0.2],
+    [0.5, 0.4, 0.1],
+    [0.3, 0.3, 0.4],
+])
+TIMESTAMPS = np.array([
+    "2024-01-01T01:00", "2024-01-01T05:00", "2024-01-02T03:00",
+    "2024-01-02T09:00", "2024-01-01T12:00"
+], dtype="datetime64[s]")
+ASSETS = np.array(["BTC", "BTC", "BTC", "BTC", "ETH"])
+SOURCES = np.array([SOURCE_NEWS, SOURCE_YOUTUBE, SOURCE_YOUTUBE, SOURCE_YOUTUBE, SOURCE_SOCIAL])
+
+
+def test_daily_rows_and_counts():
+    """
+    @brief Test that rows are produced per (asset, day) with correct counts
+    """
+    rows = aggregate_daily_sentiment(PROBS, TIMESTAMPS, ASSETS, SOURCES)
+
+    assert list(zip(rows["asset_id"], rows["date"].dt.strftime("%Y-%m-%d"))) == [
+        ("BTC", "2024-01-01"), ("BTC", "2024-01-02"), ("ETH", "2024-01-01")
+    ]
+    assert rows["news_freq"].tolist() == [1, 0, 0]
+    assert rows["social_mentions"].tolist() == [0, 0, 1]
+    assert rows["yt_growth"].tolist() == pytest.approx([0.0, 1.0, 0.0])
+
+
+def test_weighted_polarity_and_volatility():
+    """
+    @brief Test confidence-weighted polarity and rolling volatility
+    """
+    rows = aggregate_daily_sentiment(PROBS, TIMESTAMPS, ASSETS, SOURCES)
+    polarity = PROBS[:, 0] - PROBS[:, 1]
+    conf = PROBS.max(axis=1)
+
+    day1 = np.average(polarity[:2], weights=conf[:2])
+    day2 = np.average(polarity[2:4], weights=conf[2:4])
+    assert rows["finbert_polarity"].tolist()[:2] == pytest.approx([day1, day2])
+    assert rows["sentiment_volatility"].iloc[0] == 0.0
+    assert rows["sentiment_volatility"].iloc[1] == pytest.approx(np.std([day1, day2]))
+
+
+def test_invalid_shapes():
+    """
+    @brief Test input validation
+    """
+    with pytest.raises(ValueError):
+        aggregate_daily_sentiment(PROBS[:, :2], TIMESTAMPS, ASSETS, SOURCES)
+    with pytest.raises(ValueError):
+        aggregate_daily_sentiment(PROBS, TIMESTAMPS[:3], ASSETS, SOURCES)
+    assert aggregate_daily_sentiment(np.empty((0, 3)), [], [], []).empty
+
+
+def test_bulk_write_is_idempotent():
+    """
+    @brief Test bulk writes replace existing rows for the same days
+    """
+    from sqlalchemy import create_engine, func, select
+    from sqlalchemy.orm import sessionmaker
+    from api.db.timescaledb import SentimentFeatures
+
+    engine = create_engine("sqlite://")
+    SentimentFeatures.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+
+    rows = aggregate_daily_sentiment(PROBS, TIMESTAMPS, ASSETS, SOURCES)
+    assert write_sentiment_features(rows, session) == 3
+    assert write_sentiment_features(rows, session) == 3
+    assert session.scalar(select(func.count()).select_from(SentimentFeatures)) == 3
+
+
+def test_incremental_run_continues_rolling_columns():
+    """
+    @brief Test a one-day run seeded from stored rows matches a full-window run
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from api.db.timescaledb import SentimentFeatures
+    from feature_engineering.aggregate_sentiment import read_sentiment_history
+
+    engine = create_engine("sqlite://")
+    SentimentFeatures.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+
+    full = aggregate_daily_sentiment(PROBS, TIMESTAMPS, ASSETS, SOURCES)
+    first_day = TIMESTAMPS.astype("datetime64[D]") == np.datetime64("2024-01-01")
+    write_sentiment_features(
+        aggregate_daily_sentiment(PROBS[first_day], TIMESTAMPS[first_day], ASSETS[first_day], SOURCES[first_day]),
+        session
+    )
+
+    history = read_sentiment_history(session, ["BTC"], pd.Timestamp("2024-01-02").to_pydatetime())
+    incremental = aggregate_daily_sentiment(
+        PROBS[~first_day], TIMESTAMPS[~first_day], ASSETS[~first_day], SOURCES[~first_day], history=history
+    )
+
+    assert len(incremental) == 1
+    expected = full[full["date"] == pd.Timestamp("2024-01-02")].reset_index(drop=True)
+    pd.testing.assert_frame_equal(incremental.reset_index(drop=True), expected)
+    assert incremental["sentiment_volatility"].iloc[0] > 0
+    assert incremental["yt_growth"].iloc[0] == pytest.approx(1.0)
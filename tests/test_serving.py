@@ -0,0 +1,148 @@
+"""
+@file test_serving.py
+@brief Test suite for multi-process serving with shared model weights
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for loading models once before forking
+workers, warming them up in the workers, per-worker thread caps,
+memory-mapped technical checkpoints, swapping versions in the parent
+only and the shared metrics directory.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import numpy as np
+from api.serve import limit_threads, _prepare_metrics_dir, _reload_promoted
+from api.services.model_registry import ModelRegistry
+from models.technical.cnn_lstm import CNNLSTMModel, save_model
+from models.technical.infer_cnn_lstm import load_model, predict_batch
+
+
+def mapped_file(address):
+    """Path of the file mapped at an address of this process, if any."""
+    with open("/proc/self/maps") as f:
+        for line in f:
+            parts = line.split()
+            low, high = (int(x, 16) for x in parts[0].split("-"))
+            if low <= address < high:
+                return parts[5] if len(parts) > 5 else None
+    return None
+
+
+def test_forked_worker_reuses_preloaded_model():
+    loads, warmed = [], []
+    parent_model = object()
+    registry = ModelRegistry()
+    registry.register_loader("technical", lambda: loads.append(os.getpid()) or parent_model)
+    registry.register_artifact_loader("technical", lambda path: None, lambda model, manifest: warmed.append(os.getpid()))
+
+    report = registry.preload(warm_up=False)
+    assert report["technical"]["loaded"] and "warmup_seconds" not in report["technical"]
+    assert warmed == []
+
+    def worker(results):
+        timings = registry.preload()["technical"]
+        results.put((registry.get("technical") is parent_model, loads, warmed, "warmup_seconds" in timings))
+
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    process = context.Process(target=worker, args=(results,))
+    process.start()
+    same_model, child_loads, child_warmed, timed = results.get(timeout=30)
+    process.join(timeout=30)
+
+    assert process.exitcode == 0
+    # The worker serves the parent's object: loaded once, warmed up in the child
+    assert same_model and child_loads == [os.getpid()]
+    assert child_warmed == [process.pid] and timed
+    assert warmed == []
+
+
+def test_limit_threads_sets_worker_caps(monkeypatch):
+    import torch
+
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "XGBOOST_NTHREAD"):
+        monkeypatch.setenv(variable, "")
+    previous = torch.get_num_threads()
+    try:
+        limit_threads(2)
+        assert torch.get_num_threads() == 2
+        assert os.environ["OMP_NUM_THREADS"] == os.environ["XGBOOST_NTHREAD"] == "2"
+    finally:
+        torch.set_num_threads(previous)
+
+
+def test_technical_weights_are_memory_mapped(tmp_path):
+    path = str(tmp_path / "cnn_lstm_model.pt")
+    model = CNNLSTMModel(input_size=4, hidden_size=8, num_layers=2).eval()
+    save_model(model, path)
+    windows = np.random.default_rng(0).random((3, 20, 4), dtype=np.float32)
+
+    mapped = load_model(path, quantize=False, backend="torch", mmap=True)
+    copied = load_model(path, quantize=False, backend="torch", mmap=False)
+    assert mapped_file(mapped.lstm.weight_ih_l0.data_ptr()) == path
+    assert mapped_file(copied.lstm.weight_ih_l0.data_ptr()) != path
+    np.testing.assert_allclose(predict_batch(mapped, windows), predict_batch(copied, windows), rtol=1e-6)
+
+
+def test_parent_loads_new_version_for_workers_to_warm_up(tmp_path):
+    from models.artifact_store import ArtifactStore
+
+    store = ArtifactStore(str(tmp_path / "store"))
+    for version in ("v1", "v2"):
+        source = tmp_path / f"{version}.bin"
+        source.write_text(version)
+        store.publish("fundamental", str(source), "xgboost", version=version, make_latest=version == "v1")
+
+    warmed = []
+    registry = ModelRegistry(store)
+    registry.register_artifact_loader("fundamental", lambda path: open(path).read(), lambda model, manifest: warmed.append(model))
+    registry.preload(warm_up=False)
+    # Workers do not poll the store themselves
+    asyncio.run(registry.start(0))
+    assert registry._task is None
+
+    store.set_latest("fundamental", "v2")
+    assert registry.refresh(warm_up=False) == ["fundamental"]
+    assert registry.version("fundamental") == "v2" and warmed == []
+    # A worker forked after the swap warms the new version up on first use
+    assert registry.get("fundamental") == "v2" and warmed == ["v2"]
+
+
+def test_parent_reloads_checkpoint_replaced_without_store(tmp_path):
+    checkpoint = tmp_path / "tokenomics.ubj"
+    checkpoint.write_text("v1")
+    registry = ModelRegistry()
+    registry.register_loader("fundamental", lambda: checkpoint.read_text())
+    registry.preload(warm_up=False)
+    promoted = {}
+    paths = {"fundamental": str(checkpoint)}
+    assert _reload_promoted(registry, promoted, paths) == []
+
+    # Retraining in worker 0 replaces the checkpoint, then writes its label
+    checkpoint.write_text("v2")
+    (tmp_path / "tokenomics.ubj.version").write_text("retrain-1")
+    assert _reload_promoted(registry, promoted, paths) == ["fundamental"]
+    assert registry.get("fundamental") == "v2"
+    assert registry.version("fundamental") == registry.manifest("fundamental")["version"] == "retrain-1"
+    assert _reload_promoted(registry, promoted, paths) == []
+
+
+def test_metrics_dir_keeps_operator_files(tmp_path, monkeypatch):
+    operator_dir = tmp_path / "metrics"
+    operator_dir.mkdir()
+    (operator_dir / "counter_123.db").write_bytes(b"stale")
+    (operator_dir / "README").write_text("keep me")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(operator_dir))
+    _prepare_metrics_dir(2)
+    assert os.listdir(operator_dir) == ["README"]
+
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR")
+    _prepare_metrics_dir(2)
+    created = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    assert os.path.isdir(created) and os.listdir(created) == []
+    os.rmdir(created)
@@ -0,0 +1,94 @@
+"""
+@file test_startup.py
+@brief Test suite for model preloading and startup readiness
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for parallel model preloading with
+warm-up, and the startup breakdown reported by the /ready endpoint.
+"""
+
+import time
+import pytest
+from api.services.model_registry import ModelRegistry
+from api.services.prediction_service import _warm_up_technical
+from api.services.startup import StartupTracker
+
+
+def slow_loader(value, seconds=0.3):
+    def load():
+        time.sleep(seconds)
+        return value
+    return load
+
+
+def test_preload_loads_slots_in_parallel_and_warms_up():
+    registry = ModelRegistry()
+    warmed = []
+    registry.register_loader("technical", slow_loader("technical"))
+    registry.register_loader("fundamental", slow_loader("fundamental"))
+    registry.register_loader("sentiment", slow_loader(None))
+    registry.register_artifact_loader("technical", lambda path: None, lambda model, manifest: warmed.append((model, manifest["version"])))
+
+    def broken():
+        raise OSError("weights unreadable")
+    registry.register_loader("ensemble", broken)
+
+    started = time.perf_counter()
+    report = registry.preload()
+    assert time.perf_counter() - started < 0.6
+
+    assert report["technical"]["loaded"] and report["fundamental"]["loaded"]
+    assert report["technical"]["load_seconds"] >= 0.3
+    assert "warmup_seconds" in report["technical"]
+    assert report["sentiment"] == {"load_seconds": pytest.approx(0.3, abs=0.2), "loaded": False}
+    assert report["ensemble"] == {"loaded": False, "error": "weights unreadable"}
+    # Legacy loads are warmed up too; a missing model is not
+    assert warmed == [("technical", "initial")]
+    assert registry.get("technical") == "technical"
+    assert registry.version("technical") == "initial"
+
+
+def test_technical_warm_up_uses_checkpoint_config():
+    from models.technical.cnn_lstm import CNNLSTMModel
+
+    model = CNNLSTMModel(input_size=4, hidden_size=8, num_layers=1).eval()
+    _warm_up_technical(model, {"version": "initial", "feature_schema": []})
+    # Nothing to infer the input shape from; skipped rather than failing
+    _warm_up_technical(object(), {"version": "initial", "feature_schema": []})
+
+
+def test_tracker_reports_breakdown():
+    tracker = StartupTracker()
+    tracker.record("imports", 1.5)
+    with tracker.phase("background_workers"):
+        pass
+    tracker.record_models({"technical": {"load_seconds": 0.2, "warmup_seconds": 0.1, "loaded": True}})
+    assert not tracker.report()["ready"]
+
+    tracker.mark_ready()
+    report = tracker.report()
+    assert report["ready"] and report["ready_at"]
+    assert set(report["phases"]) == {
+        "imports", "background_workers", "model_technical_load", "model_technical_warmup", "total"
+    }
+    assert report["models"]["technical"]["loaded"]
+
+
+def test_tracker_is_not_ready_when_a_model_failed():
+    tracker = StartupTracker()
+    # A slot without a model is expected; a slot that raised is not
+    tracker.record_models({
+        "sentiment": {"load_seconds": 0.1, "loaded": False},
+        "ensemble": {"loaded": False, "error": "weights unreadable"},
+    })
+    assert not tracker.mark_ready()
+    report = tracker.report()
+    assert not report["ready"] and report["ready_at"] is None
+    assert report["errors"] == {"model_ensemble": "weights unreadable"}
+
+    tracker = StartupTracker()
+    tracker.record_models({"sentiment": {"load_seconds": 0.1, "loaded": False}})
+    assert tracker.mark_ready() and tracker.report()["errors"] == {}
@@ -0,0 +1,136 @@
+"""
+@file test_training.py
+@brief Test suite for model training
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for the CNN-LSTM windowed dataset and
+training loop, and for XGBoost tokenomics training.
+"""
+
+import pickle
+import pytest
+import numpy as np
+import torch
+from models.technical.train_cnn_lstm import CNNLSTMModel, WindowedDataset, fit, train_model
+from models.technical.infer_cnn_lstm import load_model
+from models.tokenomics.train_xgboost import train_xgboost, train_xgboost_external
+
+WINDOW = 8
+N_FEATURES = 4
+ASSET_OFFSETS = [0, 60, 100]
+
+@pytest.fixture
+def memmap_paths(tmp_path):
+    """
+    @brief Two assets of bars with a learnable label, saved as .npy files
+    """
+    rng = np.random.default_rng(0)
+    features = rng.standard_normal((100, N_FEATURES)).astype(np.float32)
+    targets = (features[:, 0] > 0).astype(np.float32)
+    targets[[59, 99]] = np.nan
+    np.save(tmp_path / "features.npy", features)
+    np.save(tmp_path / "targets.npy", targets)
+    return str(tmp_path / "features.npy"), str(tmp_path / "targets.npy")
+
+def test_windows_are_views_within_assets(memmap_paths):
+    """
+    @brief Windows never cross asset boundaries and share the mapped memory
+    """
+    dataset = WindowedDataset(*memmap_paths, WINDOW, ASSET_OFFSETS)
+    # Asset 0 yields rows 7..58, asset 1 rows 67..98
+    assert len(dataset) == (60 - WINDOW) + (40 - WINDOW)
+    assert dataset.ends[0] == WINDOW - 1
+    assert dataset.ends[60 - WINDOW] == 60 + WINDOW - 1
+
+    window, target = dataset[0]
+    assert window.shape == (WINDOW, N_FEATURES)
+    assert np.shares_memory(window.numpy(), dataset._features)
+    assert target.item() == float(dataset._features[WINDOW - 1, 0] > 0)
+
+    # Pickling for DataLoader workers drops the mapped arrays
+    restored = pickle.loads(pickle.dumps(dataset))
+    assert restored._features is None
+    assert torch.equal(restored[0][0], window)
+
+def test_time_split_is_per_asset_and_ordered(memmap_paths):
+    """
+    @brief Validation windows are the latest of each asset, after a gap
+    """
+    dataset = WindowedDataset(*memmap_paths, WINDOW, ASSET_OFFSETS)
+    train, val = dataset.time_split(val_fraction=0.25, gap=2)
+    for start, end in zip(ASSET_OFFSETS[:-1], ASSET_OFFSETS[1:]):
+        train_ends = train.ends[(train.ends >= start) & (train.ends < end)]
+        val_ends = val.ends[(val.ends >= start) & (val.ends < end)]
+        assert len(train_ends) and len(val_ends)
+        assert train_ends.max() + 2 < val_ends.min()
+
+def test_fit_checkpoints_best_model(memmap_paths, tmp_path):
+    """
+    @brief Training with workers improves on chance and saves a loadable checkpoint
+    """
+    dataset = WindowedDataset(*memmap_paths, WINDOW, ASSET_OFFSETS)
+    train, val = dataset.time_split(val_fraction=0.25, gap=WINDOW)
+    torch.manual_seed(0)
+    model = CNNLSTMModel(N_FEATURES, hidden_size=16, num_layers=1)
+    checkpoint = str(tmp_path / "cnn_lstm.pt")
+    result = fit(
+        model, train, val,
+        epochs=30, batch_size=16, learning_rate=1e-2,
+        num_workers=2, patience=5, checkpoint_path=checkpoint
+    )
+
+    assert result["best_val_loss"] == min(result["val_loss"])
+    assert len(result["train_loss"]) <= 30
+    assert result["train_loss"][-1] < result["train_loss"][0]
+
+    loaded = load_model(checkpoint, backend="torch")
+    x = torch.stack([val[i][0] for i in range(len(val))])
+    with torch.inference_mode():
+        assert torch.allclose(loaded(x), model(x), atol=1e-6)
+
+def test_train_model_accepts_windowed_arrays():
+    """
+    @brief Pre-windowed (samples x window x features) input still trains
+    """
+    X = np.random.randn(64, WINDOW, N_FEATURES).astype(np.float32)
+    y = (X[:, -1, 0] > 0).astype(np.float32)
+    model, loss = train_model(X, y, epochs=2, batch_size=16)
+    assert model.config["input_size"] == N_FEATURES
+    assert np.isfinite(loss)
+
+def _tabular(seed, rows=2000):
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((rows, N_FEATURES)).astype(np.float32)
+    y = (X[:, 0] + 0.5 * rng.standard_normal(rows) > 0).astype(np.float32)
+    return X, y
+
+def test_xgboost_early_stopping_keeps_best_rounds():
+    """
+    @brief Hist training stops early on the latest rows and keeps the best trees
+    """
+    X, y = _tabular(0)
+    booster = train_xgboost(X, y, num_boost_round=300, early_stopping_rounds=5, nthread=2)
+    assert booster.num_boosted_rounds() == int(booster.attr("best_iteration")) + 1
+    assert booster.num_boosted_rounds() < 300
+
+    X_test, y_test = _tabular(1, rows=500)
+    accuracy = np.mean((booster.inplace_predict(X_test) > 0.5) == y_test)
+    assert accuracy > 0.75
+
+def test_xgboost_external_memory(tmp_path):
+    """
+    @brief Streaming .npy batches trains a comparable model
+    """
+    batches = []
+    for i in range(4):
+        X, y = _tabular(i, rows=500)
+        np.save(tmp_path / f"X{i}.npy", X)
+        np.save(tmp_path / f"y{i}.npy", y)
+        batches.append((str(tmp_path / f"X{i}.npy"), str(tmp_path / f"y{i}.npy")))
+
+    booster = train_xgboost_external(batches, num_boost_round=100, cache_dir=str(tmp_path))
+    X_test, y_test = _tabular(9, rows=500)
+    assert np.mean((booster.inplace_predict(X_test) > 0.5) == y_test) > 0.75
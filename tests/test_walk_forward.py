@@ -0,0 +1,114 @@
+"""
+@file test_walk_forward.py
+@brief Test suite for walk-forward validation
+@author [Your Name]
+@date [Current Date]
+@version 1.0
+@copyright [Your Organization]
+
+This module contains test cases for fold generation, fold caching and the
+parallel walk-forward engine.
+"""
+
+import os
+import pytest
+import numpy as np
+import pandas as pd
+from models.walk_forward import make_folds, combine_members, walk_forward
+
+N_DAYS = 120
+N_ASSETS = 3
+FEATURES = ["f0", "f1", "f2"]
+
+@pytest.fixture
+def data():
+    """
+    @brief Daily rows for a few assets with a learnable target
+    """
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        "asset_id": np.repeat(np.arange(N_ASSETS), N_DAYS),
+        "timestamp": np.tile(pd.date_range("2024-01-01", periods=N_DAYS), N_ASSETS),
+        **{name: rng.standard_normal(N_DAYS * N_ASSETS) for name in FEATURES},
+    })
+    frame["target"] = (frame["f0"] > 0).astype(float)
+    return frame
+
+def test_expanding_and_rolling_folds():
+    """
+    @brief Folds are time-ordered and never train on their test period
+    """
+    days = pd.date_range("2024-01-01", periods=100)
+    expanding = make_folds(days, n_folds=4, test_periods=10, gap=2)
+    assert [f["test_start"] for f in expanding] == list(days[[60, 70, 80, 90]])
+    assert all(f["train_start"] == days[0] for f in expanding)
+    assert all(f["train_end"] == f["test_start"] - pd.Timedelta(days=3) for f in expanding)
+
+    rolling = make_folds(days, n_folds=4, test_periods=10, train_periods=30, expanding=False)
+    assert all(
+        (f["train_end"] - f["train_start"]).days == 29 and f["train_end"] < f["test_start"]
+        for f in rolling
+    )
+    with pytest.raises(ValueError):
+        make_folds(days, n_folds=20, test_periods=10)
+
+def test_walk_forward_report_and_fold_cache(data, tmp_path):
+    """
+    @brief Models run in the pool, the ensemble is scored and folds are cached once
+    """
+    cache_dir = str(tmp_path / "folds")
+    report = walk_forward(
+        data, FEATURES, {"xgboost": {}}, n_folds=3, cache_dir=cache_dir,
+        max_workers=2, ensemble_weights={"fundamental": 1.0}
+    )
+    folds = report["folds"]
+    assert set(folds["model"]) == {"xgboost", "ensemble"}
+    assert (folds["n"] == N_ASSETS * (N_DAYS // 4)).all()
+    assert report["summary"].loc["xgboost", ("accuracy", "mean")] > 0.8
+
+    cached = sorted(os.listdir(cache_dir))
+    mtimes = [os.path.getmtime(os.path.join(cache_dir, d, "role.npy")) for d in cached]
+    walk_forward(data, FEATURES, {"xgboost": {}}, n_folds=3, cache_dir=cache_dir, max_workers=2)
+    assert sorted(os.listdir(cache_dir)) == cached
+    assert [os.path.getmtime(os.path.join(cache_dir, d, "role.npy")) for d in cached] == mtimes
+
+def test_combine_members_renormalizes_missing_scores():
+    """
+    @brief Members without a score for a row drop out of that row's weights
+    """
+    scores = {
+        "cnn_lstm": np.array([0.2, np.nan, np.nan]),
+        "xgboost": np.array([0.8, 0.6, np.nan]),
+    }
+    combined = combine_members(scores, {"technical": 0.5, "fundamental": 0.25})
+    assert combined[0] == pytest.approx((0.2 * 0.5 + 0.8 * 0.25) / 0.75)
+    assert combined[1] == pytest.approx(0.6)
+    assert np.isnan(combined[2])
+
+
+def test_pool_workers_are_pinned_to_one_thread(monkeypatch):
+    import torch
+    import models.tokenomics.train_xgboost as train_module
+    from models.walk_forward import _limit_threads, xgboost_fold, TRAIN, TEST
+
+    monkeypatch.setenv("XGBOOST_NTHREAD", "0")
+    previous = torch.get_num_threads()
+    try:
+        _limit_threads()
+        assert os.environ["XGBOOST_NTHREAD"] == "1" and torch.get_num_threads() == 1
+    finally:
+        torch.set_num_threads(previous)
+
+    # The fold passes nthread itself, whatever the inherited environment says
+    monkeypatch.setenv("XGBOOST_NTHREAD", "0")
+    calls = []
+    original = train_module.train_xgboost
+    monkeypatch.setattr(train_module, "train_xgboost", lambda X, y, **kw: calls.append(kw) or original(X, y, **kw))
+    rng = np.random.default_rng(0)
+    fold = {
+        "features": rng.standard_normal((60, 3)).astype(np.float32),
+        "target": (rng.random(60) > 0.5).astype(np.float32),
+        "role": np.array([TRAIN] * 50 + [TEST] * 10),
+    }
+    assert len(xgboost_fold(fold, {"num_boost_round": 5})) == 10
+    assert calls[0]["nthread"] == 1